@@ -1,9 +1,24 @@
 import streamlit as st
-import pandas as pd
+import hashlib
 import json
-import plotly.express as px
-from src.extractor import extract_text_and_tables
-from src.parser import parse_project_info
+import os
+import shutil
+from src.lazy import lazy_import
+from src.cache import extract_and_parse_cached, cache_stats
+from src.analytics import status_counts, cost_overrun_totals, progress_histogram, portfolio_totals
+from src.store import open_store, query_projects, store_version, STORE_COLUMNS
+from src.parser import FIELDS
+from src.viewer import page_tables, page_highlights, highlight_html
+from src.export import EXPORT_FORMATS, EXPORT_CHUNK_SIZE, stream_export
+from src.profiling import span, start_recording, stop_recording, summarize, ENABLED as PROFILING_ENABLED
+
+# Heavy, and only needed once there is something to show: pandas for the
+# tables and exports, plotly only when a chart is rendered
+pd = lazy_import("pandas")
+px = lazy_import("plotly.express")
+
+# Portfolio tables beyond this many rows are truncated in the preview
+MAX_TABLE_ROWS = 1000
 
 # Page Config
 st.set_page_config(
@@ -35,101 +50,373 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Title and Sidebar
-st.title("🏗️ InfraTrack AI")
-st.markdown("### Infrastructure Progress Extractor & Monitor")
+def _highlight_rows(table_df, rows):
+    return table_df.style.apply(
+        lambda row: ["background-color: #fff3b0" if row.name in rows else "" for _ in row], axis=1
+    )
+
+def render_source_inspector(extracted_data, parsed_info, sources=None):
+    """
+    Shows one page of the document at a time, with the text spans and table
+    rows each parsed field was read from highlighted. Only the selected
+    page's text and tables are rendered. `sources` defaults to the
+    document's field_sources (the first project's).
+    """
+    pages = extracted_data["pages"]
+    if sources is None:
+        sources = extracted_data.get("field_sources") or {}
+    if not pages:
+        st.caption("The document has no pages.")
+        return
+
+    def jump_to_field():
+        source = sources.get(st.session_state["inspector_field"])
+        if source and source.get("page"):
+            st.session_state["inspector_page"] = source["page"]
+
+    # A previous, longer document may have left the page past the end
+    if st.session_state.get("inspector_page", 1) > len(pages):
+        st.session_state["inspector_page"] = 1
+
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        page = st.number_input(f"Page (of {len(pages)})", min_value=1, max_value=len(pages), step=1,
+                               key="inspector_page")
+    with c2:
+        st.selectbox("Jump to field", [None] + [field for field in FIELDS if field in sources],
+                     key="inspector_field", on_change=jump_to_field,
+                     format_func=lambda field: "—" if field is None else f"{field} (page {sources[field]['page']})")
+
+    spans, rows = page_highlights(extracted_data, page, sources)
+    on_page = [field for _, _, field in spans]
+    on_page += [field for table_rows in rows.values() for fields in table_rows.values() for field in fields]
+    if on_page:
+        st.caption("Highlighted: " + ", ".join(f"{field} = {parsed_info.get(field)}" for field in on_page))
+
+    text = pages[page - 1]
+    if page in (extracted_data.get("ocr_pages") or []):
+        st.caption("Text from OCR")
+    if text:
+        st.markdown(f'<pre style="white-space: pre-wrap">{highlight_html(text, spans)}</pre>',
+                    unsafe_allow_html=True)
+    else:
+        st.caption("No text on this page.")
+
+    for table_index, table in page_tables(extracted_data, page):
+        st.caption(f"Table {table_index + 1}")
+        table_df = pd.DataFrame(table)
+        st.dataframe(_highlight_rows(table_df, rows.get(table_index, {})), use_container_width=True)
+
+def upload_digest(uploaded_file):
+    """SHA-256 of an upload's content, hashed once per uploaded file and kept in the session."""
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded_file.file_id not in digests:
+        digests[uploaded_file.file_id] = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+    return digests[uploaded_file.file_id]
 
-st.sidebar.header("Upload Report")
-uploaded_file = st.sidebar.file_uploader("Upload PAIMANA PDF", type=["pdf"])
+# The single-report view in stages, each memoized on the upload's content
+# hash, so widget reruns only redraw. cache_resource hands back the cached
+# objects themselves (no pickling), so nothing below may mutate them.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_report(digest, _uploaded_file, ocr=None):
+    """Extracts and parses an upload through the on-disk cache: (extracted_data, [parsed_info, ...])."""
+    return extract_and_parse_cached(_uploaded_file, ocr=ocr, projects=True)
 
-if uploaded_file is not None:
+@st.cache_data(show_spinner=False, max_entries=8)
+def report_frames(digest, _parsed_info, source_file, ocr=None, project=0):
+    """Tables and download payloads derived from one parsed report (one project of it)."""
+    record = dict(_parsed_info, source_file=source_file)
+    df = pd.DataFrame([record])
+    return {
+        "record": df,
+        "progress": pd.DataFrame({
+            "Metric": ["Physical Progress (%)", "Financial Progress (%)"],
+            "Value": [record.get("physical_progress_percent", 0), record.get("financial_progress_percent", 0)]
+        }),
+        "cost": pd.DataFrame({
+            "Metric": ["Planned Cost", "Expenditure"],
+            "Amount (Cr)": [record.get("planned_cost_crore", 0), record.get("expenditure_till_date_crore", 0)]
+        }),
+        "csv": df.to_csv(index=False).encode('utf-8'),
+        "json": json.dumps(record, indent=4).encode('utf-8'),
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def report_projects_csv(digest, _records, source_file, ocr=None):
+    """Every project of a consolidated report as one CSV."""
+    return pd.DataFrame([dict(record, source_file=source_file) for record in _records]).to_csv(index=False).encode('utf-8')
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def report_figures(digest, _frames, source_file, ocr=None, project=0):
+    """Styled table and Plotly figures for one report, built once per upload."""
+    return {
+        "record": _frames["record"].style.map(lambda v: 'color: red;' if v == 'DELAYED' else None, subset=['status_flag']),
+        "progress": px.bar(_frames["progress"], x="Metric", y="Value", color="Metric",
+                           range_y=[0, 100], title="Progress Comparison"),
+        "cost": px.bar(_frames["cost"], x="Metric", y="Amount (Cr)", color="Metric",
+                       title="Cost Analysis (₹ Crore)"),
+    }
+
+def render_single_report(uploaded_file, ocr=None):
     with st.spinner("Extracting and Parsing..."):
-        # Save temp file or process directly
-        # pdfplumber takes file-like objects so we can pass uploaded_file directly
-        extracted_data = extract_text_and_tables(uploaded_file)
+        digest = upload_digest(uploaded_file)
+        with span("report.load"):
+            extracted_data, records = load_report(digest, uploaded_file, ocr)
         
         if extracted_data:
-            parsed_info = parse_project_info(extracted_data["text"], extracted_data["tables"])
-            parsed_info["source_file"] = uploaded_file.name
-            
-            # Create DataFrame (single row for now, but scalable)
-            df = pd.DataFrame([parsed_info])
+            # Consolidated reports cover several projects; show one at a time
+            project = 0
+            if len(records) > 1:
+                if st.session_state.get("report_project", 0) >= len(records):
+                    st.session_state["report_project"] = 0
+                project = st.selectbox(f"Project ({len(records)} in this report)", range(len(records)),
+                                       key="report_project",
+                                       format_func=lambda i: records[i].get("project_name") or f"Project {i + 1}")
+            parsed_info = records[project]
+            sources = (extracted_data.get("project_sources") or [extracted_data.get("field_sources") or {}])[project]
+
+            with span("report.frames"):
+                frames = report_frames(digest, parsed_info, uploaded_file.name, ocr, project)
+            with span("report.figures"):
+                figures = report_figures(digest, frames, uploaded_file.name, ocr, project)
             
             # Display Metrics
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Project Name", parsed_info.get("project_name", "Unknown"))
-            with col2:
-                st.metric("Physical Progress", f"{parsed_info.get('physical_progress_percent', 0)}%")
-            with col3:
-                st.metric("Financial Progress", f"{parsed_info.get('financial_progress_percent', 0)}%")
-            with col4:
-                status = parsed_info.get("status_flag", "Unknown")
-                color = "normal"
-                if "DELAYED" in status or "COST_OVERRUN" in status:
-                    color = "off" # Streamlit 'off' is red-ish in delta, but let's just show text
-                st.metric("Status", status)
-                if "DELAYED" in status:
-                    st.error(f"⚠️ {status}")
-                elif "ON_TRACK" in status:
-                    st.success(f"✅ {status}")
+            with span("render.metrics"):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Project Name", parsed_info.get("project_name", "Unknown"))
+                with col2:
+                    st.metric("Physical Progress", f"{parsed_info.get('physical_progress_percent', 0)}%")
+                with col3:
+                    st.metric("Financial Progress", f"{parsed_info.get('financial_progress_percent', 0)}%")
+                with col4:
+                    status = parsed_info.get("status_flag", "Unknown")
+                    color = "normal"
+                    if "DELAYED" in status or "COST_OVERRUN" in status:
+                        color = "off" # Streamlit 'off' is red-ish in delta, but let's just show text
+                    st.metric("Status", status)
+                    if "DELAYED" in status:
+                        st.error(f"⚠️ {status}")
+                    elif "ON_TRACK" in status:
+                        st.success(f"✅ {status}")
 
             st.divider()
             
             # Data Preview
-            st.subheader("📊 Extracted Data")
-            st.dataframe(df.style.applymap(lambda v: 'color: red;' if v == 'DELAYED' else None, subset=['status_flag']), use_container_width=True)
+            with span("render.table"):
+                st.subheader("📊 Extracted Data")
+                st.dataframe(figures["record"], use_container_width=True)
             
             # Visualizations
-            st.subheader("📈 Progress Analysis")
-            
-            # Bar Chart: Physical vs Financial
-            chart_data = pd.DataFrame({
-                "Metric": ["Physical Progress (%)", "Financial Progress (%)"],
-                "Value": [parsed_info.get("physical_progress_percent", 0), parsed_info.get("financial_progress_percent", 0)]
-            })
-            
-            fig_progress = px.bar(chart_data, x="Metric", y="Value", color="Metric", 
-                                  range_y=[0, 100], title="Progress Comparison")
-            
-            # Bar Chart: Cost Comparison
-            cost_data = pd.DataFrame({
-                "Metric": ["Planned Cost", "Expenditure"],
-                "Amount (Cr)": [parsed_info.get("planned_cost_crore", 0), parsed_info.get("expenditure_till_date_crore", 0)]
-            })
-            fig_cost = px.bar(cost_data, x="Metric", y="Amount (Cr)", color="Metric",
-                              title="Cost Analysis (₹ Crore)")
-            
-            c1, c2 = st.columns(2)
-            with c1:
-                st.plotly_chart(fig_progress, use_container_width=True)
-            with c2:
-                st.plotly_chart(fig_cost, use_container_width=True)
+            with span("render.charts"):
+                st.subheader("📈 Progress Analysis")
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.plotly_chart(figures["progress"], use_container_width=True)
+                with c2:
+                    st.plotly_chart(figures["cost"], use_container_width=True)
 
 
             # Downloads
-            st.divider()
-            st.subheader("📥 Export Data")
+            with span("render.exports"):
+                st.divider()
+                st.subheader("📥 Export Data")
             
-            c1, c2 = st.columns(2)
-            with c1:
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button("Download CSV", csv, "project_data.csv", "text/csv")
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.download_button("Download CSV", frames["csv"], "project_data.csv", "text/csv")
             
-            with c2:
-                json_str = json.dumps(parsed_info, indent=4).encode('utf-8')
-                st.download_button("Download JSON", json_str, "project_data.json", "application/json")
+                with c2:
+                    st.download_button("Download JSON", frames["json"], "project_data.json", "application/json")
+
+                if len(records) > 1:
+                    st.download_button(f"Download all {len(records)} projects (CSV)",
+                                       report_projects_csv(digest, records, uploaded_file.name, ocr),
+                                       "projects.csv", "text/csv")
                 
-            with st.expander("View Raw Extracted Text"):
-                st.text(extracted_data["text"][:1000] + "...")
+            with st.expander("🔎 Source Inspector"):
+                with span("render.inspector"):
+                    render_source_inspector(extracted_data, parsed_info, sources)
         else:
             st.error("Failed to extract data from the PDF.")
 
-else:
-    st.info("👈 Please upload a PDF report to begin.")
+def dataset_version(uploaded_files, store_path):
+    """Identifies the current portfolio: upload contents plus the store's write counter."""
+    digest = hashlib.sha256()
+    for uploaded_file in uploaded_files:
+        digest.update(upload_digest(uploaded_file).encode())
+    if store_path:
+        conn = open_store(store_path)
+        digest.update(f"{store_path}:{store_version(conn)}".encode())
+        conn.close()
+    return digest.hexdigest()
+
+# Arguments starting with "_" are not hashed by st.cache_data; the dataset
+# version stands in for them as the cache key.
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_portfolio(version, _uploaded_files, store_path, ocr=None):
+    """Parses every upload (through the extraction cache) and appends the store's rows."""
+    records = []
+    for uploaded_file in _uploaded_files:
+        # Consolidated reports contribute one row per project
+        _, parsed = extract_and_parse_cached(uploaded_file, ocr=ocr, projects=True)
+        for parsed_info in parsed or []:
+            parsed_info["source_file"] = uploaded_file.name
+            records.append(parsed_info)
+
+    frames = [pd.DataFrame(records, columns=list(STORE_COLUMNS))]
+    if store_path:
+        conn = open_store(store_path)
+        frames.append(query_projects(conn))
+        conn.close()
+    return pd.concat(frames, ignore_index=True)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def portfolio_views(version, _df):
+    """Aggregates behind every portfolio chart, computed once per dataset version."""
+    return {
+        "totals": portfolio_totals(_df),
+        "status_by_state": status_counts(_df, "state"),
+        "status_by_sector": status_counts(_df, "sector"),
+        "overrun_by_state": cost_overrun_totals(_df, "state"),
+        "physical_bins": progress_histogram(_df, "physical_progress_percent"),
+        "financial_bins": progress_histogram(_df, "financial_progress_percent"),
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def portfolio_figures(version, _views):
+    """Plotly figures for the portfolio charts, built once per dataset version."""
+    # Histograms are pre-binned, so each chart draws a fixed number of bars
+    return {
+        "status_by_state": px.bar(_views["status_by_state"], x="state", y="projects", color="status_flag",
+                                  title="Status by State"),
+        "status_by_sector": px.bar(_views["status_by_sector"], x="sector", y="projects", color="status_flag",
+                                   title="Status by Sector"),
+        "physical_bins": px.bar(_views["physical_bins"], x="bin", y="projects",
+                                title="Physical Progress Distribution"),
+        "financial_bins": px.bar(_views["financial_bins"], x="bin", y="projects",
+                                 title="Financial Progress Distribution"),
+        "overrun_by_state": px.bar(_views["overrun_by_state"].head(20), x="state", y="overrun_crore",
+                                   title="Cost Overrun by State (₹ Crore)"),
+    }
+
+def _frame_records(df, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yields the rows of a DataFrame as dicts (NaN as None), converting one chunk at a time."""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size].astype(object)
+        yield from chunk.where(chunk.notna(), None).to_dict("records")
+
+def export_portfolio(df, fmt):
+    """
+    Encodes the portfolio for download. Streamlit keeps download data in
+    memory whatever it is handed, so this returns the whole file as bytes;
+    rows are still converted one chunk at a time rather than all at once.
+    """
+    return b"".join(stream_export(_frame_records(df), fmt))
+
+def render_portfolio(uploaded_files, store_path, ocr=None):
+    with st.spinner("Building portfolio views..."):
+        with span("portfolio.version"):
+            version = dataset_version(uploaded_files, store_path)
+        with span("portfolio.load"):
+            df = load_portfolio(version, uploaded_files, store_path, ocr)
+        with span("portfolio.views"):
+            views = portfolio_views(version, df)
+
+    totals = views["totals"]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Projects", f"{totals['projects']:,}")
+    with col2:
+        st.metric("Delayed", f"{totals['delayed']:,}")
+    with col3:
+        st.metric("Over Budget", f"{totals['over_budget']:,}")
+    with col4:
+        st.metric("Expenditure (Cr)", f"{totals['expenditure_crore']:,.0f} / {totals['planned_cost_crore']:,.0f}")
+
+    st.divider()
+    with span("render.charts"):
+        figures = portfolio_figures(version, views)
+        st.subheader("🚦 Status Overview")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.plotly_chart(figures["status_by_state"], use_container_width=True)
+        with c2:
+            st.plotly_chart(figures["status_by_sector"], use_container_width=True)
+
+        st.subheader("📈 Progress & Cost Analysis")
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.plotly_chart(figures["physical_bins"], use_container_width=True)
+        with c2:
+            st.plotly_chart(figures["financial_bins"], use_container_width=True)
+        with c3:
+            st.plotly_chart(figures["overrun_by_state"], use_container_width=True)
+
+    st.divider()
+    with span("render.table", rows=len(df)):
+        st.subheader("📊 Projects")
+        if len(df) > MAX_TABLE_ROWS:
+            st.caption(f"Showing the first {MAX_TABLE_ROWS:,} of {len(df):,} rows.")
+        st.dataframe(df.head(MAX_TABLE_ROWS), use_container_width=True)
+
+    with span("render.exports"):
+        st.subheader("📥 Export Portfolio")
+        c1, c2 = st.columns([1, 3])
+        with c1:
+            fmt = st.selectbox("Format", list(EXPORT_FORMATS), key="portfolio_export_format")
+        with c2:
+            # The export runs only when the button is clicked
+            st.download_button(f"Download {len(df):,} rows as {fmt.upper()}", lambda: export_portfolio(df, fmt),
+                               f"portfolio.{fmt}", EXPORT_FORMATS[fmt])
+
+# Title and Sidebar
+st.title("🏗️ InfraTrack AI")
+st.markdown("### Infrastructure Progress Extractor & Monitor")
+
+st.sidebar.header("Upload Reports")
+uploaded_files = st.sidebar.file_uploader("Upload PAIMANA PDFs", type=["pdf"], accept_multiple_files=True)
+store_path = st.sidebar.text_input("Project store (optional)", placeholder="infratrack.db")
+if store_path and not os.path.exists(store_path):
+    st.sidebar.warning(f"Project store not found: {store_path}")
+    store_path = ""
+
+ocr = None
+if st.sidebar.checkbox("OCR scanned pages", help="Runs Tesseract on pages that have no text layer"):
+    if os.environ.get("TESSERACT_CMD") or shutil.which("tesseract"):
+        ocr = "tesseract"
+    else:
+        st.sidebar.warning("Tesseract is not installed; scanned pages will stay empty.")
+
+# Off by default; spans are no-ops unless profiling is switched on. The
+# checkbox only profiles this session's run (INFRATRACK_PROFILE=memory also
+# traces bytes); it never touches the process-wide switch other sessions see.
+profile = st.sidebar.checkbox("Performance profiling", value=PROFILING_ENABLED)
+perf_events = start_recording(enable=profile)
+
+try:
+    if len(uploaded_files) == 1 and not store_path:
+        render_single_report(uploaded_files[0], ocr)
+    elif uploaded_files or store_path:
+        render_portfolio(uploaded_files, store_path, ocr)
+    else:
+        st.info("👈 Please upload a PDF report to begin.")
     
-    # Show Demo using generated sample if it exists
-    st.markdown("---")
-    st.markdown("#### Don't have a file? Use the demo file:")
-    with open("tests/sample_report.pdf", "rb") as f:
-        st.download_button("Download Sample PDF", f, "sample_report.pdf")
+        # Show Demo using generated sample if it exists
+        st.markdown("---")
+        st.markdown("#### Don't have a file? Use the demo file:")
+        with open("tests/sample_report.pdf", "rb") as f:
+            st.download_button("Download Sample PDF", f, "sample_report.pdf")
+finally:
+    stop_recording(perf_events)
+
+if profile and perf_events:
+    with st.expander("⏱️ Performance"):
+        summary = pd.DataFrame.from_dict(summarize(perf_events), orient="index")
+        st.dataframe(summary.sort_values("total_s", ascending=False), use_container_width=True)
+        st.caption("Per-page and per-phase events from this run")
+        st.dataframe(pd.DataFrame(perf_events), use_container_width=True)
+
+# Rendered last so the counters include this run
+stats = cache_stats()
+st.sidebar.caption(f"Extraction cache: {stats['hits']} hits / {stats['misses']} misses, {stats['entries']} entries")
@@ -0,0 +1,64 @@
+from src.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+def _group_key(df, by):
+    return df[by].fillna("Unknown")
+
+def status_counts(df, by):
+    """
+    Counts projects per status flag for each value of `by`.
+
+    Args:
+        df (pd.DataFrame): Project records with a 'status_flag' column.
+        by (str): Grouping column, e.g. 'state' or 'sector'.
+
+    Returns:
+        pd.DataFrame: Long format with columns [by, 'status_flag', 'projects'].
+    """
+    grouped = df.groupby([_group_key(df, by), df["status_flag"].fillna("Unknown")]).size()
+    return grouped.rename_axis([by, "status_flag"]).reset_index(name="projects")
+
+def cost_overrun_totals(df, by):
+    """
+    Sums cost overruns (expenditure above planned cost) for each value of `by`.
+
+    Returns:
+        pd.DataFrame: Columns [by, 'overrun_crore', 'projects_over_budget'],
+        largest overrun first.
+    """
+    overrun = (df["expenditure_till_date_crore"] - df["planned_cost_crore"]).clip(lower=0).fillna(0)
+    totals = pd.DataFrame({
+        by: _group_key(df, by),
+        "overrun_crore": overrun,
+        "projects_over_budget": overrun > 0,
+    }).groupby(by, as_index=False).sum()
+    return totals.sort_values("overrun_crore", ascending=False, ignore_index=True)
+
+def progress_histogram(df, column, bins=20, value_range=(0, 100)):
+    """
+    Pre-bins a progress column so charts draw `bins` bars instead of one mark per project.
+
+    Returns:
+        pd.DataFrame: Columns ['bin_start', 'bin_end', 'bin', 'projects'].
+    """
+    values = df[column].dropna().to_numpy(dtype=float)
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return pd.DataFrame({
+        "bin_start": edges[:-1],
+        "bin_end": edges[1:],
+        "bin": [f"{start:g}-{end:g}%" for start, end in zip(edges[:-1], edges[1:])],
+        "projects": counts,
+    })
+
+def portfolio_totals(df):
+    """Headline numbers for a set of project records."""
+    status = df["status_flag"].fillna("")
+    return {
+        "projects": int(len(df)),
+        "delayed": int(status.str.contains("DELAYED", regex=False).sum()),
+        "over_budget": int(status.str.contains("COST_OVERRUN", regex=False).sum()),
+        "planned_cost_crore": float(df["planned_cost_crore"].sum()),
+        "expenditure_crore": float(df["expenditure_till_date_crore"].sum()),
+    }
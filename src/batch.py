@@ -0,0 +1,376 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from src.cache import cache_version
+from src.extractor import extract_text_and_tables
+from src.parser import FIELDS
+from src.templates import parse_document_projects, table_keywords
+from src.store import (open_store, upsert_records, find_id_collisions, load_fingerprints,
+                       record_fingerprints, fetch_records)
+from src.utils import hash_file
+
+OUTPUT_FIELDS = ("source_file", "project_id") + FIELDS + ("status_flag", "error")
+
+# Parsed records are upserted into the project store in chunks of this size
+STORE_BATCH_SIZE = 500
+
+class FileTimeout(BaseException):
+    """
+    Raised inside a worker when a file exceeds its time budget.
+    Derives from BaseException so the extractor's `except Exception` can't swallow it.
+    """
+
+def _raise_timeout(signum, frame):
+    raise FileTimeout()
+
+@contextmanager
+def time_limit(timeout):
+    """
+    Raises FileTimeout in the block once `timeout` seconds have passed.
+    Enforced with SIGALRM where available (POSIX, main thread of a worker
+    process); without a timeout, or elsewhere, the block runs unbounded.
+    """
+    if not (timeout and hasattr(signal, "setitimer")):
+        yield
+        return
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def process_file(path, timeout=None, ocr=None, source_hash=None, ocr_workers=None):
+    """
+    Extracts and parses a single PDF, one record per project for consolidated
+    reports. Runs inside a pool worker and never raises.
+
+    Args:
+        path (str): Path to the PDF file.
+        timeout (float, optional): Per-file time budget in seconds. Enforced with
+            SIGALRM where available (POSIX), ignored elsewhere.
+        ocr (str, optional): OCR backend for pages without a text layer.
+        source_hash (str, optional): The file's SHA-256, if the caller already has it.
+        ocr_workers (int, optional): Concurrent OCR recognitions for this file.
+            None uses all CPUs.
+
+    Returns:
+        tuple: (path, status, records) where status is 'ok', 'error' or
+        'timeout' and records lists the parsed dicts (or one error stub).
+    """
+    try:
+        with time_limit(timeout):
+            extracted = extract_text_and_tables(path, table_keywords=table_keywords(), ocr=ocr,
+                                                ocr_workers=ocr_workers)
+            if not extracted:
+                return path, "error", [{"source_file": path, "error": "extraction failed"}]
+
+            records = parse_document_projects(extracted, source_hash or hash_file(path))
+        for record in records:
+            record["source_file"] = path
+        return path, "ok", records
+    except FileTimeout:
+        return path, "timeout", [{"source_file": path, "error": f"timed out after {timeout}s"}]
+    except Exception as e:
+        return path, "error", [{"source_file": path, "error": str(e)}]
+
+def collect_pdfs(inputs):
+    """Expands folders (recursively), globs and file paths into a sorted list of unique PDF paths."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True)
+            matches += glob.glob(os.path.join(item, "**", "*.PDF"), recursive=True)
+        else:
+            matches = glob.glob(item, recursive=True)
+        paths.update(os.path.abspath(path) for path in matches if os.path.isfile(path))
+    return sorted(paths)
+
+def load_checkpoint(checkpoint_path):
+    """Returns {path: status} for every file already recorded in the checkpoint."""
+    done = {}
+    if not os.path.exists(checkpoint_path):
+        return done
+
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A crash can leave a torn last line; that file is simply redone
+                continue
+            done[entry["file"]] = entry["status"]
+    return done
+
+class ResultSink:
+    """
+    Appends records to a JSONL or CSV file (chosen by extension) as they arrive.
+    With `truncate`, the file is started afresh instead.
+    """
+
+    def __init__(self, path, truncate=False):
+        self.path = path
+        self.is_csv = path.lower().endswith(".csv")
+        needs_header = truncate or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "w" if truncate else "a", encoding="utf-8", newline="")
+        if self.is_csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            if needs_header:
+                self.writer.writeheader()
+
+    def write(self, record):
+        if self.is_csv:
+            self.writer.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def processing_version(ocr=None):
+    """Names the extractor/parser generation (and OCR backend) a record was produced by."""
+    return cache_version() + (f"-ocr:{ocr}" if ocr else "")
+
+def fingerprint_file(path, known=None):
+    """
+    Returns {path, size, mtime_ns, content_hash} for a file. The content is
+    only hashed when size or mtime differ from the `known` fingerprint.
+    """
+    stat = os.stat(path)
+    fingerprint = {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+        fingerprint["content_hash"] = known["content_hash"]
+    else:
+        fingerprint["content_hash"] = hash_file(path)
+    return fingerprint
+
+def plan_incremental(conn, paths, version):
+    """
+    Splits `paths` into files that need processing and files whose stored
+    records can be carried forward.
+
+    A file is reprocessed when it is new, its content hash changed, it was
+    processed by another parser version, or any of its records is no longer
+    in the store.
+
+    Returns:
+        tuple: (todo, carried) where todo is a list of (fingerprint, reason)
+        with reason 'new', 'changed' or 'outdated', and carried is a list of
+        (fingerprint, records) for unchanged files.
+    """
+    known = load_fingerprints(conn)
+    todo = []
+    unchanged = []
+    for path in paths:
+        previous = known.get(path)
+        fingerprint = fingerprint_file(path, previous)
+        fingerprint["parser_version"] = version
+        if previous is None:
+            todo.append((fingerprint, "new"))
+        elif previous["content_hash"] != fingerprint["content_hash"]:
+            todo.append((fingerprint, "changed"))
+        elif previous["parser_version"] != version:
+            todo.append((fingerprint, "outdated"))
+        else:
+            fingerprint["record_keys"] = previous["record_keys"]
+            unchanged.append((fingerprint, previous))
+
+    stored = fetch_records(conn, [key for fp, _ in unchanged for key in fp["record_keys"]])
+    carried = []
+    touched = []
+    for fingerprint, previous in unchanged:
+        records = [stored.get(key) for key in fingerprint["record_keys"]]
+        if not records or None in records:
+            todo.append((fingerprint, "outdated"))
+            continue
+        records = [dict(record, report_month=record["report_month"] or None) for record in records]
+        carried.append((fingerprint, records))
+        if fingerprint["mtime_ns"] != previous["mtime_ns"]:
+            touched.append(fingerprint)
+
+    # Touched but identical files: remember the new mtime so they aren't hashed again
+    if touched:
+        record_fingerprints(conn, touched)
+    return todo, carried
+
+def _record_checkpoint(checkpoint_file, path, status):
+    checkpoint_file.write(json.dumps({"file": path, "status": status}) + "\n")
+    checkpoint_file.flush()
+    os.fsync(checkpoint_file.fileno())
+
+def _flush_store(conn, pending, sink, checkpoint_file, fingerprints=None):
+    """
+    Upserts buffered (path, records) pairs, records the fingerprints of their
+    files (if given, as {path: fingerprint}), then writes each file's records
+    to the sink and checkpoints it, so store, output and checkpoint advance together.
+    """
+    records = [record for _, file_records in pending for record in file_records]
+    for project_id, name, other_name in find_id_collisions(conn, records):
+        print(f"WARNING: project ID collision {project_id}: '{name}' vs '{other_name}'")
+    upsert_records(conn, records)
+    if fingerprints:
+        record_fingerprints(conn, [
+            dict(fingerprints[path], record_keys=[(record.get("project_id"), record.get("report_month") or "")
+                                                  for record in file_records])
+            for path, file_records in pending
+        ])
+    for path, file_records in pending:
+        for record in file_records:
+            sink.write(record)
+        _record_checkpoint(checkpoint_file, path, "ok")
+    pending.clear()
+
+def run_batch(inputs, output, checkpoint=None, workers=None, timeout=300, retry_failed=False, store=None,
+              ocr=None, incremental=False, ocr_workers=None):
+    """
+    Ingests every PDF under `inputs` through a process pool, streaming records
+    to `output` and checkpointing each finished file so a rerun resumes.
+
+    Args:
+        inputs (list): Folders, glob patterns or PDF paths.
+        output (str): Result file, .jsonl or .csv.
+        checkpoint (str, optional): Checkpoint file. Defaults to `<output>.checkpoint`.
+        workers (int, optional): Pool size. None uses all CPUs.
+        timeout (float, optional): Per-file time budget in seconds.
+        retry_failed (bool): Reprocess files that previously errored or timed out.
+        store (str, optional): Project store (SQLite) to bulk-upsert parsed records into.
+        ocr (str, optional): OCR backend for scanned pages, e.g. "tesseract".
+        incremental (bool): Decide what to process from the file fingerprints in
+            `store` instead of the checkpoint: only new, changed or outdated
+            (older parser version) files are processed, and the stored records
+            of unchanged files are carried forward into `output`. Requires `store`.
+            The run writes the full result set, so `output` is replaced (once
+            the run completes) rather than appended to.
+        ocr_workers (int, optional): Concurrent OCR recognitions per file, on
+            top of the `workers` pool. None uses all CPUs.
+
+    Returns:
+        dict: Counts of 'ok', 'error', 'timeout' and 'skipped' files. Incremental
+        runs add 'new', 'changed' and 'outdated' (why files were processed) and
+        'carried' (files whose records were carried forward; they count as skipped).
+    """
+    if incremental and not store:
+        raise ValueError("Incremental runs need a project store")
+
+    checkpoint = checkpoint or output + ".checkpoint"
+    summary = {"ok": 0, "error": 0, "timeout": 0, "skipped": 0}
+    conn = open_store(store) if store else None
+    fingerprints = {}
+    carried = []
+    pending = []
+    try:
+        if incremental:
+            todo, carried = plan_incremental(conn, collect_pdfs(inputs), processing_version(ocr))
+            summary.update({"new": 0, "changed": 0, "outdated": 0, "carried": len(carried)})
+            summary["skipped"] = len(carried)
+            for fingerprint, reason in todo:
+                summary[reason] += 1
+                fingerprints[fingerprint["path"]] = fingerprint
+                pending.append(fingerprint["path"])
+        else:
+            done = load_checkpoint(checkpoint)
+            for path in collect_pdfs(inputs):
+                status = done.get(path)
+                if status == "ok" or (status is not None and not retry_failed):
+                    summary["skipped"] += 1
+                else:
+                    pending.append(path)
+
+        if not pending and not carried:
+            return summary
+
+        # Incremental runs rewrite every record, so they build a fresh file and
+        # swap it in; an interrupted run leaves the previous output untouched
+        sink = ResultSink(output + ".partial", truncate=True) if incremental else ResultSink(output)
+        try:
+            for _, records in carried:
+                for record in records:
+                    sink.write(record)
+            if pending:
+                _process_pending(pending, sink, conn, checkpoint, workers, timeout, ocr, ocr_workers,
+                                 fingerprints, summary)
+        finally:
+            sink.close()
+        if incremental:
+            os.replace(sink.path, output)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    return summary
+
+def _process_pending(pending, sink, conn, checkpoint, workers, timeout, ocr, ocr_workers, fingerprints, summary):
+    to_store = []
+    stored_records = 0
+    with open(checkpoint, "a", encoding="utf-8") as checkpoint_file, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(process_file, path, timeout, ocr,
+                        fingerprints.get(path, {}).get("content_hash"), ocr_workers)
+            for path in pending
+        ]
+        for future in as_completed(futures):
+            path, status, records = future.result()
+            summary[status] += 1
+            if status != "ok":
+                print(f"{status.upper()}: {path}: {records[0]['error']}")
+
+            if conn is not None and status == "ok":
+                # Output and checkpoint only once the records are safely in the
+                # store, so a resumed run neither redoes nor repeats them
+                to_store.append((path, records))
+                stored_records += len(records)
+                if stored_records >= STORE_BATCH_SIZE:
+                    _flush_store(conn, to_store, sink, checkpoint_file, fingerprints)
+                    stored_records = 0
+            else:
+                for record in records:
+                    sink.write(record)
+                _record_checkpoint(checkpoint_file, path, status)
+
+        if conn is not None:
+            _flush_store(conn, to_store, sink, checkpoint_file, fingerprints)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Batch-ingest PAIMANA PDF reports into a JSONL/CSV file."
+    )
+    parser.add_argument("inputs", nargs="+", help="Folders, glob patterns or PDF files")
+    parser.add_argument("-o", "--output", required=True, help="Result file (.jsonl or .csv)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-file timeout in seconds (default: 300)")
+    parser.add_argument("--retry-failed", action="store_true", help="Reprocess files that failed or timed out")
+    parser.add_argument("--store", help="Also upsert parsed records into this SQLite project store")
+    parser.add_argument("--ocr", choices=["tesseract"], help="OCR pages that have no text layer with this backend")
+    parser.add_argument("--ocr-workers", type=int, default=None,
+                        help="Concurrent OCR recognitions per file (default: all CPUs)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only process new, changed or outdated files (per --store) and carry the rest forward")
+    args = parser.parse_args(argv)
+    if args.incremental and not args.store:
+        parser.error("--incremental requires --store")
+
+    summary = run_batch(args.inputs, args.output, args.checkpoint, args.workers,
+                        args.timeout, args.retry_failed, args.store, args.ocr, args.incremental,
+                        args.ocr_workers)
+    if args.incremental:
+        print(f"Incremental: processing {summary['new']} new, {summary['changed']} changed, "
+              f"{summary['outdated']} outdated; carried forward {summary['carried']} unchanged.")
+        print(f"Processed {summary['ok']} ok, {summary['error']} errors, {summary['timeout']} timeouts.")
+    else:
+        print(f"Processed {summary['ok']} ok, {summary['error']} errors, "
+              f"{summary['timeout']} timeouts; skipped {summary['skipped']} already done.")
+    return 0 if summary["error"] == 0 and summary["timeout"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from src.extractor import extract_text_and_tables, ExtractedDocument, EXTRACTOR_VERSION
+from src.parser import PARSER_VERSION
+from src.templates import parse_document_projects, table_keywords, templates_version
+from src.profiling import span
+
+# Used when INFRATRACK_CACHE_DIR isn't set, see _cache_dir()
+CACHE_DIR = ".infratrack_cache"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Per-process counters, see cache_stats()
+CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+def cache_version():
+    """Names the cache generation; entries from other versions are never read."""
+    return f"e{EXTRACTOR_VERSION}-p{PARSER_VERSION}-t{templates_version()}"
+
+def cache_key(pdf_hash, table_keywords=None, ocr=None):
+    """
+    Content-addressed key for a PDF.
+
+    Args:
+        pdf_hash (str): SHA-256 hex digest of the raw PDF content.
+        table_keywords (iterable of str, optional): Extraction option that
+            changes the stored tables, so it is part of the key.
+        ocr (str, optional): Name of the OCR backend, which changes the text
+            of scanned pages.
+
+    Returns:
+        str: Hex digest of the PDF hash plus the extractor/parser versions.
+    """
+    digest = hashlib.sha256(pdf_hash.encode())
+    digest.update(cache_version().encode())
+    if table_keywords is not None:
+        digest.update("\0".join(sorted(table_keywords)).encode())
+    if ocr is not None:
+        digest.update(f"\0ocr:{ocr}".encode())
+    return digest.hexdigest()
+
+def _cache_dir(cache_dir=None):
+    """`cache_dir`, else INFRATRACK_CACHE_DIR as set at call time, else CACHE_DIR."""
+    return cache_dir or os.environ.get("INFRATRACK_CACHE_DIR") or CACHE_DIR
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, cache_version(), f"{key}.json")
+
+def _iter_entries(cache_dir, suffix=".json"):
+    """Yields (path, size, mtime) for every cache entry across all versions."""
+    if not os.path.isdir(cache_dir):
+        return
+    for version_dir in os.scandir(cache_dir):
+        if not version_dir.is_dir():
+            continue
+        for entry in os.scandir(version_dir.path):
+            if entry.name.endswith(suffix):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+def load_cached(key, cache_dir=None):
+    """
+    Returns the cached entry for `key`, or None on a miss.
+    A hit refreshes the entry's mtime, which is what LRU eviction orders by.
+    """
+    path = _entry_path(key, _cache_dir(cache_dir))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        os.utime(path)
+    except (OSError, ValueError):
+        CACHE_STATS["misses"] += 1
+        return None
+
+    CACHE_STATS["hits"] += 1
+    return entry
+
+def store_cached(key, entry, cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+    """Atomically writes an entry, then evicts least recently used entries over `max_bytes`."""
+    cache_dir = _cache_dir(cache_dir)
+    path = _entry_path(key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing cache entry: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    evict(cache_dir, max_bytes)
+
+def evict(cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+    """Removes least recently used entries until the cache fits in `max_bytes`."""
+    CACHE_STATS["evictions"] += evict_entries(_cache_dir(cache_dir), max_bytes)
+
+def evict_entries(cache_dir, max_bytes, suffix=".json"):
+    """
+    LRU eviction for any cache laid out as `cache_dir/<group>/<entry><suffix>`
+    whose hits refresh the entry's mtime (this one, and src.ocr's).
+
+    Returns:
+        int: Number of entries removed.
+    """
+    entries = sorted(_iter_entries(cache_dir, suffix), key=lambda e: e[2])
+    total = sum(size for _, size, _ in entries)
+
+    removed = 0
+    for path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+def invalidate_cache(cache_dir=None, stale_only=True):
+    """
+    Drops cache entries.
+
+    Args:
+        cache_dir (str, optional): Cache directory, see _cache_dir().
+        stale_only (bool): If True, only remove entries written by other
+            extractor/parser versions (e.g. after bumping PARSER_VERSION).
+            If False, clear everything.
+
+    Returns:
+        int: Number of version directories removed.
+    """
+    cache_dir = _cache_dir(cache_dir)
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    removed = 0
+    for version_dir in os.scandir(cache_dir):
+        if version_dir.is_dir() and not (stale_only and version_dir.name == cache_version()):
+            shutil.rmtree(version_dir.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+def cache_stats(cache_dir=None):
+    """Returns hit/miss/eviction counters plus the current entry count and size."""
+    entries = list(_iter_entries(_cache_dir(cache_dir)))
+    stats = dict(CACHE_STATS)
+    stats["entries"] = len(entries)
+    stats["bytes"] = sum(size for _, size, _ in entries)
+    return stats
+
+def _content_hash(pdf_source):
+    """SHA-256 hex digest and size of a bytes-like or file-like PDF (the cursor is left where it was)."""
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(pdf_source).hexdigest(), memoryview(pdf_source).nbytes
+    if hasattr(pdf_source, "getbuffer"):
+        # In-memory uploads (BytesIO, Streamlit's UploadedFile): hash in place
+        with pdf_source.getbuffer() as view:
+            return _content_hash(view)
+
+    digest = hashlib.sha256()
+    size = 0
+    position = pdf_source.tell()
+    pdf_source.seek(0)
+    for chunk in iter(lambda: pdf_source.read(1024 * 1024), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    pdf_source.seek(position)
+    return digest.hexdigest(), size
+
+def extract_and_parse_cached(pdf_bytes, cache_dir=None, max_bytes=MAX_CACHE_BYTES, ocr=None, projects=False,
+                             ocr_workers=None):
+    """
+    Extracts and parses a PDF, going through the on-disk cache.
+    On a hit pdfplumber is not touched at all.
+
+    Args:
+        pdf_bytes (bytes-like or file-like object): Raw PDF content, e.g. an
+            upload. It is hashed in place and handed to the extractor as is,
+            so large uploads are spilled to disk rather than copied.
+        cache_dir (str, optional): Cache directory. Defaults to
+            INFRATRACK_CACHE_DIR (read on every call), else CACHE_DIR.
+        max_bytes (int): Size bound for LRU eviction.
+        ocr (str, optional): OCR backend for scanned pages, see src.ocr.
+        projects (bool): Return every project of a consolidated report
+            instead of the first one only.
+        ocr_workers (int, optional): Concurrent OCR recognitions, see
+            extract_text_and_tables. Doesn't change the result, so it isn't
+            part of the cache key.
+
+    Returns:
+        tuple: (extracted_data, parsed_info), or (extracted_data, [parsed_info, ...])
+        with `projects`; (None, None) if extraction failed.
+    """
+    with span("cache.lookup") as lookup:
+        pdf_hash, size = _content_hash(pdf_bytes)
+        keywords = table_keywords()
+        key = cache_key(pdf_hash, keywords, ocr)
+        entry = load_cached(key, cache_dir)
+        if lookup is not None:
+            lookup.labels["bytes"] = size
+    if entry is not None:
+        extracted_data = ExtractedDocument(entry["extracted"])
+        records = entry.get("projects") or [entry["parsed"]]
+        return extracted_data, (records if projects else records[0])
+
+    extracted_data = extract_text_and_tables(pdf_bytes, table_keywords=keywords, ocr=ocr, ocr_workers=ocr_workers)
+    if not extracted_data:
+        return None, None
+
+    # Kept with the extraction so the app can show where each field came from
+    sources = []
+    records = parse_document_projects(extracted_data, pdf_hash, sources)
+    extracted_data["field_sources"] = sources[0]
+    entry = {"extracted": extracted_data, "parsed": records[0]}
+    if len(records) > 1:
+        extracted_data["project_sources"] = sources
+        entry["projects"] = records
+    store_cached(key, entry, cache_dir, max_bytes)
+    return extracted_data, (records if projects else records[0])
@@ -0,0 +1,228 @@
+"""
+Streaming export of project records to CSV, JSON Lines or Parquet.
+
+Records come from any iterator of dicts: the project store
+(src.store.iter_records), a batch result file (iter_result_file) or parsed
+uploads. They are encoded `chunk_size` at a time, so memory stays bounded by
+one chunk whatever the export size:
+
+    python -m src.export --store infratrack.db -o portfolio.parquet --state Karnataka
+    python -m src.export --results results.jsonl -o results.csv
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from src.lazy import lazy_import
+from src.store import STORE_COLUMNS, NUMERIC_COLUMNS, FILTER_COLUMNS, open_store, iter_records
+
+# Optional dependency, only needed for Parquet
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXPORT_CHUNK_SIZE = 10000
+PARQUET_COMPRESSION = "zstd"
+
+def export_format(path):
+    """Returns the export format for a file name by its extension (.csv, .jsonl/.ndjson, .parquet)."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    extension = {"ndjson": "jsonl", "pq": "parquet"}.get(extension, extension)
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {path}")
+    return extension
+
+def _chunks(records, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _csv_chunks(records, fields, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for chunk in _chunks(records, chunk_size):
+        writer.writerows([list(map(record.get, fields)) for record in chunk])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def _jsonl_chunks(records, fields, chunk_size):
+    for chunk in _chunks(records, chunk_size):
+        yield "".join(
+            json.dumps(dict(zip(fields, map(record.get, fields)))) + "\n" for record in chunk
+        ).encode("utf-8")
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects what the Parquet writer emits until it is drained."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+def _parquet_schema(fields):
+    return pa.schema([(field, pa.float64() if field in NUMERIC_COLUMNS else pa.string()) for field in fields])
+
+def _parquet_value(field, value):
+    if field in NUMERIC_COLUMNS:
+        return float(value) if value not in (None, "") else None
+    return None if value is None else str(value)
+
+def _record_batch(chunk, fields, schema):
+    columns = {field: [record.get(field) for record in chunk] for field in fields}
+    try:
+        return pa.RecordBatch.from_pydict(columns, schema=schema)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Loosely typed input (e.g. numbers as text): coerce value by value
+        columns = {field: [_parquet_value(field, value) for value in values] for field, values in columns.items()}
+        return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+def _parquet_chunks(records, fields, chunk_size):
+    try:
+        schema = _parquet_schema(fields)
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow; install it or export CSV/JSONL")
+
+    sink = _ChunkSink()
+    # Each chunk becomes one row group, flushed to the sink as it is written
+    writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+    try:
+        for chunk in _chunks(records, chunk_size):
+            writer.write_batch(_record_batch(chunk, fields, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+_ENCODERS = {"csv": _csv_chunks, "jsonl": _jsonl_chunks, "parquet": _parquet_chunks}
+
+def stream_export(records, fmt, fields=STORE_COLUMNS, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Encodes records chunk by chunk.
+
+    Args:
+        records (iterable): Dicts; missing keys and None are exported as
+            empty. Convert NaN to None first (see app.py's _frame_records).
+        fmt (str): One of EXPORT_FORMATS.
+        fields (tuple): Columns, in order.
+        chunk_size (int): Records encoded per chunk.
+
+    Yields:
+        bytes: Consecutive pieces of the file, e.g. for a chunked HTTP response.
+    """
+    if fmt not in _ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    for data in _ENCODERS[fmt](records, list(fields), chunk_size):
+        if data:
+            yield data
+
+def export_to_file(records, path, fmt=None, fields=STORE_COLUMNS, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Streams records into `path` (written to a temp file and renamed when complete).
+
+    Returns:
+        int: Bytes written.
+    """
+    fmt = fmt or export_format(path)
+    tmp_path = path + ".tmp"
+    written = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for data in stream_export(records, fmt, fields, chunk_size):
+                f.write(data)
+                written += len(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+def iter_result_file(path):
+    """Streams the records of a batch result file (.jsonl or .csv, see src.batch.ResultSink)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                for column in NUMERIC_COLUMNS:
+                    if column in row:
+                        row[column] = float(row[column]) if row[column] else None
+                yield {key: (value if value != "" else None) for key, value in row.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export project records to CSV, JSONL or Parquet.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--store", help="SQLite project store to export from")
+    source.add_argument("--results", help="Batch result file (.jsonl or .csv) to convert")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), help="Default: from the output extension")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Records per chunk")
+    for column in FILTER_COLUMNS:
+        parser.add_argument(f"--{column.replace('_', '-')}", dest=column, action="append",
+                            help=f"Only export rows with this {column} (repeatable)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.store:
+        conn = open_store(args.store)
+        filters = {column: getattr(args, column) for column in FILTER_COLUMNS}
+        records = iter_records(conn, chunk_size=args.chunk_size, **filters)
+        fields = STORE_COLUMNS
+    else:
+        from src.batch import OUTPUT_FIELDS
+        conn = None
+        records = iter_result_file(args.results)
+        fields = OUTPUT_FIELDS
+
+    counted = [0]
+    def counting(records):
+        for record in records:
+            counted[0] += 1
+            yield record
+
+    try:
+        written = export_to_file(counting(records), args.output, args.format, fields, args.chunk_size)
+    except RuntimeError as e:
+        print(f"Error exporting: {e}")
+        return 1
+    finally:
+        if conn is not None:
+            conn.close()
+    print(f"Exported {counted[0]:,} records ({written / 1024 / 1024:.1f} MiB) to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
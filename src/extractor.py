@@ -1,35 +1,423 @@
-import pdfplumber
+import bisect
+import io
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager, nullcontext
+from src.lazy import lazy_import
+from src.profiling import span
 
-def extract_text_and_tables(pdf_path):
+# Imported on first use, so cache hits never load pdfplumber (or pdfminer)
+pdfplumber = lazy_import("pdfplumber")
+
+# Bump whenever the extracted text/tables change for the same input, so
+# cached extraction results are invalidated.
+EXTRACTOR_VERSION = "2"
+
+# Each worker gets a few contiguous chunks so a slow page doesn't stall the pool.
+CHUNKS_PER_WORKER = 2
+
+# In-memory uploads larger than this are written to a temp file and mmapped
+SPILL_THRESHOLD = 32 * 1024 * 1024
+
+class _BufferReader(io.RawIOBase):
+    """Read-only, seekable stream over a bytes-like object, without copying it."""
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+def _is_path(pdf_source):
+    return isinstance(pdf_source, (str, os.PathLike))
+
+def _stream_size(stream):
+    position = stream.tell()
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+@contextmanager
+def _spilled(stream):
+    """Copies a file-like object to a temp file (without moving its cursor) and yields the path."""
+    position = stream.tell()
+    stream.seek(0)
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(stream, f, 1024 * 1024)
+        stream.seek(position)
+        yield path
+    finally:
+        os.remove(path)
+
+@contextmanager
+def _open_source(pdf_source, spill_threshold=None):
+    """
+    Yields a seekable binary stream over any supported input, avoiding copies:
+
+    - paths and real files are memory-mapped, so pages are read from the OS
+      page cache instead of being held in the process;
+    - bytes, bytearray and memoryview are read in place;
+    - in-memory file objects (e.g. Streamlit's UploadedFile) are read in place
+      up to `spill_threshold` bytes (default SPILL_THRESHOLD), and spilled to
+      a mmapped temp file above it.
+    """
+    if spill_threshold is None:
+        spill_threshold = SPILL_THRESHOLD
+    if _is_path(pdf_source):
+        with open(pdf_source, "rb") as f:
+            with _open_source(f, spill_threshold) as stream:
+                yield stream
+        return
+
+    if isinstance(pdf_source, bytes):
+        # BytesIO shares an immutable bytes buffer until it is written to
+        yield io.BytesIO(pdf_source)
+        return
+    if isinstance(pdf_source, (bytearray, memoryview)):
+        with io.BufferedReader(_BufferReader(pdf_source)) as stream:
+            yield stream
+        return
+
+    try:
+        fileno = pdf_source.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is not None and os.fstat(fileno).st_size > 0:
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+        return
+    if fileno is not None:
+        # Empty file: nothing to map, let pdfplumber report it
+        yield pdf_source
+        return
+
+    if _stream_size(pdf_source) > spill_threshold:
+        with _spilled(pdf_source) as path:
+            with _open_source(path) as stream:
+                yield stream
+    elif hasattr(pdf_source, "getbuffer"):
+        with io.BufferedReader(_BufferReader(pdf_source.getbuffer())) as stream:
+            yield stream
+    else:
+        position = pdf_source.tell()
+        pdf_source.seek(0)
+        data = pdf_source.read()
+        pdf_source.seek(position)
+        yield io.BytesIO(data)
+
+def _page_is_relevant(text, table_keywords):
+    """True if the page text mentions any of the (lowercased) table keywords."""
+    if not text:
+        return False
+    # Collapse whitespace so labels wrapped inside a table cell still match
+    normalized = re.sub(r'\s+', ' ', text).lower()
+    return any(keyword in normalized for keyword in table_keywords)
+
+def _extract_page(page, table_keywords=None):
+    """
+    Runs text and table extraction on a single pdfplumber page, then releases
+    the page's cached layout objects so memory stays flat with page count.
+
+    Returns:
+        tuple: (text, tables, skipped) where `skipped` is True if table
+        detection was not run because the page text matched no keyword.
+    """
+    try:
+        with span("extract.text", page=page.page_number):
+            text = page.extract_text()
+        if table_keywords is not None and not _page_is_relevant(text, table_keywords):
+            return text, [], True
+        with span("extract.tables", page=page.page_number):
+            tables = page.extract_tables()
+        return text, tables, False
+    finally:
+        page.close()
+
+def _normalize_keywords(table_keywords):
+    if table_keywords is None:
+        return None
+    return tuple(re.sub(r'\s+', ' ', keyword).strip().lower() for keyword in table_keywords)
+
+def _extract_page_range(pdf_source, start, stop, table_keywords=None):
+    """
+    Worker entry point: opens the PDF itself and extracts pages[start:stop].
+
+    Args:
+        pdf_source (str or bytes): Path to the PDF file or its raw bytes.
+        start (int): Index of the first page to extract.
+        stop (int): Index one past the last page to extract.
+        table_keywords (tuple, optional): Normalized keywords for table gating.
+
+    Returns:
+        list: (text, tables, skipped) tuples, one per page, in page order.
+    """
+    with _open_source(pdf_source) as stream, pdfplumber.open(stream) as pdf:
+        return [_extract_page(page, table_keywords) for page in pdf.pages[start:stop]]
+
+def _page_ranges(page_count, chunks):
+    """Splits range(page_count) into at most `chunks` contiguous (start, stop) ranges."""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+class ExtractedDocument(dict):
+    """
+    Extractor output, kept per page:
+
+        pages         page texts in document order ('' for pages without text)
+        page_offsets  start of each page in the flat text
+        tables        every table, in document order
+        table_pages   1-based page number of each table in `tables`
+        ocr_pages     1-based pages whose text came from OCR (only with `ocr`)
+        field_sources where each parsed field was found (added by src.cache,
+                      see src.templates.parse_document)
+        project_sources
+                      field_sources of every project, for consolidated
+                      reports (see src.parser.parse_projects)
+
+    doc["text"] still returns the flat document text (pages joined by
+    newlines, pages without text left out). It is joined on first access and
+    memoized outside the dict, so it is never stored twice or serialized.
+    """
+
+    def __missing__(self, key):
+        if key != "text":
+            raise KeyError(key)
+        text = self.__dict__.get("_text")
+        if text is None:
+            text = self.__dict__["_text"] = "".join(page + "\n" for page in self["pages"] if page)
+        return text
+
+    def get(self, key, default=None):
+        if key == "text" and "pages" in self:
+            return self["text"]
+        return super().get(key, default)
+
+    def page_for_offset(self, offset):
+        """Returns the 1-based page number that holds `offset` in the flat text."""
+        return bisect.bisect_right(self["page_offsets"], offset)
+
+def _page_offsets(pages):
+    """Start of each page in the flat text, where non-empty pages are joined by newlines."""
+    offsets = []
+    offset = 0
+    for text in pages:
+        offsets.append(offset)
+        if text:
+            offset += len(text) + 1
+    return offsets
+
+def _merge_pages(page_results, gated=False):
+    """Merges per-page (text, tables, skipped) results into an ExtractedDocument."""
+    pages = []
+    tables = []
+    table_pages = []
+    skipped_pages = []
+
+    for page_number, (text, page_tables, skipped) in enumerate(page_results, start=1):
+        pages.append(text or "")
+        if page_tables:
+            tables.extend(page_tables)
+            table_pages.extend([page_number] * len(page_tables))
+        if skipped:
+            skipped_pages.append(page_number)
+
+    extracted_data = ExtractedDocument(
+        pages=pages, page_offsets=_page_offsets(pages), tables=tables, table_pages=table_pages
+    )
+    if gated:
+        extracted_data["skipped_table_pages"] = skipped_pages
+
+    return extracted_data
+
+@contextmanager
+def _shared_path(pdf_source):
+    """
+    Yields a path every worker can open (and mmap) independently: paths are
+    passed through, anything else is spilled to a temp file once instead of
+    being pickled to every worker.
+    """
+    if _is_path(pdf_source):
+        yield os.fspath(pdf_source)
+        return
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        with _BufferReader(pdf_source) as reader, _spilled(reader) as path:
+            yield path
+        return
+    with _spilled(pdf_source) as path:
+        yield path
+
+def _extract_parallel(pdf_path, workers, table_keywords=None):
+    with _shared_path(pdf_path) as source:
+        return _extract_parallel_path(source, workers, table_keywords)
+
+def _extract_parallel_path(source, workers, table_keywords=None):
+    # multiprocessing is slow to import and only needed on this path
+    from concurrent.futures import ProcessPoolExecutor
+
+    gated = table_keywords is not None
+    with _open_source(source) as stream, pdfplumber.open(stream) as pdf:
+        page_count = len(pdf.pages)
+
+    if page_count < 2:
+        return _merge_pages(_extract_page_range(source, 0, page_count, table_keywords), gated)
+
+    ranges = _page_ranges(page_count, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [
+            pool.submit(_extract_page_range, source, start, stop, table_keywords)
+            for start, stop in ranges
+        ]
+        # Collect in submission order so pages are merged back in document order
+        page_results = []
+        for future in futures:
+            page_results.extend(future.result())
+
+    return _merge_pages(page_results, gated)
+
+def _apply_ocr(pdf_source, extracted_data, ocr, workers=1):
+    """Fills pages without a text layer with OCR output, in place."""
+    blank = [page_number for page_number, text in enumerate(extracted_data["pages"], start=1)
+             if not text.strip()]
+    extracted_data["ocr_pages"] = []
+    if not blank:
+        return
+
+    # Only documents with blank pages pay for the OCR stack's imports
+    from src.ocr import get_backend, ocr_pages
+
+    try:
+        backend = get_backend(ocr)
+    except RuntimeError as e:
+        # A missing engine shouldn't cost the pages that do have text
+        print(f"OCR unavailable, skipping {len(blank)} page(s): {e}")
+        return
+
+    with _open_source(pdf_source) as stream:
+        # pypdfium2 (used to rasterize) doesn't take an mmap, only readinto()-capable streams
+        readable = io.BufferedReader(_BufferReader(stream)) if isinstance(stream, mmap.mmap) else nullcontext(stream)
+        with readable as stream, pdfplumber.open(stream) as pdf:
+            texts = ocr_pages(pdf, blank, backend, workers)
+
+    pages = extracted_data["pages"]
+    for page_number, text in texts.items():
+        # Tesseract ends every page with a form feed
+        pages[page_number - 1] = text.strip()
+    extracted_data["page_offsets"] = _page_offsets(pages)
+    extracted_data["ocr_pages"] = sorted(page_number for page_number in texts if pages[page_number - 1])
+    extracted_data.__dict__.pop("_text", None)
+
+def iter_pages(pdf_path, table_keywords=None):
+    """
+    Lazily extracts a PDF one page at a time.
+
+    Pages are only opened as the consumer asks for them, and each page's
+    cached layout is released once it has been extracted, so stopping early
+    (e.g. src.parser.parse_pages) skips the remaining pages entirely.
+
+    Args:
+        pdf_path (str, bytes, memoryview or file-like object): The PDF, as in
+            extract_text_and_tables.
+        table_keywords (iterable of str, optional): Relevance gate for table
+            detection, as in extract_text_and_tables.
+
+    Yields:
+        dict: 'page_number' (1-based), 'text' (str or None) and 'tables'.
+    """
+    table_keywords = _normalize_keywords(table_keywords)
+
+    with _open_source(pdf_path) as stream, pdfplumber.open(stream) as pdf:
+        for page_number, page in enumerate(pdf.pages, start=1):
+            text, tables, _ = _extract_page(page, table_keywords)
+            yield {"page_number": page_number, "text": text, "tables": tables}
+
+def extract_text_and_tables(pdf_path, workers=1, table_keywords=None, ocr=None, ocr_workers=None):
     """
     Extracts text and tables from a PDF file.
 
     Args:
-        pdf_path (str or file-like object): Path to the PDF file or file object.
+        pdf_path (str, bytes, memoryview or file-like object): The PDF. Files
+            on disk are memory-mapped; in-memory file objects larger than
+            SPILL_THRESHOLD are spilled to a temp file and mapped too.
+        workers (int, optional): Number of worker processes. With more than one
+            worker the page range is split into contiguous chunks, each worker
+            opens the file itself, and results are merged back in page order.
+            The output is identical to the serial path. None uses all CPUs.
+        table_keywords (iterable of str, optional): Relevance gate for table
+            detection. When given, `page.extract_tables()` only runs on pages
+            whose text contains one of the keywords (case-insensitive, e.g. the
+            parser's KEYWORDS_MAP); other pages contribute text only.
+        ocr (str or backend, optional): OCR backend for pages without a text
+            layer, e.g. "tesseract" (see src.ocr). Off by default; pages with
+            text are never OCRed.
+        ocr_workers (int, optional): Concurrent OCR recognitions, independent
+            of `workers` (recognition runs in an external engine, so threads
+            in this process are enough). None uses all CPUs.
 
     Returns:
-        dict: A dictionary containing 'text' (str) and 'tables' (list of lists).
+        ExtractedDocument: A dict with 'pages' (text per page), 'page_offsets',
+        'tables' (list of lists) and 'table_pages'; doc["text"] joins the
+        pages into the flat text on first access. With `table_keywords`, also
+        'skipped_table_pages' (1-based page numbers on which table detection
+        was skipped), and with `ocr`, 'ocr_pages'.
     """
-    extracted_data = {
-        "text": "",
-        "tables": []
-    }
-    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    table_keywords = _normalize_keywords(table_keywords)
+
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                # Extract text
-                text = page.extract_text()
-                if text:
-                    extracted_data["text"] += text + "\n"
-                
-                # Extract tables
-                tables = page.extract_tables()
-                if tables:
-                    extracted_data["tables"].extend(tables)
-                    
+        if workers > 1:
+            # Per-page events are recorded in the worker processes, not here
+            with span("extract.parallel", workers=workers):
+                extracted_data = _extract_parallel(pdf_path, workers, table_keywords)
+        else:
+            with _open_source(pdf_path) as stream:
+                with span("extract.open"):
+                    pdf = pdfplumber.open(stream)
+                with pdf:
+                    page_results = (_extract_page(page, table_keywords) for page in pdf.pages)
+                    extracted_data = _merge_pages(page_results, gated=table_keywords is not None)
+
+        if ocr is not None:
+            with span("extract.ocr"):
+                _apply_ocr(pdf_path, extracted_data, ocr, ocr_workers or os.cpu_count() or 1)
+        return extracted_data
+
     except Exception as e:
         print(f"Error extracting PDF: {e}")
         return None
-
-    return extracted_data
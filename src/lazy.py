@@ -0,0 +1,34 @@
+import importlib
+
+class LazyModule:
+    """
+    Stands in for a module until one of its attributes is used:
+
+        pd = lazy_import("pandas")
+        ...
+        pd.DataFrame(rows)   # pandas is imported here, once
+
+    Keeps heavy dependencies (numpy, pandas, pdfplumber, plotly) off the
+    import path of modules and code paths that never touch them.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = self.__dict__["_module"] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name):
+    """Returns a LazyModule for `name`; the import happens on first attribute access."""
+    return LazyModule(name)
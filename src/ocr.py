@@ -0,0 +1,170 @@
+"""
+Optional OCR for pages without a text layer (scanned reports).
+
+Backends turn a PNG page image into text:
+
+    tesseract   the local `tesseract` binary (offline; TESSERACT_CMD overrides the path)
+    stub        fixed text, no external tools (tests and development)
+
+Results are cached on disk by a hash of the rasterized page, so the same
+scanned page is never OCRed twice, across uploads and parser changes. The
+cache is bounded like the extraction cache (least recently used pages go
+first).
+"""
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from src.profiling import span
+
+# Used when INFRATRACK_OCR_CACHE_DIR isn't set, see _cache_dir()
+OCR_CACHE_DIR = ".infratrack_ocr_cache"
+MAX_OCR_CACHE_BYTES = 64 * 1024 * 1024
+# Rasterization DPI; Tesseract is most accurate on text around 300 DPI
+OCR_RESOLUTION = 300
+
+class TesseractBackend:
+    """OCR through the local Tesseract binary. Raises RuntimeError if it isn't installed."""
+
+    def __init__(self, lang="eng", cmd=None):
+        self.cmd = cmd or os.environ.get("TESSERACT_CMD") or shutil.which("tesseract")
+        if not self.cmd:
+            raise RuntimeError("Tesseract not found; install it or set TESSERACT_CMD")
+        self.lang = lang
+        self.name = f"tesseract-{lang}"
+
+    def image_to_text(self, png_bytes):
+        result = subprocess.run([self.cmd, "stdin", "stdout", "-l", self.lang],
+                                input=png_bytes, capture_output=True, check=True)
+        return result.stdout.decode("utf-8", errors="replace")
+
+class StubBackend:
+    """Returns `text` for every page and counts calls; stands in for a real engine in tests."""
+
+    def __init__(self, text="Scanned page"):
+        self.text = text
+        self.name = "stub"
+        self.calls = 0
+
+    def image_to_text(self, png_bytes):
+        self.calls += 1
+        return self.text
+
+BACKENDS = {"tesseract": TesseractBackend, "stub": StubBackend}
+
+def get_backend(backend):
+    """Returns a backend instance for a name in BACKENDS; instances are passed through."""
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {backend}")
+    return BACKENDS[backend]()
+
+def image_hash(image):
+    """Content hash of a rasterized page (pixels, mode and size, not the PNG encoding)."""
+    digest = hashlib.sha256(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+def _cache_dir(cache_dir=None):
+    """`cache_dir`, else INFRATRACK_OCR_CACHE_DIR as set at call time, else OCR_CACHE_DIR."""
+    return cache_dir or os.environ.get("INFRATRACK_OCR_CACHE_DIR") or OCR_CACHE_DIR
+
+def _cache_path(backend, page_hash, cache_dir):
+    return os.path.join(cache_dir, backend.name, f"{page_hash}.txt")
+
+def _load_cached(backend, page_hash, cache_dir):
+    path = _cache_path(backend, page_hash, cache_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        # A hit refreshes the mtime, which is what eviction orders by
+        os.utime(path)
+        return text
+    except OSError:
+        return None
+
+def _store_cached(backend, page_hash, text, cache_dir):
+    path = _cache_path(backend, page_hash, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing OCR cache entry: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _recognize(backend, page_number, png_bytes):
+    with span("ocr.recognize", page=page_number):
+        return backend.image_to_text(png_bytes)
+
+def ocr_pages(pdf, page_numbers, backend, workers=1, cache_dir=None, resolution=OCR_RESOLUTION, max_bytes=None):
+    """
+    OCRs the given pages of an open pdfplumber PDF.
+
+    Pages are rasterized one at a time in this thread; recognition runs in a
+    pool of `workers` threads (the engine is an external process, so threads
+    are enough), with at most two pages per worker waiting in memory.
+
+    Args:
+        pdf (pdfplumber.PDF): Open document.
+        page_numbers (iterable of int): 1-based pages to OCR.
+        backend: An object with `name` and `image_to_text(png_bytes)`.
+        workers (int): Concurrent recognitions.
+        cache_dir (str, optional): OCR cache directory, see _cache_dir().
+        resolution (int): Rasterization DPI.
+        max_bytes (int, optional): Size bound for the OCR cache, enforced once
+            the pages are done. Defaults to MAX_OCR_CACHE_BYTES.
+
+    Returns:
+        dict: {page_number: text}. Pages whose recognition failed are left out.
+    """
+    cache_dir = _cache_dir(cache_dir)
+    texts = {}
+    stored = []
+    in_flight = []
+
+    def collect(entry):
+        page_number, page_hash, future = entry
+        try:
+            text = future.result()
+        except Exception as e:
+            print(f"OCR failed on page {page_number}: {e}")
+            return
+        _store_cached(backend, page_hash, text, cache_dir)
+        stored.append(page_number)
+        texts[page_number] = text
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for page_number in page_numbers:
+            page = pdf.pages[page_number - 1]
+            with span("ocr.rasterize", page=page_number):
+                image = page.to_image(resolution=resolution).original
+            page.close()
+
+            page_hash = image_hash(image)
+            cached = _load_cached(backend, page_hash, cache_dir)
+            if cached is not None:
+                texts[page_number] = cached
+                continue
+
+            png = io.BytesIO()
+            image.save(png, format="PNG")
+            in_flight.append((page_number, page_hash, pool.submit(_recognize, backend, page_number, png.getvalue())))
+            if len(in_flight) >= 2 * max(1, workers):
+                collect(in_flight.pop(0))
+
+        for entry in in_flight:
+            collect(entry)
+
+    if stored:
+        # The extraction cache's LRU eviction; imported here as src.cache loads the extractor and parser
+        from src.cache import evict_entries
+        evict_entries(cache_dir, MAX_OCR_CACHE_BYTES if max_bytes is None else max_bytes, suffix=".txt")
+    return texts
@@ -1,5 +1,22 @@
+import bisect
+import hashlib
+import itertools
 import re
 from src.utils import calculate_status, generate_project_id
+from src.profiling import span
+
+# Bump whenever parse_project_info returns different fields for the same input,
+# so cached parse results are invalidated.
+PARSER_VERSION = "8"
+
+# Table row labels (first cell) that carry the numerical KPIs.
+# The extractor can use the keys to skip table detection on irrelevant pages.
+KEYWORDS_MAP = {
+    "Physical Progress": "physical_progress_percent",
+    "Financial Progress": "financial_progress_percent",
+    "Planned Cost": "planned_cost_crore",
+    "Expenditure": "expenditure_till_date_crore"
+}
 
 def clean_text(text):
     if text:
@@ -39,118 +56,554 @@ def find_value_in_row(row, start_index=1):
             return cell
     return None
 
-def parse_project_info(text, tables):
+FIELDS = (
+    "project_name",
+    "sector",
+    "report_month",
+    "state",
+    "district",
+    "physical_progress_percent",
+    "financial_progress_percent",
+    "planned_cost_crore",
+    "expenditure_till_date_crore"
+)
+
+TEXT_FIELDS = FIELDS[:5]
+NUMERIC_FIELDS = tuple(KEYWORDS_MAP.values())
+
+# How far past a label its value may appear. Bounding the lookahead keeps each
+# label check O(window) instead of letting `.*?` run to the end of a 500-page
+# document when the value is far away or missing.
+VALUE_WINDOW = 200
+NARRATIVE_WINDOW = 400
+
+_LINE_VALUE = re.compile(r'\s*[:]\s*(.+)')
+# Stops at the end of the line, so stacked 'State:'/'District:' lines don't run together
+_ALPHA_VALUE = re.compile(r'[ \t]*[:][ \t]*([a-zA-Z \t]+)')
+_PERCENT_VALUE = re.compile(r'.*?(\d+(?:\.\d+)?)%', re.DOTALL)
+_RUPEE_VALUE = re.compile(r'.*?(?:Rs\.?|INR)\s*([\d.,]+)', re.IGNORECASE | re.DOTALL)
+
+# Label (lowercase) -> (field, value pattern anchored after the label, window, converter)
+_FIELD_RULES = {
+    # Project Name (Look for "Project:" or "Project Name:")
+    "project name": ("project_name", _LINE_VALUE, VALUE_WINDOW, clean_text),
+    "project": ("project_name", _LINE_VALUE, VALUE_WINDOW, clean_text),
+    "sector": ("sector", _LINE_VALUE, VALUE_WINDOW, clean_text),
+    "report month": ("report_month", _LINE_VALUE, VALUE_WINDOW, clean_text),
+    "date": ("report_month", _LINE_VALUE, VALUE_WINDOW, clean_text),
+    # District is sometimes on the same line as State
+    "state": ("state", _ALPHA_VALUE, VALUE_WINDOW, clean_text),
+    "district": ("district", _ALPHA_VALUE, VALUE_WINDOW, clean_text),
+    # Narrative fallbacks, e.g. 'Planned Cost ... Rs. 12,500'
+    "physical progress": ("physical_progress_percent", _PERCENT_VALUE, NARRATIVE_WINDOW, float),
+    "financial progress": ("financial_progress_percent", _PERCENT_VALUE, NARRATIVE_WINDOW, float),
+    "planned cost": ("planned_cost_crore", _RUPEE_VALUE, NARRATIVE_WINDOW, parse_currency),
+    "expenditure": ("expenditure_till_date_crore", _RUPEE_VALUE, NARRATIVE_WINDOW, parse_currency),
+}
+
+# Every label in one alternation, longest first so "Project Name" wins over "Project"
+_LABEL_RE = re.compile(
+    "|".join(re.escape(label) for label in sorted(_FIELD_RULES, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+def scan_fields(text):
+    """
+    Finds every field label in a single pass over the text.
+
+    Args:
+        text (str): Text to scan.
+
+    Yields:
+        tuple: (field, value, start, end) for each label whose value pattern
+        matches within its lookahead window, in text order.
+    """
+    text_length = len(text)
+    for label in _LABEL_RE.finditer(text):
+        field, pattern, window, convert = _FIELD_RULES[label.group().lower()]
+        match = pattern.match(text, label.end(), min(text_length, label.end() + window))
+        if match:
+            yield field, convert(match.group(1)), label.start(), match.end()
+
+def _first_matches(text, fields, spans=None):
+    """
+    Returns {field: value} for the first match of each wanted field, stopping
+    once all are found. If `spans` is given, it receives {field: (start, end)}.
+    """
+    remaining = set(fields)
+    found = {}
+    if not remaining or not text:
+        return found
+
+    for field, value, start, end in scan_fields(text):
+        if field in remaining:
+            found[field] = value
+            if spans is not None:
+                spans[field] = (start, end)
+            remaining.discard(field)
+            if not remaining:
+                break
+    return found
+
+# Whitespace that pdfplumber leaves inside cells, mapped to a plain space
+_SPACES = str.maketrans(dict.fromkeys("\t\n\r\x0b\x0c\xa0", " "))
+
+def _collapse_spaces(text):
+    text = text.translate(_SPACES)
+    while "  " in text:
+        text = text.replace("  ", " ")
+    return text
+
+def normalize_label(value):
+    """Lowercases a table cell and collapses runs of whitespace (including line breaks) to one space."""
+    return _collapse_spaces(str(value).lower()).strip(" ") if value else ""
+
+_DIGIT = re.compile(r"\d")
+
+def _is_header_row(row):
+    """A header row labels its columns: every cell filled, and none of the value cells hold a digit."""
+    return all(cell and str(cell).strip() for cell in row) and \
+        not any(_DIGIT.search(str(cell)) for cell in row[1:])
+
+class TableIndex:
+    """
+    Index of a document's table rows by normalized first-column label.
+
+    All labels are lowercased and whitespace-collapsed in one pass over a
+    single joined string, and keyword lookups are substring searches over that
+    string, so the per-row Python work happens once per document rather than
+    once per row and keyword.
+
+    The first row of a table is treated as a header (and left out of the
+    index) when it looks like column titles, see `headers`.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+        # table_index -> header row, for tables that start with one
+        self.headers = {}
+        self._matches = {}
+        self._labels = None
+        # Position of each table's first row in the flat row sequence
+        self._table_starts = list(itertools.accumulate(map(len, tables), initial=0))
+
+        # One label per row; rows without a label or a value cell get ''
+        cells = [row[0] if row and len(row) > 1 and row[0] else "" for table in tables for row in table]
+        for t, table in enumerate(tables):
+            if cells and table and cells[self._table_starts[t]] and _is_header_row(table[0]):
+                self.headers[t] = table[0]
+                cells[self._table_starts[t]] = ""
+
+        # NUL separates the labels, so they are all normalized by a few
+        # whole-string operations; collapsing leaves at most one space on
+        # either side of each separator
+        try:
+            text = "\0".join(cells)
+        except TypeError:
+            text = "\0".join(map(str, cells))
+        text = _collapse_spaces(text.lower())
+        self._text = text.replace("\0 ", "\0").replace(" \0", "\0").strip(" ")
+        if self._text.count("\0") != max(len(cells) - 1, 0):
+            # A cell contained the separator itself; normalize cell by cell instead
+            self._text = "\0".join(normalize_label(cell).replace("\0", "") for cell in cells)
+
+    def _ref(self, row):
+        t = bisect.bisect_right(self._table_starts, row) - 1
+        return t, row - self._table_starts[t]
+
+    @property
+    def labels(self):
+        """{label: [(table_index, row_index), ...]} in document order."""
+        if self._labels is None:
+            self._labels = {}
+            for row, label in enumerate(self._text.split("\0")):
+                if label:
+                    self._labels.setdefault(label, []).append(self._ref(row))
+        return self._labels
+
+    def _find(self, keyword):
+        text = self._text
+        refs = []
+        position = text.find(keyword) if keyword else -1
+        if position != -1:
+            # Count separators on the shorter side of the first match, then onwards from it
+            if position < len(text) // 2:
+                row = text.count("\0", 0, position)
+            else:
+                row = self._table_starts[-1] - 1 - text.count("\0", position)
+            previous = position
+        while position != -1:
+            row += text.count("\0", previous, position)
+            refs.append(self._ref(row))
+            # Continue after this label, so a row matches at most once
+            previous = position
+            label_end = text.find("\0", position)
+            if label_end == -1:
+                break
+            position = text.find(keyword, label_end + 1)
+        return refs
+
+    def rows(self, keyword):
+        """
+        Returns the rows whose label contains `keyword` (case and whitespace
+        insensitive), in document order. Results are memoized per keyword.
+        """
+        keyword = normalize_label(keyword)
+        refs = self._matches.get(keyword)
+        if refs is None:
+            refs = self._matches[keyword] = self._find(keyword)
+        return [self.tables[t][r] for t, r in refs]
+
+    def find_all(self, keyword, convert):
+        """
+        Yields (value, (table_index, row_index)) for every `keyword` row
+        holding a value that `convert` accepts (not None), in document order.
+        """
+        keyword = normalize_label(keyword)
+        if keyword not in self._matches:
+            self._matches[keyword] = self._find(keyword)
+        for t, r in self._matches[keyword]:
+            value_cell = find_value_in_row(self.tables[t][r], 1)
+            if value_cell:
+                value = convert(value_cell)
+                if value is not None:
+                    yield value, (t, r)
+
+    def find(self, keyword, convert):
+        """
+        Returns (value, (table_index, row_index)) for the first `keyword` row
+        holding a value that `convert` accepts (not None), or (None, None).
+        """
+        return next(self.find_all(keyword, convert), (None, None))
+
+    def lookup(self, keyword, convert):
+        """Returns the first value in a `keyword` row that `convert` accepts (not None), or None."""
+        return self.find(keyword, convert)[0]
+
+def _scan_tables(index, data, refs=None):
+    """
+    Fills the still-empty numerical fields from table rows labelled with a
+    KEYWORDS_MAP key. If `refs` is given, it receives {field: (table_index, row_index)}.
+    """
+    for key, field in KEYWORDS_MAP.items():
+        if data[field] is None:
+            convert = parse_percentage if field.endswith("percent") else parse_currency
+            data[field], ref = index.find(key, convert)
+            if ref is not None and refs is not None:
+                refs[field] = ref
+
+def _finalize(data, content_hash):
+    """Adds the derived project ID and status flag."""
+    # Generate ID (unnamed projects get one derived from the document content)
+    data["project_id"] = generate_project_id(data["project_name"], content_hash)
+    
+    # Calculate Status
+    data["status_flag"] = calculate_status(
+        data["physical_progress_percent"],
+        data["expenditure_till_date_crore"],
+        data["planned_cost_crore"]
+    )
+    
+    return data
+
+def parse_project_info(text, tables, source_hash=None, sources=None):
     """
     Parses extracted text and tables to find project details.
     
     Args:
         text (str): Full text extracted from PDF.
         tables (list): List of tables (list of lists) extracted from PDF.
+        source_hash (str, optional): Hex digest of the source PDF, used for the
+            ID of unnamed projects. Defaults to a hash of the text.
+        sources (dict, optional): Receives where each found field came from:
+            {"start": ..., "end": ...} (the label and value in `text`) or
+            {"table": ..., "row": ...} (indexes into `tables`).
         
     Returns:
         dict: A dictionary containing the structured data.
     """
-    data = {
-        "project_name": None,
-        "sector": None,
-        "report_month": None,
-        "state": None,
-        "district": None,
-        "physical_progress_percent": None,
-        "financial_progress_percent": None,
-        "planned_cost_crore": None,
-        "expenditure_till_date_crore": None
-    }
+    data = dict.fromkeys(FIELDS)
+    spans = {}
+    refs = {}
+    with span("parse.scan_fields", chars=len(text)):
+        found = _first_matches(text, FIELDS, spans)
     
     # --- 1. Regex Extraction from Text ---
+    for field in TEXT_FIELDS:
+        data[field] = found.get(field)
+
+    # --- 2. Table Scanning for Numerical Data ---
+    with span("parse.tables", tables=len(tables)):
+        _scan_tables(TableIndex(tables), data, refs)
+                    
+    # --- 3. Robust Regex for Numerical Data (Narrative Text) ---
+    for field in NUMERIC_FIELDS:
+        if data[field] is None:
+            data[field] = found.get(field)
+
+    if sources is not None:
+        for field in FIELDS:
+            if data[field] is None:
+                continue
+            if field in refs:
+                sources[field] = {"table": refs[field][0], "row": refs[field][1]}
+            else:
+                sources[field] = {"start": spans[field][0], "end": spans[field][1]}
+
+    # --- 4. Post-processing ---
+    with span("parse.finalize"):
+        return _finalize(data, source_hash or hashlib.blake2b(text.encode()).hexdigest())
+
+def parse_pages(pages, full_scan=False, source_hash=None):
+    """
+    Incremental version of parse_project_info that consumes pages one at a time
+    and stops pulling pages once all nine fields are resolved.
+
+    Table values take precedence over narrative text, exactly as in
+    parse_project_info, so a numerical field only counts as resolved once it
+    was read from a table; narrative matches are kept as fallbacks and applied
+    after the scan. Matches are made within a single page.
     
-    # Project Name (Look for "Project:" or "Project Name:")
-    match = re.search(r'(?:Project Name|Project)\s*[:]\s*(.+)', text, re.IGNORECASE)
-    if match:
-        data["project_name"] = clean_text(match.group(1))
+    Args:
+        pages (iterable): Dicts with 'text' and 'tables' per page, in page
+            order (e.g. from src.extractor.iter_pages).
+        full_scan (bool): Consume every page even after all fields are
+            resolved, for auditing.
+        source_hash (str, optional): As in parse_project_info. Defaults to a
+            hash of the consumed page texts, which matches parse_project_info
+            on the joined text.
         
-    # Sector
-    match = re.search(r'Sector\s*[:]\s*(.+)', text, re.IGNORECASE)
-    if match:
-        data["sector"] = clean_text(match.group(1))
+    Returns:
+        dict: A dictionary containing the structured data.
+    """
+    data = dict.fromkeys(FIELDS)
+    narrative = {}
+    text_hash = hashlib.blake2b()
 
-    # Report Month
-    match = re.search(r'(?:Report Month|Date)\s*[:]\s*(.+)', text, re.IGNORECASE)
-    if match:
-        data["report_month"] = clean_text(match.group(1))
-        
-    # State
-    match = re.search(r'State\s*[:]\s*([a-zA-Z\s]+)', text, re.IGNORECASE)
-    if match:
-        data["state"] = clean_text(match.group(1))
-        
-    # District (Sometimes on same line as State)
-    match = re.search(r'District\s*[:]\s*([a-zA-Z\s]+)', text, re.IGNORECASE)
-    if match:
-        data["district"] = clean_text(match.group(1))
+    for page in pages:
+        if page.get("text"):
+            text_hash.update((page["text"] + "\n").encode())
+        wanted = [field for field in TEXT_FIELDS if data[field] is None]
+        wanted += [field for field in NUMERIC_FIELDS if data[field] is None and field not in narrative]
 
-    # --- 2. Table Scanning for Numerical Data ---
-    
-    keywords_map = {
-        "Physical Progress": "physical_progress_percent",
-        "Financial Progress": "financial_progress_percent",
-        "Planned Cost": "planned_cost_crore",
-        "Expenditure": "expenditure_till_date_crore"
-    }
+        with span("parse.scan_fields", page=page.get("page_number")):
+            found = _first_matches(page.get("text") or "", wanted)
+        for field in TEXT_FIELDS:
+            if field in found:
+                data[field] = found[field]
+        with span("parse.tables", page=page.get("page_number")):
+            _scan_tables(TableIndex(page.get("tables") or []), data)
+        for field in NUMERIC_FIELDS:
+            if field in found:
+                narrative[field] = found[field]
+
+        if not full_scan and all(data[field] is not None for field in FIELDS):
+            break
+
+    # Stop the producer from opening any more pages
+    if hasattr(pages, "close"):
+        pages.close()
 
+    for field, value in narrative.items():
+        if data[field] is None:
+            data[field] = value
+
+    return _finalize(data, source_hash or text_hash.hexdigest())
+
+# A table with at least this many KPI rows is a project's KPI table; a second
+# one repeating a KPI the current project already has starts the next project
+KPI_TABLE_FIELDS = 2
+
+def _table_positions(text, tables):
+    """
+    Locates each of a page's tables in the page text: where its first row
+    (or failing that, its first cell) appears, searching after the previous
+    table. A table that can't be found is placed right after the previous one.
+    """
+    positions = []
+    cursor = 0
     for table in tables:
-        for row in table:
-            if not row or len(row) < 2:
+        cells = [" ".join(str(cell).split()) for cell in (table[0] if table else []) if cell]
+        position = -1
+        for needle in (" ".join(cells), cells[0] if cells else ""):
+            if needle:
+                position = text.find(needle, cursor)
+                if position != -1:
+                    cursor = position + len(needle)
+                    break
+        if position == -1:
+            position = cursor
+        positions.append(position)
+    return positions
+
+def _table_kpis(index):
+    """Returns {table_index: {field: (value, row_index)}} for the first KPI value of each field per table."""
+    kpis = {}
+    for key, field in KEYWORDS_MAP.items():
+        convert = parse_percentage if field.endswith("percent") else parse_currency
+        for value, (t, r) in index.find_all(key, convert):
+            kpis.setdefault(t, {}).setdefault(field, (value, r))
+    return kpis
+
+# The "project name" / "project" rules of _FIELD_RULES, for is_consolidated
+_PROJECT_NAME_VALUE = re.compile(r'project(?: name)?\s*[:]\s*(.+)', re.IGNORECASE)
+
+def _same_name(name, other):
+    """
+    Whether two normalized project names may denote one project: one is the
+    other or a word-aligned part of it, as when a cover page gives the full
+    title ("... Phase-II (Green Line)") and the details page a shorter one.
+    """
+    name, other = f" {name} ", f" {other} "
+    return name in other or other in name
+
+def is_consolidated(document):
+    """
+    Cheap check for whether a document may cover several projects: it names
+    more than one project (names that are part of another count as one, see
+    _same_name), or has more than one KPI table. Only then is parse_projects
+    worth running; this is one regex pass and a table index, with no
+    per-label Python work.
+    """
+    names = sorted({normalize_label(name) for name in _PROJECT_NAME_VALUE.findall(document["text"])}, key=len)
+    if any(not _same_name(name, names[-1]) for name in names):
+        return True
+    kpis = _table_kpis(TableIndex(document["tables"]))
+    return sum(len(found) >= KPI_TABLE_FIELDS for found in kpis.values()) > 1
+
+def _starts_project(project, name):
+    """
+    Whether a "Project Name:" label with `name` starts a new project rather
+    than naming (or restating the name of) the current one.
+
+    Once the current project has KPIs from a table, any other name starts the
+    next project (only an exact restatement, e.g. a running page header,
+    doesn't). Before that, a name that is part of the current one or the other
+    way round (see _same_name) is the same project, as with a cover-page title
+    and a summary figure ahead of the details page; an unrelated name isn't.
+    """
+    current = project["data"]["project_name"]
+    if project["table_fields"]:
+        return current is None or normalize_label(name) != normalize_label(current)
+    return current is not None and not _same_name(normalize_label(name), normalize_label(current))
+
+def _new_project(carried=None):
+    """A project being parsed; `carried` holds {field: (value, source)} seen since the previous project's KPIs."""
+    project = {"data": dict.fromkeys(FIELDS), "narrative": {}, "sources": {}, "table_fields": set()}
+    for field, (value, source) in (carried or {}).items():
+        project["data"][field] = value
+        project["sources"][field] = source
+    return project
+
+def parse_projects(document, source_hash=None, sources=None):
+    """
+    Splits a consolidated report into one record per project, in a single
+    pass over the pages.
+
+    Field labels (as in parse_project_info) and KPI tables are visited in
+    document order, tables placed within their page by _table_positions.
+    A project starts at a "Project Name:" (or "Project:") label with a new
+    name (see _starts_project), or at a KPI table that repeats a KPI the
+    current project already read from a table when text fields were seen
+    since the current project's KPIs; a repeated table without them (e.g. a
+    previous-month annexure) restates the current project. Text fields seen
+    between the previous project's KPIs and the start of the next belong to
+    the next. Within a project, the first value of each field wins and table
+    values take precedence over narrative text. Text fields that only the first project
+    has (e.g. the report month on a cover page) apply to every project.
+
+    Args:
+        document (dict): Extractor output with 'pages', 'tables' and
+            'table_pages' (see src.extractor.ExtractedDocument).
+        source_hash (str, optional): As in parse_project_info; unnamed projects
+            get IDs derived from it and their position. Defaults to a hash of
+            the flat text, as in parse_project_info.
+        sources (list, optional): Receives one {field: source} dict per
+            project, sources as in parse_project_info plus the 1-based "page".
+
+    Returns:
+        list: Records in the shape of parse_project_info, in document order.
+        Projects with neither a name nor a KPI value are dropped.
+    """
+    pages = document["pages"]
+    tables = document["tables"]
+    table_pages = document.get("table_pages") or []
+    with span("parse.project_tables", tables=len(tables)):
+        kpis = _table_kpis(TableIndex(tables))
+
+    projects = [_new_project()]
+    pending = {}
+    text_hash = hashlib.blake2b()
+    offset = 0
+    table = 0
+
+    for page_number, text in enumerate(pages, start=1):
+        text = text or ""
+        if text:
+            text_hash.update((text + "\n").encode())
+        with span("parse.scan_fields", page=page_number):
+            # (position, kind, ...): labels sort before a table at the same position
+            events = [(start, 0, field, value, end) for field, value, start, end in scan_fields(text)]
+            first_table = table
+            while table < len(table_pages) and table_pages[table] == page_number:
+                table += 1
+            page_tables = range(first_table, table)
+            positions = _table_positions(text, [tables[t] for t in page_tables])
+            events += [(position, 1, t) for position, t in zip(positions, page_tables) if t in kpis]
+            events.sort(key=lambda event: event[:2])
+
+        for event in events:
+            project = projects[-1]
+            if event[1] == 1:
+                t = event[2]
+                found = kpis[t]
+                if len(found) >= KPI_TABLE_FIELDS and pending and project["table_fields"].intersection(found):
+                    project = _new_project(pending)
+                    projects.append(project)
+                    pending = {}
+                for field, (value, row) in found.items():
+                    if field not in project["table_fields"]:
+                        project["table_fields"].add(field)
+                        project["data"][field] = value
+                        project["sources"][field] = {"table": t, "row": row, "page": page_number}
                 continue
-            
-            # Clean first cell to match keyword
-            first_cell = str(row[0]).strip() if row[0] else ""
-            
-            for key, field in keywords_map.items():
-                if key.lower() in first_cell.lower() and data[field] is None:
-                    # Found a match, scan row for value
-                    value_cell = find_value_in_row(row, 1)
-                    
-                    if value_cell:
-                        if field.endswith("percent"):
-                            val = parse_percentage(value_cell)
-                            if val is not None: data[field] = val
-                        else:
-                            val = parse_currency(value_cell)
-                            if val is not None: data[field] = val
-                    
-    # --- 3. Robust Regex for Numerical Data (Narrative Text) ---
-    
-    # Physical Progress (in text)
-    if data["physical_progress_percent"] is None:
-         match = re.search(r'Physical Progress.*?(\d+(?:\.\d+)?)%', text, re.IGNORECASE | re.DOTALL)
-         if match: data["physical_progress_percent"] = float(match.group(1))
-
-    # Financial Progress (in text)
-    if data["financial_progress_percent"] is None:
-         match = re.search(r'Financial Progress.*?(\d+(?:\.\d+)?)%', text, re.IGNORECASE | re.DOTALL)
-         if match: data["financial_progress_percent"] = float(match.group(1))
-         
-    # Planned Cost (Handle 'Planned Cost ... Rs. 12,500')
-    if data["planned_cost_crore"] is None:
-         # Look for "Planned Cost" followed by optional chars then "Rs." then number
-         match = re.search(r'Planned Cost.*?(?:Rs\.?|INR)\s*([\d.,]+)', text, re.IGNORECASE | re.DOTALL)
-         if match: data["planned_cost_crore"] = parse_currency(match.group(1))
-         
-    # Expenditure (Handle 'Expenditure ... Rs. 4,200')
-    if data["expenditure_till_date_crore"] is None:
-         match = re.search(r'Expenditure.*?(?:Rs\.?|INR)\s*([\d.,]+)', text, re.IGNORECASE | re.DOTALL)
-         if match: data["expenditure_till_date_crore"] = parse_currency(match.group(1))
 
-    # --- 4. Post-processing ---
-    # Generate ID
-    data["project_id"] = generate_project_id(data["project_name"])
-    
-    # Calculate Status
-    data["status_flag"] = calculate_status(
-        data["physical_progress_percent"],
-        data["expenditure_till_date_crore"],
-        data["planned_cost_crore"]
-    )
-    
-    return data
+            start, _, field, value, end = event
+            source = {"start": offset + start, "end": offset + end, "page": page_number}
+            # Narrative figures (e.g. a cover page summary) don't close a project
+            if field in NUMERIC_FIELDS:
+                project["narrative"].setdefault(field, (value, source))
+                continue
+            if field == "project_name" and _starts_project(project, value):
+                project = _new_project(pending)
+                projects.append(project)
+                pending = {}
+            if project["data"][field] is None:
+                project["data"][field] = value
+                project["sources"][field] = source
+            elif field != "project_name" and (project["table_fields"] or project["narrative"]):
+                pending.setdefault(field, (value, source))
+        if text:
+            offset += len(text) + 1
+
+    # Text fields no later project states itself are document-wide
+    stated = {field for project in projects[1:] for field in TEXT_FIELDS if project["data"][field] is not None}
+    shared = {field: (projects[0]["data"][field], projects[0]["sources"].get(field))
+              for field in TEXT_FIELDS if field not in stated and field != "project_name"}
+
+    source_hash = source_hash or text_hash.hexdigest()
+    records = []
+    for project in projects:
+        data = project["data"]
+        for fallbacks in (project["narrative"], shared):
+            for field, (value, source) in fallbacks.items():
+                if data[field] is None and value is not None:
+                    data[field] = value
+                    project["sources"][field] = source
+        if data["project_name"] is None and all(data[field] is None for field in NUMERIC_FIELDS):
+            continue
+        if sources is not None:
+            sources.append(project["sources"])
+        project_hash = source_hash if not records else hashlib.blake2b(f"{source_hash}:{len(records)}".encode()).hexdigest()
+        records.append(_finalize(data, project_hash))
+    return records
@@ -0,0 +1,170 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Opt-in: INFRATRACK_PROFILE=1 records timings, INFRATRACK_PROFILE=memory also
+# traces allocated bytes (slower). Otherwise span() returns a shared no-op.
+_mode = os.environ.get("INFRATRACK_PROFILE", "").lower()
+ENABLED = _mode not in ("", "0", "false", "off")
+TRACE_MEMORY = _mode == "memory"
+# Optional JSON Lines log that receives every event as it is recorded
+PROFILE_LOG = os.environ.get("INFRATRACK_PROFILE_LOG")
+
+_NULL_SPAN = nullcontext()
+_local = threading.local()
+
+def enable(trace_memory=False):
+    """Turns instrumentation on, optionally with tracemalloc byte counts."""
+    global ENABLED, TRACE_MEMORY
+    ENABLED = True
+    TRACE_MEMORY = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable():
+    global ENABLED, TRACE_MEMORY
+    ENABLED = False
+    TRACE_MEMORY = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+if TRACE_MEMORY:
+    enable(trace_memory=True)
+
+def _recorders():
+    if not hasattr(_local, "recorders"):
+        _local.recorders = []
+    return _local.recorders
+
+def _enabling():
+    """This thread's recordings that switched spans on for the thread, see start_recording()."""
+    if not hasattr(_local, "enabling"):
+        _local.enabling = []
+    return _local.enabling
+
+class _Span:
+    __slots__ = ("name", "labels", "start", "blocks", "memory")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.blocks = sys.getallocatedblocks()
+        self.memory = tracemalloc.get_traced_memory()[0] if TRACE_MEMORY else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        event = {
+            "name": self.name,
+            "duration_s": duration,
+            # Net change in live CPython memory blocks over the span
+            "allocated_blocks": sys.getallocatedblocks() - self.blocks,
+            "timestamp": time.time(),
+        }
+        if self.memory is not None:
+            event["allocated_bytes"] = tracemalloc.get_traced_memory()[0] - self.memory
+        if exc_type is not None:
+            event["error"] = exc_type.__name__
+        event.update(self.labels)
+        for recorder in _recorders():
+            recorder.append(event)
+        if PROFILE_LOG:
+            write_jsonl([event], PROFILE_LOG)
+        return False
+
+def span(name, **labels):
+    """
+    Times a block of code when profiling is enabled:
+
+        with span("extract.tables", page=3):
+            ...
+
+    Events go to every active recording() in the current thread. When
+    profiling is disabled (globally, and by no recording in this thread)
+    this returns a shared no-op context manager.
+    """
+    if not ENABLED and not getattr(_local, "enabling", None):
+        return _NULL_SPAN
+    return _Span(name, labels)
+
+def _remove(items, target):
+    # By identity: recordings are lists, and two empty ones compare equal
+    for i, item in enumerate(items):
+        if item is target:
+            del items[i]
+            return
+
+def start_recording(enable=False):
+    """
+    Starts collecting this thread's events into the returned list, until
+    stop_recording(). With `enable`, spans in this thread are recorded while
+    it is active even if profiling is globally off; other threads (e.g. other
+    app sessions) are not affected.
+    """
+    events = []
+    _recorders().append(events)
+    if enable:
+        _enabling().append(events)
+    return events
+
+def stop_recording(events):
+    _remove(_recorders(), events)
+    _remove(_enabling(), events)
+    return events
+
+@contextmanager
+def recording(enable=False):
+    """Collects the events emitted in this thread while the block runs into the yielded list."""
+    events = start_recording(enable)
+    try:
+        yield events
+    finally:
+        stop_recording(events)
+
+def summarize(events):
+    """Aggregates events by name: count, total and max seconds, total allocated blocks/bytes."""
+    summary = {}
+    for event in events:
+        entry = summary.setdefault(event["name"], {
+            "count": 0, "total_s": 0.0, "max_s": 0.0, "allocated_blocks": 0, "allocated_bytes": 0
+        })
+        entry["count"] += 1
+        entry["total_s"] += event["duration_s"]
+        entry["max_s"] = max(entry["max_s"], event["duration_s"])
+        entry["allocated_blocks"] += event["allocated_blocks"]
+        entry["allocated_bytes"] += event.get("allocated_bytes", 0)
+    return summary
+
+def write_jsonl(events, path):
+    """Appends events to a JSON Lines log."""
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+def write_prometheus(events, path):
+    """Writes aggregated events in the Prometheus text exposition format (node_exporter textfile style)."""
+    lines = [
+        "# HELP infratrack_stage_seconds Time spent per instrumented stage.",
+        "# TYPE infratrack_stage_seconds summary",
+    ]
+    summary = summarize(events)
+    for name, entry in sorted(summary.items()):
+        lines.append(f'infratrack_stage_seconds_sum{{stage="{name}"}} {entry["total_s"]:.6f}')
+        lines.append(f'infratrack_stage_seconds_count{{stage="{name}"}} {entry["count"]}')
+    lines.append("# HELP infratrack_stage_allocated_blocks Net CPython memory blocks allocated per stage.")
+    lines.append("# TYPE infratrack_stage_allocated_blocks gauge")
+    for name, entry in sorted(summary.items()):
+        lines.append(f'infratrack_stage_allocated_blocks{{stage="{name}"}} {entry["allocated_blocks"]}')
+
+    # Write then rename so a scraper never reads a half-written file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
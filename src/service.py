@@ -0,0 +1,311 @@
+"""
+Asynchronous ingestion service.
+
+    python -m src.service --port 8080 --workers 4 --queue-size 64
+
+Endpoints (JSON responses):
+
+    POST /jobs               raw PDF bytes as the request body -> 202 {"job_id", "status"}
+                             503 with Retry-After when the job queue is full
+    GET  /jobs/<id>          job status
+    GET  /jobs/<id>/result   200 with the list of parsed records (one per project
+                             of a consolidated report), 202 while pending,
+                             422 if the job failed
+    GET  /health             queue depth, in-flight jobs and limits
+
+Uploads wait on a bounded asyncio queue; a fixed number of dispatcher tasks
+hand them to a process pool, so at most `workers` reports are extracted at
+once and at most `queue_size` wait in memory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from src.batch import FileTimeout, time_limit
+from src.cache import extract_and_parse_cached
+
+DEFAULT_PORT = 8080
+QUEUE_SIZE = 64
+MAX_CONNECTIONS = 256
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# Seconds a client gets to send its whole request; idle or slow clients would
+# otherwise hold a connection slot indefinitely
+READ_TIMEOUT = 30
+# Finished jobs kept for status/result lookups; the oldest are dropped first
+MAX_FINISHED_JOBS = 10000
+
+_REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 408: "Request Timeout", 413: "Payload Too Large", 422: "Unprocessable Entity",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+def process_upload(pdf_bytes, timeout=None, cache_dir=None):
+    """
+    Extracts and parses one uploaded PDF, one record per project for
+    consolidated reports. Runs inside a pool worker and never raises.
+
+    Goes through the on-disk extraction cache, so a report that is pushed
+    again is answered without touching pdfplumber.
+
+    Returns:
+        tuple: (status, result) where status is 'done', 'failed' or 'timeout'
+        and result is the list of parsed dicts (or an error stub).
+    """
+    try:
+        with time_limit(timeout):
+            _, records = extract_and_parse_cached(pdf_bytes, cache_dir, projects=True)
+        if records is None:
+            return "failed", {"error": "extraction failed"}
+        return "done", records
+    except FileTimeout:
+        return "timeout", {"error": f"timed out after {timeout}s"}
+    except Exception as e:
+        return "failed", {"error": str(e)}
+
+class IngestService:
+    """
+    Job queue, dispatchers and HTTP front end.
+
+    Args:
+        workers (int): Process pool size, i.e. reports processed concurrently.
+        queue_size (int): Jobs allowed to wait; further uploads get a 503.
+        max_connections (int): Concurrent HTTP connections; extra ones get a 503.
+        read_timeout (float): Seconds a client has to send its request before
+            it is answered with a 408 and its connection slot freed.
+        timeout (float, optional): Per-report time budget inside the worker.
+        cache_dir (str, optional): Extraction cache shared by the workers
+            (default: see src.cache).
+    """
+
+    def __init__(self, workers=1, queue_size=QUEUE_SIZE, max_connections=MAX_CONNECTIONS,
+                 timeout=300, max_upload_bytes=MAX_UPLOAD_BYTES, cache_dir=None, read_timeout=READ_TIMEOUT):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_upload_bytes = max_upload_bytes
+        self.cache_dir = cache_dir
+        self.read_timeout = read_timeout
+        self.jobs = OrderedDict()
+        self.running = 0
+        self.rejected = 0
+        self.queue = None
+        self.pool = None
+        self._connections = None
+        self._dispatchers = []
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Starts the pool, the dispatchers and the HTTP server; returns the asyncio server."""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._connections = asyncio.Semaphore(self.max_connections)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Start the workers before any socket exists: forked workers would
+        # otherwise inherit client connections and keep them from closing
+        await asyncio.get_running_loop().run_in_executor(self.pool, os.getpid)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    # --- jobs ---
+
+    def submit(self, pdf_bytes):
+        """Queues a job. Returns its record, or None when the queue is full."""
+        job_id = uuid.uuid4().hex
+        job = {"job_id": job_id, "status": "queued", "submitted_at": time.time(), "bytes": len(pdf_bytes)}
+        try:
+            self.queue.put_nowait((job_id, pdf_bytes))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return None
+        self.jobs[job_id] = job
+        self._trim_jobs()
+        return job
+
+    def _trim_jobs(self):
+        excess = len(self.jobs) - MAX_FINISHED_JOBS
+        if excess <= 0:
+            return
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] not in ("queued", "running")]
+        for job_id in finished[:excess]:
+            del self.jobs[job_id]
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, pdf_bytes = await self.queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["started_at"] = time.time()
+                self.running += 1
+                try:
+                    status, result = await loop.run_in_executor(self.pool, process_upload, pdf_bytes,
+                                                                self.timeout, self.cache_dir)
+                except Exception as e:
+                    # e.g. a worker process died (BrokenProcessPool)
+                    status, result = "failed", {"error": f"{type(e).__name__}: {e}"}
+                finally:
+                    self.running -= 1
+                job["status"] = status
+                job["finished_at"] = time.time()
+                if status == "done":
+                    job["result"] = result
+                else:
+                    job["error"] = result["error"]
+            finally:
+                self.queue.task_done()
+
+    def health(self):
+        return {
+            "queued": self.queue.qsize(),
+            "running": self.running,
+            "queue_size": self.queue_size,
+            "workers": self.workers,
+            "rejected": self.rejected,
+            "jobs": len(self.jobs),
+        }
+
+    # --- HTTP ---
+
+    def _route(self, method, path, body):
+        """Returns (status, payload, extra headers) for one request."""
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+
+        if parts == ["health"]:
+            return 200, self.health(), {}
+
+        if parts == ["jobs"]:
+            if method != "POST":
+                return 405, {"error": "use POST"}, {}
+            if not body:
+                return 400, {"error": "empty body; send the PDF bytes"}, {}
+            job = self.submit(body)
+            if job is None:
+                return 503, {"error": "queue full"}, {"Retry-After": "1"}
+            return 202, {"job_id": job["job_id"], "status": job["status"]}, {"Location": f"/jobs/{job['job_id']}"}
+
+        if len(parts) in (2, 3) and parts[0] == "jobs" and parts[2:] in ([], ["result"]):
+            if method != "GET":
+                return 405, {"error": "use GET"}, {}
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return 404, {"error": "unknown job"}, {}
+            status = {key: value for key, value in job.items() if key != "result"}
+            if len(parts) == 2:
+                return 200, status, {}
+            if job["status"] == "done":
+                return 200, job["result"], {}
+            if job["status"] in ("queued", "running"):
+                return 202, status, {"Retry-After": "1"}
+            return 422, status, {}
+
+        return 404, {"error": "not found"}, {}
+
+    async def _handle(self, reader, writer):
+        try:
+            if self._connections.locked():
+                await self._respond(writer, 503, {"error": "too many connections"}, {"Retry-After": "1"})
+                return
+            async with self._connections:
+                try:
+                    status, payload, headers = await asyncio.wait_for(self._read_and_route(reader),
+                                                                      self.read_timeout)
+                except asyncio.TimeoutError:
+                    status, payload, headers = 408, {"error": "request not received in time"}, {}
+                await self._respond(writer, status, payload, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # Anything else malformed in the request (e.g. an oversized header line)
+            try:
+                await self._respond(writer, 400, {"error": "bad request"}, {})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _read_and_route(self, reader):
+        request_line = await reader.readline()
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return 400, {"error": "malformed request line"}, {}
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return 400, {"error": "bad Content-Length"}, {}
+        if length < 0:
+            return 400, {"error": "bad Content-Length"}, {}
+        if length > self.max_upload_bytes:
+            return 413, {"error": f"upload larger than {self.max_upload_bytes} bytes"}, {}
+        body = await reader.readexactly(length) if length else b""
+        return self._route(method.upper(), target, body)
+
+    async def _respond(self, writer, status, payload, headers):
+        body = json.dumps(payload).encode()
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+                "Connection: close"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, **options):
+    service = IngestService(**options)
+    server = await service.start(host, port)
+    print(f"InfraTrack ingestion service on http://{host}:{port} "
+          f"({service.workers} workers, queue of {service.queue_size})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asynchronous PDF ingestion service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Jobs allowed to wait before uploads are rejected")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS, help="Concurrent HTTP connections")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-report timeout in seconds (default: 300)")
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT,
+                        help=f"Seconds a client has to send its request (default: {READ_TIMEOUT})")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, queue_size=args.queue_size,
+                          max_connections=args.max_connections, timeout=args.timeout,
+                          read_timeout=args.read_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
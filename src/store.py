@@ -0,0 +1,296 @@
+import sqlite3
+from src.lazy import lazy_import
+from src.parser import FIELDS
+
+# Only query_projects builds a DataFrame
+pd = lazy_import("pandas")
+
+DEFAULT_STORE_PATH = "infratrack.db"
+
+STORE_COLUMNS = ("project_id",) + FIELDS + ("status_flag", "source_file")
+NUMERIC_COLUMNS = (
+    "physical_progress_percent",
+    "financial_progress_percent",
+    "planned_cost_crore",
+    "expenditure_till_date_crore"
+)
+FILTER_COLUMNS = ("project_id", "report_month", "state", "sector", "status_flag")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    {columns},
+    PRIMARY KEY (project_id, report_month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_projects_state ON projects (state);
+CREATE INDEX IF NOT EXISTS idx_projects_sector ON projects (sector);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status_flag);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+CREATE TABLE IF NOT EXISTS source_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    parser_version TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS source_records (
+    path TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    report_month TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (path, project_id, report_month)
+) WITHOUT ROWID;
+""".format(columns=",\n    ".join(
+    f"{column} REAL" if column in NUMERIC_COLUMNS
+    else f"{column} TEXT NOT NULL" if column in ("project_id", "report_month")
+    else f"{column} TEXT"
+    for column in STORE_COLUMNS
+))
+
+_UPSERT = "INSERT INTO projects ({columns}) VALUES ({placeholders}) ON CONFLICT (project_id, report_month) DO UPDATE SET {updates}".format(
+    columns=", ".join(STORE_COLUMNS),
+    placeholders=", ".join("?" for _ in STORE_COLUMNS),
+    updates=", ".join(f"{column} = excluded.{column}" for column in STORE_COLUMNS
+                      if column not in ("project_id", "report_month"))
+)
+
+def open_store(path=DEFAULT_STORE_PATH):
+    """
+    Opens (creating if needed) the SQLite project store.
+
+    Args:
+        path (str): Database file, or ":memory:".
+
+    Returns:
+        sqlite3.Connection: Connection with the schema in place.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+def _to_row(record):
+    row = [record.get(column) for column in STORE_COLUMNS]
+    # report_month is part of the key, and NULLs never conflict in SQLite
+    row[STORE_COLUMNS.index("report_month")] = record.get("report_month") or ""
+    return row
+
+def upsert_records(conn, records, chunk_size=10000):
+    """
+    Inserts or updates records keyed by (project_id, report_month).
+
+    Args:
+        conn (sqlite3.Connection): Store connection.
+        records (iterable): Dicts as returned by parse_project_info. Extra keys
+            are ignored; a missing report_month is stored as ''.
+        chunk_size (int): Rows per executemany call.
+
+    Returns:
+        int: Number of records written.
+    """
+    written = 0
+    chunk = []
+    with conn:
+        for record in records:
+            chunk.append(_to_row(record))
+            if len(chunk) >= chunk_size:
+                conn.executemany(_UPSERT, chunk)
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            conn.executemany(_UPSERT, chunk)
+            written += len(chunk)
+        if written:
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+    return written
+
+def store_version(conn):
+    """
+    Returns a counter that changes whenever records are written, so derived
+    views (e.g. cached dashboard aggregates) can be keyed on it.
+    """
+    return conn.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+def find_id_collisions(conn, records, chunk_size=500):
+    """
+    Detects project IDs that map to more than one project name, either within
+    `records` or between `records` and what the store already holds.
+
+    Args:
+        conn (sqlite3.Connection): Store connection.
+        records (iterable): Dicts with project_id and project_name.
+        chunk_size (int): IDs per lookup query.
+
+    Returns:
+        list: (project_id, name, other_name) tuples, one per colliding pair.
+    """
+    names_by_id = {}
+    collisions = []
+    for record in records:
+        project_id, name = record.get("project_id"), record.get("project_name")
+        if not project_id or not name:
+            continue
+        known = names_by_id.setdefault(project_id, name)
+        if known != name:
+            collisions.append((project_id, known, name))
+
+    ids = list(names_by_id)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        rows = conn.execute(
+            f"SELECT DISTINCT project_id, project_name FROM projects "
+            f"WHERE project_id IN ({', '.join('?' for _ in chunk)}) AND project_name IS NOT NULL",
+            chunk
+        )
+        for project_id, stored_name in rows:
+            if stored_name != names_by_id[project_id]:
+                collisions.append((project_id, stored_name, names_by_id[project_id]))
+
+    return collisions
+
+FINGERPRINT_COLUMNS = ("path", "size", "mtime_ns", "content_hash", "parser_version")
+
+def load_fingerprints(conn):
+    """
+    Returns {path: fingerprint} for every source file recorded by record_fingerprints.
+    A fingerprint is a dict with the FINGERPRINT_COLUMNS keys plus
+    'record_keys', the (project_id, report_month) keys of the records the
+    file produced (several for a consolidated report).
+    """
+    rows = conn.execute(f"SELECT {', '.join(FINGERPRINT_COLUMNS)} FROM source_files")
+    fingerprints = {row[0]: dict(zip(FINGERPRINT_COLUMNS, row), record_keys=[]) for row in rows}
+    # In the order the file produced them
+    rows = conn.execute("SELECT path, project_id, report_month FROM source_records ORDER BY path, position")
+    for path, project_id, report_month in rows:
+        if path in fingerprints:
+            fingerprints[path]["record_keys"].append((project_id, report_month))
+    return fingerprints
+
+def record_fingerprints(conn, fingerprints):
+    """
+    Inserts or replaces source file fingerprints, keyed by path.
+
+    Args:
+        conn (sqlite3.Connection): Store connection.
+        fingerprints (iterable): Dicts with the FINGERPRINT_COLUMNS keys. Those
+            with 'record_keys' also replace the file's (project_id,
+            report_month) record keys; a missing month is ''.
+    """
+    fingerprints = list(fingerprints)
+    rows = [[fingerprint.get(column) for column in FINGERPRINT_COLUMNS] for fingerprint in fingerprints]
+    keyed = [fingerprint for fingerprint in fingerprints if "record_keys" in fingerprint]
+    with conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO source_files ({', '.join(FINGERPRINT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in FINGERPRINT_COLUMNS)})",
+            rows
+        )
+        conn.executemany("DELETE FROM source_records WHERE path = ?", [(fp["path"],) for fp in keyed])
+        conn.executemany(
+            "INSERT OR IGNORE INTO source_records (path, project_id, report_month, position) VALUES (?, ?, ?, ?)",
+            [(fp["path"], project_id, report_month, position)
+             for fp in keyed for position, (project_id, report_month) in enumerate(fp["record_keys"])]
+        )
+
+def fetch_records(conn, keys, chunk_size=400):
+    """
+    Loads stored records by key, without building a DataFrame.
+
+    Args:
+        conn (sqlite3.Connection): Store connection.
+        keys (iterable): (project_id, report_month) pairs; a missing month is ''.
+        chunk_size (int): Keys per lookup query.
+
+    Returns:
+        dict: {(project_id, report_month): record dict}. Keys not in the store
+        are left out.
+    """
+    keys = list(dict.fromkeys(keys))
+    found = {}
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        rows = conn.execute(
+            f"SELECT {', '.join(STORE_COLUMNS)} FROM projects "
+            f"WHERE (project_id, report_month) IN (VALUES {', '.join('(?, ?)' for _ in chunk)})",
+            [value for key in chunk for value in key]
+        )
+        for row in rows:
+            record = dict(zip(STORE_COLUMNS, row))
+            found[(record["project_id"], record["report_month"])] = record
+    return found
+
+def _where_clause(filters):
+    clauses = []
+    params = []
+    for column, value in filters.items():
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot filter on column: {column}")
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' for _ in value)})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+def query_projects(conn, columns=None, limit=None, **filters):
+    """
+    Returns matching rows as a DataFrame. Filters are pushed down to SQLite
+    (and its indexes), so only the matching rows are loaded.
+
+    Args:
+        conn (sqlite3.Connection): Store connection.
+        columns (list, optional): Columns to return. Defaults to all.
+        limit (int, optional): Maximum number of rows.
+        **filters: Equality filters on project_id, report_month, state, sector
+            or status_flag. A list/tuple value matches any of its items.
+
+    Returns:
+        pd.DataFrame: The matching project-month rows.
+    """
+    columns = list(columns or STORE_COLUMNS)
+    unknown = set(columns) - set(STORE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown columns: {sorted(unknown)}")
+
+    where, params = _where_clause(filters)
+    sql = f"SELECT {', '.join(columns)} FROM projects{where}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return pd.read_sql_query(sql, conn, params=params)
+
+def iter_records(conn, columns=None, chunk_size=10000, **filters):
+    """
+    Streams matching rows as dicts, fetching `chunk_size` rows at a time, so
+    exports of the whole store never hold more than one chunk in memory.
+    Takes the same columns and filters as query_projects.
+    """
+    columns = list(columns or STORE_COLUMNS)
+    unknown = set(columns) - set(STORE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown columns: {sorted(unknown)}")
+
+    where, params = _where_clause(filters)
+    cursor = conn.execute(f"SELECT {', '.join(columns)} FROM projects{where}", params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+def count_projects(conn, **filters):
+    """Returns the number of rows matching the same filters as query_projects."""
+    where, params = _where_clause(filters)
+    return conn.execute(f"SELECT COUNT(*) FROM projects{where}", params).fetchone()[0]
@@ -0,0 +1,337 @@
+"""
+Report-format templates.
+
+A template describes where one report layout keeps each field, as plain data:
+
+    {
+        "name": "paimana-progress",
+        # Both the single-project and the consolidated PAIMANA reports
+        "fingerprint": ["PAIMANA", "PROGRESS REPORT", "Project Name:"],
+        "fields": {
+            "project_name": {"regex": r"^Project Name:\\s*(.+)$", "pages": [1, 1]},
+            "physical_progress_percent": {"table": "Physical Progress"},
+        },
+    }
+
+`fingerprint` phrases must all appear (case-insensitively) near the top of
+the first page. A field is read from the first table row whose label contains
+`table`, else from group 1 of the first `regex` match (multiline, case
+insensitive), within the 1-based inclusive `pages` range (default: all pages;
+the last page may be null). Fields a template leaves out come from the
+generic parser. So do fields it declares but can't find where it expects
+them, which are also counted in template_stats() as a sign the layout has
+drifted.
+
+Templates are compiled once when registered; documents that match none are
+parsed by the generic parser alone. Besides the built-in ones below, every
+*.json spec in INFRATRACK_TEMPLATES_DIR is loaded at import, so worker
+processes and the app see the same registry.
+"""
+import bisect
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from src.extractor import _page_offsets
+from src.parser import (FIELDS, KEYWORDS_MAP, TEXT_FIELDS, TableIndex, clean_text, parse_currency,
+                        parse_percentage, parse_project_info, parse_projects, is_consolidated, _finalize)
+from src.profiling import span
+
+TEMPLATES_DIR = os.environ.get("INFRATRACK_TEMPLATES_DIR")
+# The fingerprint only looks at this much of the first page
+FINGERPRINT_CHARS = 2000
+GENERIC = "generic"
+
+# Per-process counters by template name, see template_stats()
+TEMPLATE_STATS = {}
+
+def _converter(field):
+    if field in TEXT_FIELDS:
+        return clean_text
+    return parse_percentage if field.endswith("percent") else parse_currency
+
+class CompiledTemplate:
+    """A template spec with its fingerprint, regexes and page ranges resolved once."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec["name"]
+        self.fingerprint = [phrase.lower() for phrase in spec["fingerprint"]]
+        if not self.fingerprint:
+            raise ValueError(f"Template {self.name} needs at least one fingerprint phrase")
+
+        # [(field, table label, compiled regex, (start, stop) page slice, converter)]
+        self.fields = []
+        # Fields the generic parser has to supply
+        self.undeclared = [field for field in FIELDS if field not in spec["fields"]]
+        for field, location in spec["fields"].items():
+            if field not in FIELDS:
+                raise ValueError(f"Template {self.name}: unknown field {field}")
+            if not location.get("table") and not location.get("regex"):
+                raise ValueError(f"Template {self.name}: {field} needs a table label or a regex")
+            first, last = location.get("pages") or (1, None)
+            pattern = location.get("regex")
+            self.fields.append((
+                field,
+                location.get("table"),
+                re.compile(pattern, re.IGNORECASE | re.MULTILINE) if pattern else None,
+                (first - 1, last),
+                _converter(field),
+            ))
+
+    def matches(self, first_page):
+        """True if every fingerprint phrase is in `first_page` (already lowercased and cut)."""
+        return all(phrase in first_page for phrase in self.fingerprint)
+
+    def extract(self, document, sources=None):
+        """
+        Reads the template's fields from an extracted document.
+
+        Args:
+            document (dict): Extractor output with 'pages', 'tables' and 'table_pages'.
+            sources (dict, optional): Receives where each found field came
+                from, as in parse_project_info.
+
+        Returns:
+            dict: {field: value} for the fields that were found.
+        """
+        text = document["text"]
+        tables = document["tables"]
+        table_pages = document.get("table_pages") or [None] * len(tables)
+        offsets = document.get("page_offsets") or _page_offsets(document["pages"])
+        indexes = {}
+
+        found = {}
+        for field, label, pattern, page_range, convert in self.fields:
+            start, stop = page_range
+            value = None
+            if label:
+                if page_range not in indexes:
+                    in_range = [i for i, page in enumerate(table_pages)
+                                if page is None or (page > start and (stop is None or page <= stop))]
+                    indexes[page_range] = (TableIndex([tables[i] for i in in_range]), in_range)
+                index, in_range = indexes[page_range]
+                value, ref = index.find(label, convert)
+                if ref is not None and sources is not None:
+                    sources[field] = {"table": in_range[ref[0]], "row": ref[1]}
+            if value is None and pattern is not None:
+                # Search the page range in place in the flat text
+                pos = offsets[start] if start < len(offsets) else len(text)
+                endpos = offsets[stop] if stop is not None and stop < len(offsets) else len(text)
+                match = pattern.search(text, pos, endpos)
+                if match:
+                    value = convert(match.group(1))
+                    if value is not None and sources is not None:
+                        sources[field] = {"start": match.start(), "end": match.end()}
+            if value is not None:
+                found[field] = value
+        return found
+
+TEMPLATES = []
+
+def register_template(spec):
+    """
+    Compiles and registers a template spec, replacing one with the same name.
+    Templates are tried in registration order.
+
+    Returns:
+        CompiledTemplate: The compiled template.
+    """
+    template = CompiledTemplate(spec)
+    for i, registered in enumerate(TEMPLATES):
+        if registered.name == template.name:
+            TEMPLATES[i] = template
+            break
+    else:
+        TEMPLATES.append(template)
+    return template
+
+def unregister_template(name):
+    TEMPLATES[:] = [template for template in TEMPLATES if template.name != name]
+
+def load_templates(directory):
+    """Registers every *.json template spec in `directory` (sorted by file name)."""
+    loaded = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            loaded.append(register_template(json.load(f)))
+    return loaded
+
+def templates_version():
+    """Short hash of the registered specs, so cached parses are redone when templates change."""
+    digest = hashlib.sha256(json.dumps([template.spec for template in TEMPLATES], sort_keys=True).encode())
+    return digest.hexdigest()[:8]
+
+def table_keywords():
+    """Table labels to keep when gating table extraction: KEYWORDS_MAP plus every template label."""
+    labels = set(KEYWORDS_MAP)
+    for template in TEMPLATES:
+        labels.update(label for _, label, _, _, _ in template.fields if label)
+    return sorted(labels)
+
+def select_template(document):
+    """Returns the first registered template whose fingerprint matches page 1, or None."""
+    pages = document.get("pages") or [document.get("text") or ""]
+    first_page = (pages[0] or "")[:FINGERPRINT_CHARS].lower() if pages else ""
+    for template in TEMPLATES:
+        if template.matches(first_page):
+            return template
+    return None
+
+def _count(name, seconds, missing_fields):
+    stats = TEMPLATE_STATS.setdefault(name, {"hits": 0, "seconds": 0.0, "missing_fields": 0})
+    stats["hits"] += 1
+    stats["seconds"] += seconds
+    stats["missing_fields"] += missing_fields
+
+def _add_pages(document, sources):
+    """Adds the 1-based page number to each field source."""
+    offsets = document.get("page_offsets") or _page_offsets(document["pages"])
+    table_pages = document.get("table_pages")
+    for source in sources.values():
+        if "table" in source:
+            source["page"] = table_pages[source["table"]] if table_pages else None
+        else:
+            source["page"] = bisect.bisect_right(offsets, source["start"])
+
+def parse_document(document, source_hash=None, sources=None):
+    """
+    Parses an extracted document with the template that matches its first
+    page, taking the fields the template doesn't declare, or declares but
+    doesn't find, from the generic parser. Documents no template matches go to parse_project_info unchanged.
+
+    Args:
+        document (dict): Extractor output (see src.extractor.ExtractedDocument).
+        source_hash (str, optional): As in parse_project_info.
+        sources (dict, optional): Receives {field: source} for every found
+            field, as in parse_project_info plus the 1-based "page" it is on.
+
+    Returns:
+        dict: The same record shape as parse_project_info.
+    """
+    start = time.perf_counter()
+    template = select_template(document)
+    name = template.name if template else GENERIC
+    found_sources = {} if sources is not None else None
+
+    with span("parse.template", template=name):
+        if template is None:
+            record = parse_project_info(document["text"], document["tables"], source_hash, found_sources)
+            missing = 0
+        else:
+            found = template.extract(document, found_sources)
+            fallback = template.undeclared + [field for field, *_ in template.fields if field not in found]
+            data = dict.fromkeys(FIELDS)
+            if fallback:
+                generic_sources = {} if sources is not None else None
+                generic = parse_project_info(document["text"], document["tables"], source_hash, generic_sources)
+                data.update((field, generic[field]) for field in fallback)
+                if sources is not None:
+                    found_sources.update((field, generic_sources[field]) for field in fallback
+                                         if field in generic_sources)
+            data.update(found)
+            record = _finalize(data, source_hash or hashlib.blake2b(document["text"].encode()).hexdigest())
+            missing = len(template.fields) - len(found)
+
+    if sources is not None:
+        _add_pages(document, found_sources)
+        sources.update(found_sources)
+    _count(name, time.perf_counter() - start, missing)
+    return record
+
+def parse_document_projects(document, source_hash=None, sources=None):
+    """
+    Parses a document that may cover several projects. Consolidated reports,
+    where parse_projects finds more than one (run only on documents
+    is_consolidated flags), give one record per project;
+    anything else goes through parse_document, so single-project reports keep
+    their template.
+
+    Args:
+        document (dict): Extractor output (see src.extractor.ExtractedDocument).
+        source_hash (str, optional): As in parse_project_info.
+        sources (list, optional): Receives one {field: source} dict per
+            record, as in parse_document.
+
+    Returns:
+        list: Records in document order (at least one).
+    """
+    records = []
+    project_sources = [] if sources is not None else None
+    with span("parse.projects", pages=len(document["pages"])):
+        if is_consolidated(document):
+            records = parse_projects(document, source_hash, project_sources)
+    if len(records) > 1:
+        if sources is not None:
+            sources.extend(project_sources)
+        return records
+
+    found_sources = {} if sources is not None else None
+    record = parse_document(document, source_hash, found_sources)
+    if sources is not None:
+        sources.append(found_sources)
+    return [record]
+
+def template_stats():
+    """
+    Returns {template name: {hits, hit_rate, mean_ms, missing_fields}} for
+    this process, with documents no template matched under 'generic'.
+    missing_fields counts declared fields a template failed to find.
+    """
+    total = sum(stats["hits"] for stats in TEMPLATE_STATS.values())
+    return {
+        name: {
+            "hits": stats["hits"],
+            "hit_rate": stats["hits"] / total,
+            "mean_ms": stats["seconds"] * 1000 / stats["hits"],
+            "missing_fields": stats["missing_fields"],
+        }
+        for name, stats in TEMPLATE_STATS.items()
+    }
+
+def reset_template_stats():
+    TEMPLATE_STATS.clear()
+
+# Layouts of the reports we receive today
+BUILTIN_TEMPLATES = [
+    {
+        "name": "paimana-progress",
+        # Both the single-project and the consolidated PAIMANA reports
+        "fingerprint": ["PAIMANA", "PROGRESS REPORT", "Project Name:"],
+        "fields": {
+            "project_name": {"regex": r"^Project Name:\s*(.+)$", "pages": [1, 1]},
+            "sector": {"regex": r"^Sector:\s*(.+)$", "pages": [1, 1]},
+            "report_month": {"regex": r"^Report Month:\s*(.+)$", "pages": [1, 1]},
+            "state": {"regex": r"^State:\s*(.+?)(?=\s+District:|$)", "pages": [1, 1]},
+            "district": {"regex": r"District:\s*(.+)$", "pages": [1, 1]},
+            "physical_progress_percent": {"table": "Physical Progress", "pages": [1, 2]},
+            "financial_progress_percent": {"table": "Financial Progress", "pages": [1, 2]},
+            "planned_cost_crore": {"table": "Planned Cost", "pages": [1, 2]},
+            "expenditure_till_date_crore": {"table": "Expenditure", "pages": [1, 2]},
+        },
+    },
+    {
+        "name": "ministry-monthly-monitoring",
+        "fingerprint": ["MINISTRY OF", "MONTHLY PROGRESS MONITORING REPORT"],
+        "fields": {
+            # The cover page carries the full project title
+            "project_name": {"regex": r"^Project:\s*(.+)$", "pages": [1, 1]},
+            "sector": {"regex": r"^Sector\s*:\s*(.+)$", "pages": [2, 2]},
+            "report_month": {"regex": r"^Report Month\s*:\s*(.+)$", "pages": [2, 2]},
+            "state": {"regex": r"^State\s*:\s*(.+)$", "pages": [2, 2]},
+            "district": {"regex": r"^District\s*:\s*(.+)$", "pages": [2, 2]},
+            "physical_progress_percent": {"table": "Overall Physical Progress", "pages": [3, None]},
+            "financial_progress_percent": {"table": "Financial Progress", "regex": r"Financial Progress.{0,200}?(\d+(?:\.\d+)?)%"},
+            "planned_cost_crore": {"regex": r"Planned Cost.{0,200}?(?:Rs\.?|INR)\s*([\d.,]+)", "pages": [2, 2]},
+            "expenditure_till_date_crore": {"regex": r"Expenditure.{0,200}?(?:Rs\.?|INR)\s*([\d.,]+)", "pages": [2, 2]},
+        },
+    },
+]
+
+for _spec in BUILTIN_TEMPLATES:
+    register_template(_spec)
+
+if TEMPLATES_DIR:
+    load_templates(TEMPLATES_DIR)
@@ -1,7 +1,29 @@
 import hashlib
-import time
+from src.lazy import lazy_import
 
-def calculate_status(physical_progress, expenditure, planned_cost):
+# Only the batch scorers need these; the parser imports this module too
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Hex characters of hash in a project ID: 12 gives 2^48 buckets, so a portfolio
+# of 10M projects has roughly a 1-in-6 chance of a single collision
+PROJECT_ID_WIDTH = 12
+
+# Physical progress (%) below which a project is flagged DELAYED
+DELAY_THRESHOLD = 50
+# Fraction of the planned cost expenditure may exceed before COST_OVERRUN
+OVERRUN_TOLERANCE = 0.0
+# Most the overspend ratio adds to a risk score, so spending against a zero
+# planned cost scores like spending double the plan instead of infinity
+MAX_OVERSPEND_RISK = 1.0
+
+# Bitmask status codes used by the batch scorer; a code indexes STATUS_LABELS
+STATUS_DELAYED = 1
+STATUS_COST_OVERRUN = 2
+STATUS_LABELS = ("ON_TRACK", "DELAYED", "COST_OVERRUN", "DELAYED | COST_OVERRUN")
+
+def calculate_status(physical_progress, expenditure, planned_cost,
+                     delay_threshold=DELAY_THRESHOLD, overrun_tolerance=OVERRUN_TOLERANCE):
     """
     Determines the status of the project based on progress and cost.
     
@@ -9,16 +31,18 @@ def calculate_status(physical_progress, expenditure, planned_cost):
         physical_progress (float): Physical progress in percentage (0-100).
         expenditure (float): Expenditure till date.
         planned_cost (float): Total planned cost.
+        delay_threshold (float): Progress below this is DELAYED.
+        overrun_tolerance (float): Allowed overspend as a fraction of planned cost.
         
     Returns:
         str: Status string (ON_TRACK, DELAYED, COST_OVERRUN, or combination).
     """
     status_flags = []
     
-    if physical_progress is not None and physical_progress < 50:
+    if physical_progress is not None and physical_progress < delay_threshold:
         status_flags.append("DELAYED")
         
-    if expenditure is not None and planned_cost is not None and expenditure > planned_cost:
+    if expenditure is not None and planned_cost is not None and expenditure > planned_cost * (1 + overrun_tolerance):
         status_flags.append("COST_OVERRUN")
         
     if not status_flags:
@@ -26,19 +50,119 @@ def calculate_status(physical_progress, expenditure, planned_cost):
     
     return " | ".join(status_flags)
 
-def generate_project_id(project_name):
+def _as_float_array(values):
+    # None becomes NaN, and every comparison with NaN is False, which mirrors
+    # the `is not None` checks in calculate_status
+    return np.asarray(values, dtype=float)
+
+def score_projects(physical_progress, expenditure, planned_cost,
+                   delay_threshold=DELAY_THRESHOLD, overrun_tolerance=OVERRUN_TOLERANCE):
+    """
+    Vectorized calculate_status plus a numeric risk score.
+
+    Args:
+        physical_progress (array-like): Physical progress in percentage.
+        expenditure (array-like): Expenditure till date.
+        planned_cost (array-like): Total planned cost.
+        delay_threshold (float): Progress below this is DELAYED.
+        overrun_tolerance (float): Allowed overspend as a fraction of planned cost.
+
+    Returns:
+        tuple: (status_codes, risk_scores). status_codes is a uint8 bitmask
+        (STATUS_DELAYED | STATUS_COST_OVERRUN) that indexes STATUS_LABELS;
+        risk_scores is the shortfall below the delay threshold (0-1) plus the
+        overspend ratio above planned cost (capped at MAX_OVERSPEND_RISK), so
+        0 means on track and every flagged project scores above 0.
+    """
+    progress = _as_float_array(physical_progress)
+    spent = _as_float_array(expenditure)
+    planned = _as_float_array(planned_cost)
+
+    delayed = progress < delay_threshold
+    overrun = spent > planned * (1 + overrun_tolerance)
+    codes = delayed.astype(np.uint8) * STATUS_DELAYED | overrun.astype(np.uint8) * STATUS_COST_OVERRUN
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shortfall = np.clip((delay_threshold - progress) / delay_threshold, 0, 1)
+        overspend = np.clip(spent / planned - 1, 0, MAX_OVERSPEND_RISK)
+    risk = np.nan_to_num(shortfall, nan=0.0) + np.nan_to_num(overspend, nan=0.0)
+
+    return codes, risk
+
+def score_frame(df, delay_threshold=DELAY_THRESHOLD, overrun_tolerance=OVERRUN_TOLERANCE):
+    """
+    Rescores a DataFrame of parsed records in one vectorized pass.
+
+    Args:
+        df (pd.DataFrame): Needs physical_progress_percent,
+            expenditure_till_date_crore and planned_cost_crore columns.
+
+    Returns:
+        pd.DataFrame: Same index with 'status_code' (uint8 bitmask),
+        'status_flag' (categorical over STATUS_LABELS) and 'risk_score'.
+    """
+    codes, risk = score_projects(
+        df["physical_progress_percent"],
+        df["expenditure_till_date_crore"],
+        df["planned_cost_crore"],
+        delay_threshold,
+        overrun_tolerance
+    )
+    return pd.DataFrame({
+        "status_code": codes,
+        "status_flag": pd.Categorical.from_codes(codes, STATUS_LABELS),
+        "risk_score": risk,
+    }, index=df.index)
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _name_hash(project_name, width):
+    digest = hashlib.blake2b(project_name.encode(), digest_size=(width + 1) // 2)
+    return digest.hexdigest()[:width].upper()
+
+def generate_project_id(project_name, content_hash=None, width=PROJECT_ID_WIDTH):
     """
     Generates a deterministic project ID based on the project name.
     
     Args:
         project_name (str): Name of the project.
+        content_hash (str, optional): Hex digest of the source document (e.g.
+            the PDF hash), used to derive an ID when the name is missing.
+        width (int): Number of hex characters in the hash part.
         
     Returns:
-        str: A short hash identifying the project.
+        str: 'PROJ-<hash of name>', or 'UNK-<content hash>' for unnamed
+        projects (None if there is no content hash either).
     """
     if not project_name:
-        return f"UNK-{int(time.time())}"
+        if not content_hash:
+            return None
+        return f"UNK-{content_hash[:width].upper()}"
     
-    # Create a short hash of the project name
-    hash_object = hashlib.md5(project_name.encode())
-    return f"PROJ-{hash_object.hexdigest()[:6].upper()}"
+    return f"PROJ-{_name_hash(project_name, width)}"
+
+def generate_project_ids(project_names, width=PROJECT_ID_WIDTH):
+    """
+    Bulk version of generate_project_id for named projects: one comprehension
+    with the hash constructor bound locally, no per-name function calls.
+    Unnamed entries map to None since they need a content hash.
+
+    Args:
+        project_names (iterable of str): Project names.
+        width (int): Number of hex characters in the hash part.
+
+    Returns:
+        list: Project IDs in input order.
+    """
+    blake2b = hashlib.blake2b
+    digest_size = (width + 1) // 2
+    return [
+        "PROJ-" + blake2b(name.encode(), digest_size=digest_size).hexdigest()[:width].upper() if name else None
+        for name in project_names
+    ]
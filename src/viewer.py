@@ -0,0 +1,58 @@
+"""
+Page-at-a-time views of an extracted document for the app's source inspector.
+
+Everything here touches one page's text and tables (plus the per-field
+sources), never the flat document text, so the cost of showing a page does
+not grow with the document.
+"""
+import bisect
+import html
+
+def page_tables(document, page):
+    """Returns [(table_index, table)] for the tables on a 1-based page."""
+    table_pages = document.get("table_pages") or []
+    start = bisect.bisect_left(table_pages, page)
+    stop = bisect.bisect_right(table_pages, page)
+    return [(i, document["tables"][i]) for i in range(start, stop)]
+
+def page_highlights(document, page, sources=None):
+    """
+    Returns the field sources that fall on a 1-based page. `sources` defaults
+    to the document's field_sources; pass one of its project_sources to
+    highlight another project of a consolidated report.
+
+    Returns:
+        tuple: (spans, rows) where spans is a sorted list of (start, end, field)
+        with offsets into the page's text, and rows is
+        {table_index: {row_index: [field, ...]}}.
+    """
+    page_start = document["page_offsets"][page - 1]
+    spans = []
+    rows = {}
+    if sources is None:
+        sources = document.get("field_sources") or {}
+    for field, source in sources.items():
+        if source.get("page") != page:
+            continue
+        if "table" in source:
+            rows.setdefault(source["table"], {}).setdefault(source["row"], []).append(field)
+        else:
+            spans.append((source["start"] - page_start, source["end"] - page_start, field))
+    return sorted(spans), rows
+
+def highlight_html(text, spans):
+    """
+    Escapes `text` for HTML and wraps each (start, end, field) span in a
+    <mark> titled with the field. Spans overlapping an earlier one are trimmed.
+    """
+    parts = []
+    position = 0
+    for start, end, field in spans:
+        start = max(start, position)
+        if start >= end:
+            continue
+        parts.append(html.escape(text[position:start]))
+        parts.append(f'<mark title="{html.escape(field)}">{html.escape(text[start:end])}</mark>')
+        position = end
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
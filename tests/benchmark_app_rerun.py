@@ -0,0 +1,59 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tests.benchmark_suite import report_path
+
+def _timed(at, repeat, interact=None):
+    """Median seconds of `repeat` reruns, applying `interact(at)` before each."""
+    times = []
+    for i in range(repeat):
+        if interact is not None:
+            interact(at, i)
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        assert not at.exception, [e.message for e in at.exception]
+    return statistics.median(times)
+
+def benchmark_app_rerun(page_counts=(1, 50, 200), repeat=10):
+    """
+    Uploads a report into the app (streamlit.testing's AppTest) and times the
+    first run, then reruns the way widget interactions trigger them: a plain
+    rerun and flipping the source inspector's page. The extraction cache
+    starts empty, so the first run includes pdfplumber.
+    """
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    reports = [("sample_report.pdf", os.path.join(ROOT, "tests", "sample_report.pdf"))]
+    reports += [(f"synthetic {pages}p", report_path(pages, 1, 1)) for pages in page_counts if pages > 1]
+
+    # A fresh extraction cache for this benchmark (src.cache reads it on every call)
+    os.environ["INFRATRACK_CACHE_DIR"] = tempfile.mkdtemp(prefix="infratrack-rerun-")
+
+    print(f"{'report':<20} {'first run':>10} {'rerun':>10} {'page flip':>10}")
+    for name, path in reports:
+        with open(path, "rb") as f:
+            content = f.read()
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+        at.run()
+        at.sidebar.file_uploader[0].set_value((os.path.basename(path), content, "application/pdf"))
+        start = time.perf_counter()
+        at.run()
+        first = time.perf_counter() - start
+        assert not at.exception, [e.message for e in at.exception]
+
+        rerun = _timed(at, repeat)
+        pages = int(at.number_input(key="inspector_page").proto.max)
+        flip = _timed(at, repeat, lambda at, i: at.number_input(key="inspector_page").set_value(i % pages + 1))
+        print(f"{name:<20} {first * 1000:>8.0f}ms {rerun * 1000:>8.1f}ms {flip * 1000:>8.1f}ms")
+
+if __name__ == "__main__":
+    benchmark_app_rerun()
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.export import export_to_file
+from src.store import open_store, upsert_records, iter_records, query_projects
+from tests.benchmark_store import synthetic_records
+from tests.benchmark_suite import _peak_rss_mb
+
+def export_once(store_path, fmt, output):
+    """One export in this process; prints seconds, bytes and peak RSS for the parent to collect."""
+    baseline = _peak_rss_mb()
+    conn = open_store(store_path)
+    start = time.perf_counter()
+    if fmt == "legacy-csv":
+        # What the app did for a single record, applied to the whole store
+        data = query_projects(conn).to_csv(index=False).encode("utf-8")
+        with open(output, "wb") as f:
+            f.write(data)
+        written = len(data)
+    else:
+        written = export_to_file(iter_records(conn), output, fmt)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    print(elapsed, written, baseline, _peak_rss_mb())
+
+def benchmark_export(rows=1_000_000, formats=("csv", "jsonl", "parquet", "legacy-csv")):
+    """
+    Exports `rows` store records in every format, each in a fresh interpreter
+    so peak RSS is per export (and the baseline is the interpreter plus imports).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = os.path.join(tmp, "projects.db")
+        conn = open_store(store_path)
+        upsert_records(conn, synthetic_records(rows))
+        conn.close()
+
+        print(f"{rows:,} records")
+        print(f"{'format':<12} {'seconds':>8} {'rows/s':>10} {'MiB':>8} {'MiB/s':>7} {'peak RSS':>9} {'over base':>10}")
+        for fmt in formats:
+            extension = "csv" if fmt == "legacy-csv" else fmt
+            output = os.path.join(tmp, f"export.{extension}")
+            result = subprocess.run([sys.executable, __file__, "--worker", store_path, fmt, output],
+                                    capture_output=True, text=True, check=True)
+            elapsed, written, baseline, peak = (float(value) for value in result.stdout.split())
+            print(f"{fmt:<12} {elapsed:>8.2f} {rows / elapsed:>10,.0f} {written / 2**20:>8.1f} "
+                  f"{written / 2**20 / elapsed:>7.1f} {peak:>8.0f}M {peak - baseline:>9.0f}M")
+            os.remove(output)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        export_once(*sys.argv[2:5])
+    else:
+        benchmark_export(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
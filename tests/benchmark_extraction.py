@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import extract_text_and_tables
+from src.parser import parse_project_info, KEYWORDS_MAP
+from tests.generate_large_pdf import generate_large_pdf
+
+def benchmark_extraction(pages=60, worker_counts=(2, 4)):
+    """Compares serial and page-sharded parallel extraction on a generated report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "large_report.pdf")
+        generate_large_pdf(pdf_path, pages=pages)
+
+        start = time.perf_counter()
+        serial = extract_text_and_tables(pdf_path)
+        serial_time = time.perf_counter() - start
+        print(f"serial      : {serial_time:7.2f}s ({pages / serial_time:6.1f} pages/s)")
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            parallel = extract_text_and_tables(pdf_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert parallel == serial, f"workers={workers} output differs from serial"
+            print(f"workers={workers:<3}: {elapsed:7.2f}s ({pages / elapsed:6.1f} pages/s, "
+                  f"speedup x{serial_time / elapsed:.2f})")
+
+    print(f"CPUs available: {os.cpu_count()}")
+
+def benchmark_table_gating(pdf_paths):
+    """Reports pages skipped and time saved by keyword-gated table extraction."""
+    for pdf_path in pdf_paths:
+        start = time.perf_counter()
+        full = extract_text_and_tables(pdf_path)
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        gated = extract_text_and_tables(pdf_path, table_keywords=KEYWORDS_MAP)
+        gated_time = time.perf_counter() - start
+
+        same = parse_project_info(full["text"], full["tables"]) == parse_project_info(gated["text"], gated["tables"])
+        print(f"{os.path.basename(pdf_path)}: skipped table detection on pages {gated['skipped_table_pages']}, "
+              f"{full_time:.2f}s -> {gated_time:.2f}s (saved {full_time - gated_time:.2f}s), "
+              f"parsed fields {'unchanged' if same else 'CHANGED'}")
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    benchmark_extraction(pages=pages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        large_path = os.path.join(tmp, "large_report.pdf")
+        generate_large_pdf(large_path, pages=pages)
+        benchmark_table_gating(["tests/sample_report.pdf", "tests/complex_report.pdf", large_path])
@@ -0,0 +1,57 @@
+import io
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdfplumber
+import src.extractor as extractor
+from src.extractor import extract_text_and_tables
+from tests.benchmark_suite import report_path, _peak_rss_mb
+
+def legacy_extract(pdf_path):
+    """The previous input path: whole file in memory, pages never released."""
+    with open(pdf_path, "rb") as f:
+        stream = io.BytesIO(f.read())
+    text = []
+    with pdfplumber.open(stream) as pdf:
+        for page in pdf.pages:
+            text.append(page.extract_text())
+            page.extract_tables()
+    return text
+
+def _run_mode(mode, pdf_path):
+    if mode == "legacy (BytesIO, no page release)":
+        legacy_extract(pdf_path)
+    elif mode == "path (mmap)":
+        extract_text_and_tables(pdf_path)
+    elif mode == "bytes":
+        with open(pdf_path, "rb") as f:
+            extract_text_and_tables(f.read())
+    elif mode == "upload, spilled to temp file":
+        with open(pdf_path, "rb") as f:
+            upload = io.BytesIO(f.read())
+        extractor.SPILL_THRESHOLD = 0
+        extract_text_and_tables(upload)
+
+MODES = ("legacy (BytesIO, no page release)", "path (mmap)", "bytes", "upload, spilled to temp file")
+
+def benchmark_input_paths(page_counts=(50, 200)):
+    """Runs every input mode in a fresh interpreter and prints wall time and peak RSS."""
+    for pages in page_counts:
+        pdf_path = report_path(pages, 1, 1)
+        print(f"{pages} pages ({os.path.getsize(pdf_path) / 1024 / 1024:.1f} MiB)")
+        for mode in MODES:
+            out = subprocess.run([sys.executable, __file__, "--run", mode, pdf_path],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            print(f"  {mode:<36}: {float(out[0]):7.2f}s, peak RSS {float(out[1]):7.1f} MiB")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        start = time.perf_counter()
+        _run_mode(sys.argv[2], sys.argv[3])
+        print(time.perf_counter() - start, _peak_rss_mb())
+    else:
+        benchmark_input_paths(tuple(int(arg) for arg in sys.argv[1:]) or (50, 200))
@@ -0,0 +1,58 @@
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import parse_project_info
+
+# The narrative fallbacks parse_project_info used before the single-pass matcher
+LEGACY_PATTERNS = [
+    r'Physical Progress.*?(\d+(?:\.\d+)?)%',
+    r'Financial Progress.*?(\d+(?:\.\d+)?)%',
+    r'Planned Cost.*?(?:Rs\.?|INR)\s*([\d.,]+)',
+    r'Expenditure.*?(?:Rs\.?|INR)\s*([\d.,]+)',
+]
+
+BLOCK = (
+    "Physical Progress of the works was reviewed during the site visit.\n"
+    "Financial Progress will be reported once utilisation certificates arrive.\n"
+    "The Planned Cost and Expenditure statements are pending with the finance wing.\n"
+    "Contractor mobilisation continued on all packages without major incidents.\n"
+)
+
+def make_text(blocks):
+    """Synthetic report text in which every numerical field is mentioned but missing."""
+    return "Project Name: Synthetic Stress Corridor\nSector: Roads\n" + BLOCK * blocks
+
+def legacy_narrative(text):
+    return [re.search(p, text, re.IGNORECASE | re.DOTALL) for p in LEGACY_PATTERNS]
+
+def _time(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_parser(block_counts=(250, 500, 1000, 2000, 4000, 8000), legacy_limit=500):
+    """
+    Times parse_project_info against the legacy DOTALL regexes as the text grows.
+    The legacy regexes are quadratic here, so they only run up to `legacy_limit` blocks.
+    """
+    print(f"{'chars':>10} {'single-pass':>12} {'us/KB':>8} {'legacy regex':>13} {'us/KB':>8}")
+    for blocks in block_counts:
+        text = make_text(blocks)
+        kb = len(text) / 1024
+
+        fast = _time(lambda: parse_project_info(text, []))
+        line = f"{len(text):>10} {fast:>11.4f}s {fast * 1e6 / kb:>8.1f}"
+        if blocks <= legacy_limit:
+            legacy = _time(lambda: legacy_narrative(text), repeat=1)
+            line += f" {legacy:>12.4f}s {legacy * 1e6 / kb:>8.1f}"
+        print(line)
+
+if __name__ == "__main__":
+    benchmark_parser()
@@ -0,0 +1,45 @@
+import hashlib
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import generate_project_ids, PROJECT_ID_WIDTH
+
+def legacy_ids(names):
+    """The previous scheme: MD5 truncated to 6 hex characters."""
+    return [f"PROJ-{hashlib.md5(name.encode()).hexdigest()[:6].upper()}" for name in names]
+
+def _collisions(id_chunks):
+    values = np.concatenate([np.array([int(pid[5:], 16) for pid in chunk], dtype=np.uint64) for chunk in id_chunks])
+    return len(values) - len(np.unique(values))
+
+def benchmark_project_ids(names=10_000_000, chunk=1_000_000):
+    """
+    Hashes `names` synthetic project names in chunks (to bound memory) with
+    the bulk generator and the legacy scheme, then counts ID collisions.
+    """
+    timings = {"legacy md5[:6]": 0.0, f"bulk blake2b[:{PROJECT_ID_WIDTH}]": 0.0}
+    results = {label: [] for label in timings}
+
+    for start in range(0, names, chunk):
+        batch = [f"Project {i} - District Package {i % 97}"
+                 for i in range(start, min(names, start + chunk))]
+
+        t = time.perf_counter()
+        results["legacy md5[:6]"].append(legacy_ids(batch))
+        timings["legacy md5[:6]"] += time.perf_counter() - t
+
+        t = time.perf_counter()
+        results[f"bulk blake2b[:{PROJECT_ID_WIDTH}]"].append(generate_project_ids(batch))
+        timings[f"bulk blake2b[:{PROJECT_ID_WIDTH}]"] += time.perf_counter() - t
+
+    print(f"{names:,} unique names")
+    for label, elapsed in timings.items():
+        print(f"{label:<22}: {elapsed:7.2f}s ({names / elapsed:,.0f} names/s), "
+              f"{_collisions(results[label]):,} collisions")
+
+if __name__ == "__main__":
+    benchmark_project_ids(names=int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
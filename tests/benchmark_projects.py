@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import extract_text_and_tables
+from src.parser import parse_projects, parse_project_info
+from src.templates import parse_document_projects
+from tests.benchmark_suite import REPORT_DIR, report_path
+from tests.generate_multi_project_pdf import generate_multi_project_pdf
+
+def _time(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def consolidated_path(projects, named=True):
+    """Generates (once) and returns a consolidated report with `projects` projects."""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"consolidated_{projects}{'' if named else '_unnamed'}.pdf")
+    if not os.path.exists(path):
+        generate_multi_project_pdf(path, projects=projects, named=named)
+    return path
+
+def benchmark_projects(project_counts=(10, 50, 200, 800)):
+    """
+    Times the single-pass segmentation as consolidated reports grow, next to
+    one generic parse of the whole document (a single record), and the
+    overhead parse_document_projects adds to single-project reports.
+    """
+    print(f"{'projects':>8} {'pages':>6} {'unnamed':>8} {'found':>6} {'segment':>10} {'per project':>12} {'one parse':>10}")
+    for count in project_counts:
+        for named in (True, False):
+            document = extract_text_and_tables(consolidated_path(count, named))
+            records = parse_projects(document)
+            seconds = _time(lambda: parse_projects(document))
+            single = _time(lambda: parse_project_info(document["text"], document["tables"]))
+            print(f"{count:>8} {len(document['pages']):>6} {str(not named):>8} {len(records):>6} "
+                  f"{seconds * 1000:>8.2f}ms {seconds * 1e6 / count:>10.0f}us {single * 1000:>8.2f}ms")
+
+    print(f"\n{'single-project report':<28} {'parse_document_projects':>24}")
+    for pages in (50, 200):
+        document = extract_text_and_tables(report_path(pages, 1, 1))
+        seconds = _time(lambda: parse_document_projects(document))
+        print(f"{f'synthetic {pages}p':<28} {seconds * 1000:>22.2f}ms")
+
+if __name__ == "__main__":
+    benchmark_projects()
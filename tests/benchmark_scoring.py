@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import calculate_status, score_frame
+
+def benchmark_scoring(rows=2_000_000, seed=7):
+    """Rescores `rows` synthetic project-months with the scalar and vectorized scorers."""
+    rng = np.random.default_rng(seed)
+    planned = rng.uniform(50, 20000, rows)
+    df = pd.DataFrame({
+        "physical_progress_percent": rng.uniform(0, 100, rows),
+        "expenditure_till_date_crore": planned * rng.uniform(0.1, 1.3, rows),
+        "planned_cost_crore": planned,
+    })
+
+    start = time.perf_counter()
+    scalar = [calculate_status(p, e, c) for p, e, c in zip(
+        df["physical_progress_percent"].tolist(),
+        df["expenditure_till_date_crore"].tolist(),
+        df["planned_cost_crore"].tolist())]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scored = score_frame(df)
+    vector_time = time.perf_counter() - start
+
+    assert list(scored["status_flag"].astype(str)) == scalar
+    print(f"scalar calculate_status : {scalar_time:7.3f}s ({rows / scalar_time:,.0f} rows/s)")
+    print(f"vectorized score_frame  : {vector_time:7.3f}s ({rows / vector_time:,.0f} rows/s, "
+          f"x{scalar_time / vector_time:.0f})")
+    print(f"status column memory    : {scored['status_flag'].memory_usage(deep=True) / 1e6:.1f} MB categorical "
+          f"vs {pd.Series(scalar).memory_usage(deep=True) / 1e6:.1f} MB strings")
+
+if __name__ == "__main__":
+    benchmark_scoring(rows=int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,78 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget per entry point (ms, median of the runs),
+# and dependencies that must not be imported by it at all
+BUDGETS = {
+    "src.utils": {"budget_ms": 30, "forbidden": ("numpy", "pandas", "pdfplumber", "plotly")},
+    "src.parser": {"budget_ms": 40, "forbidden": ("numpy", "pandas", "pdfplumber", "plotly")},
+    "src.cache": {"budget_ms": 60, "forbidden": ("numpy", "pandas", "pdfplumber", "plotly")},
+    "src.batch": {"budget_ms": 100, "forbidden": ("numpy", "pandas", "pdfplumber", "plotly")},
+    "src.analytics": {"budget_ms": 30, "forbidden": ("numpy", "pandas", "plotly")},
+}
+
+def import_profile(module):
+    """
+    Imports `module` in a fresh interpreter under `python -X importtime`.
+
+    Returns:
+        tuple: (total_ms, imported) where total_ms is the summed cumulative
+        time of the top-level imports and imported is the set of module names.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    total_us = 0
+    imported = set()
+    after_startup = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imported.add(name.strip())
+        # Nested imports are indented further; top-level entries add up to the
+        # total. Interpreter startup (everything up to and including `site`,
+        # e.g. .pth hooks) is not ours, so it is left out.
+        if len(name) - len(name.lstrip(" ")) == 1:
+            if after_startup:
+                total_us += int(cumulative)
+            after_startup = after_startup or name.strip() == "site"
+    return total_us / 1000, imported
+
+def run_startup_benchmark(runs=5, modules=None):
+    """
+    Measures every entry point in BUDGETS and checks it against its budget.
+
+    Returns:
+        int: Number of budget violations (slow or forbidden imports).
+    """
+    violations = 0
+    for module in modules or BUDGETS:
+        budget = BUDGETS[module]
+        timings = []
+        for _ in range(runs):
+            total_ms, imported = import_profile(module)
+            timings.append(total_ms)
+        median_ms = statistics.median(timings)
+
+        heavy = sorted(name for name in budget["forbidden"] if name in imported)
+        over = median_ms > budget["budget_ms"]
+        violations += bool(heavy) + over
+        flag = "FAIL" if heavy or over else "ok"
+        print(f"{module:<15} {median_ms:8.1f} ms (budget {budget['budget_ms']} ms) {flag}"
+              + (f"  imports {', '.join(heavy)}" if heavy else ""))
+    return violations
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time startup benchmark with a regression budget.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("modules", nargs="*", help=f"Subset of: {', '.join(BUDGETS)}")
+    args = parser.parse_args(argv)
+    return 1 if run_startup_benchmark(args.runs, args.modules) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.store import open_store, upsert_records, query_projects, count_projects
+
+STATES = ["Karnataka", "Maharashtra", "Uttar Pradesh", "Tamil Nadu", "Gujarat", "Bihar", "Odisha", "Assam"]
+SECTORS = ["Roads", "Railways", "Urban Transport", "Power", "Water", "Ports"]
+STATUSES = ["ON_TRACK", "DELAYED", "COST_OVERRUN", "DELAYED | COST_OVERRUN"]
+MONTHS = [f"{month} {year}" for year in (2022, 2023, 2024) for month in
+          ("January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December")]
+
+def synthetic_records(rows, seed=7):
+    """Yields `rows` project-month records spread over len(MONTHS) months."""
+    rng = random.Random(seed)
+    for i in range(rows):
+        planned = rng.uniform(50, 20000)
+        yield {
+            "project_id": f"PROJ-{i // len(MONTHS):08X}",
+            "project_name": f"Synthetic Project {i // len(MONTHS)}",
+            "report_month": MONTHS[i % len(MONTHS)],
+            "state": rng.choice(STATES),
+            "district": "Synthetic",
+            "sector": rng.choice(SECTORS),
+            "physical_progress_percent": round(rng.uniform(0, 100), 1),
+            "financial_progress_percent": round(rng.uniform(0, 100), 1),
+            "planned_cost_crore": round(planned, 2),
+            "expenditure_till_date_crore": round(planned * rng.uniform(0.1, 1.3), 2),
+            "status_flag": rng.choice(STATUSES),
+        }
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<45}: {time.perf_counter() - start:7.3f}s")
+    return result
+
+def benchmark_store(rows=1_000_000):
+    """Bulk-loads `rows` synthetic project-months and times indexed queries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "projects.db")
+        conn = open_store(path)
+
+        start = time.perf_counter()
+        upsert_records(conn, synthetic_records(rows))
+        elapsed = time.perf_counter() - start
+        print(f"{'bulk upsert':<45}: {elapsed:7.3f}s ({rows / elapsed:,.0f} rows/s)")
+        print(f"{'database size':<45}: {os.path.getsize(path) / 1024 / 1024:7.1f} MiB")
+
+        _timed("re-upsert 10k existing rows", lambda: upsert_records(conn, synthetic_records(10_000)))
+        _timed("count(*)", lambda: count_projects(conn))
+        df = _timed("query state='Bihar' (2 columns)",
+                    lambda: query_projects(conn, state="Bihar", columns=["project_id", "report_month"]))
+        print(f"{'':<45}  {len(df):,} rows")
+        df = _timed("query sector + status + month",
+                    lambda: query_projects(conn, sector="Power", status_flag="DELAYED", report_month="March 2024"))
+        print(f"{'':<45}  {len(df):,} rows")
+        df = _timed("query one project's history",
+                    lambda: query_projects(conn, project_id="PROJ-00000400"))
+        print(f"{'':<45}  {len(df):,} rows")
+        conn.close()
+
+if __name__ == "__main__":
+    benchmark_store(rows=int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import extract_text_and_tables, iter_pages
+from src.parser import parse_project_info, parse_pages
+from tests.generate_large_pdf import generate_large_pdf
+
+def _measure(label, fn, pages):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22}: {elapsed:7.2f}s, peak {peak / 1024 / 1024:7.1f} MiB ({pages} pages)")
+    return result
+
+def benchmark_streaming(pages=60):
+    """Compares full extraction + parsing against the early-exit streaming pipeline."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "large_report.pdf")
+        generate_large_pdf(pdf_path, pages=pages)
+
+        def full():
+            extracted = extract_text_and_tables(pdf_path)
+            return parse_project_info(extracted["text"], extracted["tables"])
+
+        expected = _measure("full extract + parse", full, pages)
+        early = _measure("streaming, early exit", lambda: parse_pages(iter_pages(pdf_path)), pages)
+        audit = _measure("streaming, full scan", lambda: parse_pages(iter_pages(pdf_path), full_scan=True), pages)
+
+        assert early == expected and audit == expected
+
+if __name__ == "__main__":
+    benchmark_streaming(pages=int(sys.argv[1]) if len(sys.argv) > 1 else 60)
@@ -0,0 +1,164 @@
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import extract_text_and_tables, iter_pages
+from src.parser import parse_project_info, parse_pages, KEYWORDS_MAP
+from tests.generate_large_pdf import generate_large_pdf
+
+# Generated reports are reused across runs; they only depend on these parameters
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bench_reports")
+
+def _reset_peak_rss():
+    """Resets the kernel's peak-RSS counter (Linux); a no-op elsewhere."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _peak_rss_mb():
+    """Peak RSS since the last reset (Linux), or since process start."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def report_path(pages, table_density, distractors):
+    """Generates (once) and returns the synthetic report for these parameters."""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"report_p{pages}_t{table_density}_d{distractors}.pdf")
+    if not os.path.exists(path):
+        generate_large_pdf(path, pages=pages, table_density=table_density, distractors=distractors)
+    return path
+
+def _stages(pdf_path):
+    """
+    Stage name -> callable. The parse stage reuses the output of the extract
+    stage, so stages run in order and share state through `context`.
+    """
+    context = {}
+
+    def extract():
+        context["extracted"] = extract_text_and_tables(pdf_path)
+
+    def extract_gated():
+        extract_text_and_tables(pdf_path, table_keywords=KEYWORDS_MAP)
+
+    def parse():
+        extracted = context["extracted"]
+        parse_project_info(extracted["text"], extracted["tables"])
+
+    def stream_parse():
+        parse_pages(iter_pages(pdf_path, table_keywords=KEYWORDS_MAP))
+
+    return [
+        ("extract", extract),
+        ("extract_gated", extract_gated),
+        ("parse", parse),
+        ("stream_parse", stream_parse),
+    ]
+
+def run_suite(page_counts=(10, 100, 1000), table_density=1, distractors=1):
+    """
+    Runs every stage on a synthetic report of each size.
+
+    Returns:
+        list: One result dict per (pages, stage) with wall time, pages/sec and peak RSS.
+    """
+    results = []
+    for pages in page_counts:
+        pdf_path = report_path(pages, table_density, distractors)
+        for stage, fn in _stages(pdf_path):
+            gc.collect()
+            exact_peak = _reset_peak_rss()
+            start = time.perf_counter()
+            fn()
+            wall = time.perf_counter() - start
+            result = {
+                "pages": pages,
+                "table_density": table_density,
+                "distractors": distractors,
+                "stage": stage,
+                "wall_s": round(wall, 4),
+                "pages_per_s": round(pages / wall, 2) if wall else None,
+                "peak_rss_mb": round(_peak_rss_mb(), 1),
+                "peak_rss_is_per_stage": exact_peak,
+            }
+            results.append(result)
+            print(f"{pages:>5} pages  {stage:<14} {wall:9.3f}s {result['pages_per_s']:>10} pages/s "
+                  f"{result['peak_rss_mb']:>8} MiB peak RSS")
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path, threshold):
+    """
+    Prints stages that got slower than the baseline by more than `threshold`
+    (a fraction) and returns the number of regressions.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["pages"], r["table_density"], r["distractors"], r["stage"]): r
+                    for r in json.load(f)["results"]}
+
+    regressions = 0
+    for result in results:
+        key = (result["pages"], result["table_density"], result["distractors"], result["stage"])
+        before = baseline.get(key)
+        if not before or not before["wall_s"]:
+            continue
+        change = result["wall_s"] / before["wall_s"] - 1
+        if change > threshold:
+            regressions += 1
+            print(f"REGRESSION: {result['pages']} pages {result['stage']}: "
+                  f"{before['wall_s']:.3f}s -> {result['wall_s']:.3f}s (+{change:.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extraction/parsing benchmark suite on synthetic reports.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000], help="Report sizes")
+    parser.add_argument("--table-density", type=int, default=1, help="Component tables per page (0-3)")
+    parser.add_argument("--distractors", type=int, default=1, help="Distractor tables per page (0-2)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.pages, args.table_density, args.distractors)
+    with open(args.output, "w") as f:
+        json.dump({
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"Saved results to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import KEYWORDS_MAP, NUMERIC_FIELDS, TableIndex, _scan_tables, find_value_in_row, parse_currency, parse_percentage
+
+FILLER_LABELS = [
+    "Land Acquisition", "Forest Clearance", "Utility Shifting", "Contractor Mobilisation",
+    "Bridge Works", "Drainage", "Safety Audit", "Quality Inspection", "Manpower Deployed",
+]
+
+def legacy_scan_tables(tables, data):
+    """The previous table phase: every row re-lowercased and tested against every key."""
+    for table in tables:
+        for row in table:
+            if not row or len(row) < 2:
+                continue
+            first_cell = str(row[0]).strip() if row[0] else ""
+            for key, field in KEYWORDS_MAP.items():
+                if key.lower() in first_cell.lower() and data[field] is None:
+                    value_cell = find_value_in_row(row, 1)
+                    if value_cell:
+                        if field.endswith("percent"):
+                            val = parse_percentage(value_cell)
+                            if val is not None: data[field] = val
+                        else:
+                            val = parse_currency(value_cell)
+                            if val is not None: data[field] = val
+
+def make_tables(count, rows, seed=0):
+    """
+    Table-heavy synthetic report: `count` tables of `rows` rows, mostly filler.
+    The KPI rows only appear in the last table, so both scans cover everything.
+    """
+    rng = random.Random(seed)
+    tables = []
+    for t in range(count):
+        table = [["Parameter", "Target", "Achieved", "Remarks"]]
+        for r in range(rows):
+            label = f"{rng.choice(FILLER_LABELS)} Package {t}-{r}"
+            table.append([label, f"{rng.randint(1, 999)} km", "-", "NA"])
+        tables.append(table)
+    tables[-1] += [
+        ["Physical Progress", "58.2%"], ["Financial Progress", "33.6%"],
+        ["Planned Cost", "Rs. 12,500 Cr"], ["Expenditure till date", "Rs. 4,200.5 Cr"],
+    ]
+    return tables
+
+def _time(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_table_index(table_counts=(10, 100, 500, 2000), rows=40):
+    """
+    Times the legacy per-key scan against building a TableIndex and looking up
+    every field, and what one more keyword costs each way once the index exists.
+    """
+    print(f"{'tables':>7} {'rows':>8} {'legacy':>10} {'index':>10} {'speedup':>8} "
+          f"{'+1 key legacy':>14} {'+1 key index':>13}")
+    for count in table_counts:
+        tables = make_tables(count, rows)
+
+        legacy_data = dict.fromkeys(NUMERIC_FIELDS)
+        index_data = dict.fromkeys(NUMERIC_FIELDS)
+        legacy = _time(lambda: legacy_scan_tables(tables, dict.fromkeys(NUMERIC_FIELDS)))
+        indexed = _time(lambda: _scan_tables(TableIndex(tables), dict.fromkeys(NUMERIC_FIELDS)))
+
+        legacy_scan_tables(tables, legacy_data)
+        index = TableIndex(tables)
+        _scan_tables(index, index_data)
+        assert index_data == legacy_data
+
+        # A keyword that matches nothing, so both have to look at every row
+        # (the index's per-keyword memo is cleared so each run searches again)
+        def extra_lookup():
+            index._matches.clear()
+            index.lookup("Escalation Claims", parse_currency)
+        extra_legacy = legacy / len(KEYWORDS_MAP)
+        extra_index = _time(extra_lookup)
+
+        print(f"{count:>7} {count * (rows + 1):>8} {legacy * 1000:>8.1f}ms {indexed * 1000:>8.1f}ms {legacy / indexed:>7.1f}x "
+              f"{extra_legacy * 1000:>12.1f}ms {extra_index * 1000:>11.2f}ms")
+
+if __name__ == "__main__":
+    benchmark_table_index()
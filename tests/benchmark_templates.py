@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import extract_text_and_tables
+from src.parser import parse_project_info
+from src.templates import parse_document, select_template, template_stats, reset_template_stats
+from tests.benchmark_suite import report_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _time(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_templates(page_counts=(50, 200)):
+    """
+    Parses each report with the generic parser and through the template
+    registry, then prints the per-template hit rate and mean parse time.
+    """
+    reports = [os.path.join(ROOT, "tests", name) for name in ("sample_report.pdf", "complex_report.pdf")]
+    reports += [report_path(pages, 1, 1) for pages in page_counts]
+
+    print(f"{'report':<28} {'template':<28} {'generic':>10} {'template':>10} {'speedup':>8}")
+    documents = []
+    for path in reports:
+        extracted = extract_text_and_tables(path)
+        documents.append(extracted)
+        template = select_template(extracted)
+        generic = _time(lambda: parse_project_info(extracted["text"], extracted["tables"]))
+        templated = _time(lambda: parse_document(extracted))
+        print(f"{os.path.basename(path):<28} {template.name if template else 'generic':<28} "
+              f"{generic * 1000:>8.2f}ms {templated * 1000:>8.2f}ms {generic / templated:>7.1f}x")
+
+    # Hit rate over one pass of the whole set
+    reset_template_stats()
+    for extracted in documents:
+        parse_document(extracted)
+    print()
+    for name, stats in template_stats().items():
+        print(f"{name:<28} hits {stats['hits']:>3} ({stats['hit_rate']:.0%}), "
+              f"mean {stats['mean_ms']:.2f} ms, {stats['missing_fields']} missing fields")
+
+if __name__ == "__main__":
+    benchmark_templates()
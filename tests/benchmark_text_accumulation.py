@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import _merge_pages, iter_pages
+from tests.benchmark_suite import report_path
+
+def legacy_merge(page_results):
+    """The previous extractor merge: one growing string, copied on every page."""
+    extracted_data = {"text": "", "tables": []}
+    for text, tables, _ in page_results:
+        if text:
+            extracted_data["text"] += text + "\n"
+        if tables:
+            extracted_data["tables"].extend(tables)
+    return extracted_data
+
+def _measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<26}: {elapsed * 1000:9.1f} ms, peak {peak / 1024 / 1024:7.1f} MiB")
+    return result
+
+def benchmark_text_accumulation(pages=200, scales=(1, 10, 50)):
+    """
+    Merges real page results from a synthetic report with the legacy `+=`
+    accumulation and with the per-page ExtractedDocument. The extracted pages
+    are replicated `scale` times to reach document sizes that are too slow to
+    generate, since the merge cost only depends on the page texts.
+    """
+    pdf_path = report_path(pages, 1, 1)
+    page_results = [(page["text"], page["tables"], False) for page in iter_pages(pdf_path)]
+
+    for scale in scales:
+        results = page_results * scale
+        chars = sum(len(text or "") for text, _, _ in results)
+        print(f"{len(results):,} pages, {chars / 1024 / 1024:.1f} MiB of text")
+
+        legacy = _measure("legacy += accumulation", lambda: legacy_merge(results))
+        merged = _measure("per-page merge", lambda: _merge_pages(results))
+        joined = _measure("per-page merge + join", lambda: _merge_pages(results)["text"])
+        assert joined == legacy["text"] and merged["tables"] == legacy["tables"]
+
+if __name__ == "__main__":
+    benchmark_text_accumulation(pages=int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extractor import _merge_pages, iter_pages
+from src.templates import parse_document
+from src.viewer import page_tables, page_highlights, highlight_html
+from tests.benchmark_suite import report_path
+
+def _measure(fn, repeat=5):
+    best = float("inf")
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best, peak
+
+def benchmark_viewer(pages=50, scales=(1, 20, 200)):
+    """
+    Compares the old raw-text expander (join the whole document, show 1000
+    characters) with rendering one page of the source inspector, as the
+    document grows. Page results of a synthetic report are replicated to
+    reach the larger sizes.
+    """
+    page_results = [(page["text"], page["tables"], False) for page in iter_pages(report_path(pages, 1, 1))]
+
+    print(f"{'pages':>7} {'old expander':>13} {'peak':>9} {'one page':>10} {'peak':>9}")
+    for scale in scales:
+        document = _merge_pages(page_results * scale)
+        document["field_sources"] = {}
+        parse_document(document, sources=document["field_sources"])
+        page = len(document["pages"]) // 2
+
+        def old_expander():
+            # A fresh document each run: the join is what the old expander paid on every rerun
+            fresh = _merge_pages(page_results * scale)
+            return fresh["text"][:1000] + "..."
+
+        def one_page():
+            spans, rows = page_highlights(document, page)
+            highlight_html(document["pages"][page - 1], spans)
+            return page_tables(document, page), rows
+
+        old_time, old_peak = _measure(old_expander)
+        page_time, page_peak = _measure(one_page)
+        print(f"{len(document['pages']):>7} {old_time * 1000:>11.2f}ms {old_peak / 1024:>7.0f}KB "
+              f"{page_time * 1000:>8.3f}ms {page_peak / 1024:>7.0f}KB")
+
+if __name__ == "__main__":
+    benchmark_viewer()
@@ -0,0 +1,86 @@
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet
+import sys
+
+def generate_large_pdf(filename="tests/large_report.pdf", pages=50, table_density=1, distractors=0):
+    """
+    Generates a multi-page report: a project summary on the first page followed
+    by `pages - 1` filler pages, each with narrative text and component tables.
+
+    Args:
+        filename (str): Output path.
+        pages (int): Total number of pages.
+        table_density (int): Component tables per filler page (0-3).
+        distractors (int): Distractor tables per filler page (0-2), attendance
+            tables whose narrative mentions "physical progress" so keyword
+            gating can't skip them.
+    """
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    grid = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+    # --- PAGE 1: SUMMARY ---
+    elements.append(Paragraph("<b>PAIMANA CONSOLIDATED PROGRESS REPORT</b>", styles['Title']))
+    summary = """
+    Project Name: Regional Rapid Transit Corridor<br/>
+    Sector: Urban Transport<br/>
+    Report Month: March 2024<br/>
+    State: Uttar Pradesh<br/>
+    District: Meerut
+    """
+    elements.append(Paragraph(summary, styles['Normal']))
+    elements.append(Spacer(1, 20))
+    kpi = Table([
+        ['Parameter', 'Value', 'Unit'],
+        ['Physical Progress', '61.5', '%'],
+        ['Financial Progress', '57.0', '%'],
+        ['Planned Cost', '30274.00', 'Rs. Crore'],
+        ['Expenditure Till Date', '17250.40', 'Rs. Crore'],
+    ], colWidths=[200, 100, 100])
+    kpi.setStyle(grid)
+    elements.append(kpi)
+
+    # --- FILLER PAGES: per-package details ---
+    for page in range(2, pages + 1):
+        elements.append(PageBreak())
+        elements.append(Paragraph(f"Package {page - 1}: Civil and System Works", styles['Heading2']))
+        elements.append(Paragraph(
+            f"Work on package {page - 1} continued through the reporting period. Site mobilisation, "
+            "utility shifting and casting of segments proceeded as per the revised schedule. "
+            "Minor delays were reported due to pending forest clearances along the alignment.",
+            styles['Normal']))
+        elements.append(Spacer(1, 12))
+        # Keep everything on one page as density grows
+        row_count = 8 if table_density + distractors <= 1 else 4
+        for t in range(table_density):
+            rows = [['Component', 'Quantity', 'Completed', 'Remarks']]
+            for i in range(1, row_count + 1):
+                rows.append([f"Segment {page}-{t}-{i}", str(100 + i * 7), f"{(page * i) % 100}%", 'In progress'])
+            table = Table(rows, colWidths=[150, 80, 100, 150])
+            table.setStyle(grid)
+            elements.append(table)
+            elements.append(Spacer(1, 8))
+
+        for d in range(distractors):
+            elements.append(Paragraph(
+                "Site attendance below has no bearing on the physical progress figures.", styles['Italic']))
+            rows = [['Department', 'Headcount', 'Attendance %']]
+            for i, department in enumerate(['Civil Eng', 'Electrical', 'Signaling'][:row_count]):
+                rows.append([department, str(10 + page % 40 + i), f"{85 + (page + i + d) % 15}%"])
+            table = Table(rows)
+            table.setStyle(grid)
+            elements.append(table)
+            elements.append(Spacer(1, 8))
+
+    doc.build(elements)
+    print(f"Generated {filename}")
+
+if __name__ == "__main__":
+    generate_large_pdf(pages=int(sys.argv[1]) if len(sys.argv) > 1 else 50)
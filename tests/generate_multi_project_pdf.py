@@ -0,0 +1,71 @@
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+import sys
+
+SECTORS = ["Roads & Highways", "Urban Transport", "Water Supply", "Power", "Irrigation"]
+DISTRICTS = ["Bengaluru Urban", "Mysuru", "Belagavi", "Kalaburagi", "Mangaluru", "Hubballi-Dharwad"]
+
+def project_kpis(i):
+    """The KPI values written for project `i`, so tests can check what was parsed."""
+    planned = 100.0 + 25 * i
+    return {
+        "physical_progress_percent": float(20 + (i * 7) % 75),
+        "financial_progress_percent": float(15 + (i * 11) % 80),
+        "planned_cost_crore": planned,
+        "expenditure_till_date_crore": round(planned * (0.3 + (i % 9) / 10), 2),
+    }
+
+def generate_multi_project_pdf(filename="tests/multi_project_report.pdf", projects=20, named=True):
+    """
+    Generates a state-level consolidated report: a cover block with the report
+    month and state, then one section per project with its details and KPI
+    table, flowing over as many pages as needed (several projects per page).
+
+    Args:
+        filename (str): Output path.
+        projects (int): Number of projects.
+        named (bool): Write a "Project Name:" line per project. Without it the
+            sections are told apart by their KPI tables only.
+    """
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    grid = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+    elements.append(Paragraph("<b>STATE INFRASTRUCTURE MONITORING - CONSOLIDATED REPORT</b>", styles['Title']))
+    elements.append(Paragraph("Report Month: March 2024<br/>State: Karnataka", styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    for i in range(projects):
+        kpis = project_kpis(i)
+        elements.append(Paragraph(f"Section {i + 1}", styles['Heading2']))
+        details = f"Sector: {SECTORS[i % len(SECTORS)]}<br/>District: {DISTRICTS[i % len(DISTRICTS)]}"
+        if named:
+            details = f"Project Name: District Works Package {i + 1}<br/>" + details
+        elements.append(Paragraph(details, styles['Normal']))
+        elements.append(Spacer(1, 6))
+        kpi = Table([
+            ['Parameter', 'Value', 'Unit'],
+            ['Physical Progress', f"{kpis['physical_progress_percent']:.1f}", '%'],
+            ['Financial Progress', f"{kpis['financial_progress_percent']:.1f}", '%'],
+            ['Planned Cost', f"{kpis['planned_cost_crore']:.2f}", 'Rs. Crore'],
+            ['Expenditure Till Date', f"{kpis['expenditure_till_date_crore']:.2f}", 'Rs. Crore'],
+        ], colWidths=[200, 100, 100])
+        kpi.setStyle(grid)
+        elements.append(kpi)
+        elements.append(Paragraph(
+            "Works continued through the reporting period; pending clearances are tracked by the district office.",
+            styles['Normal']))
+        elements.append(Spacer(1, 12))
+
+    doc.build(elements)
+    print(f"Generated {filename}")
+
+if __name__ == "__main__":
+    generate_multi_project_pdf(projects=int(sys.argv[1]) if len(sys.argv) > 1 else 20)
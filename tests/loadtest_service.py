@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def request(host, port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def run_load(host, port, payloads, total, concurrency, poll=0.05, unique=False):
+    """
+    Pushes `total` uploads with at most `concurrency` in flight and waits for
+    each result. Rejected uploads (503) are retried after the Retry-After pause.
+
+    Returns:
+        dict: Throughput, latency percentiles (submit to result) and counters.
+    """
+    latencies = []
+    counters = {"done": 0, "failed": 0, "rejected": 0}
+    next_index = iter(range(total))
+
+    async def client():
+        for i in next_index:
+            body = payloads[i % len(payloads)]
+            if unique:
+                # Trailing comment after %%EOF: still a valid PDF, but a cache miss
+                body += f"\n% {uuid.uuid4().hex}\n".encode()
+            start = time.perf_counter()
+            while True:
+                status, job = await request(host, port, "POST", "/jobs", body)
+                if status != 503:
+                    break
+                counters["rejected"] += 1
+                await asyncio.sleep(1)
+            while True:
+                status, _ = await request(host, port, "GET", f"/jobs/{job['job_id']}/result")
+                if status != 202:
+                    break
+                await asyncio.sleep(poll)
+            latencies.append(time.perf_counter() - start)
+            counters["done" if status == 200 else "failed"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(total / wall, 2),
+        "p50_s": round(percentile(latencies, 0.50), 4),
+        "p99_s": round(percentile(latencies, 0.99), 4),
+        "max_s": round(max(latencies), 4),
+        **counters,
+    }
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_until_up(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"service did not come up on {host}:{port}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-tests the ingestion service (src.service).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--start", action="store_true", help="Start a local service instance for the run")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for --start")
+    parser.add_argument("--queue-size", type=int, default=64, help="Queue size for --start")
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--unique", action="store_true", help="Make every upload distinct to bypass the extraction cache")
+    parser.add_argument("pdfs", nargs="*", default=[os.path.join(ROOT, "tests", "sample_report.pdf"),
+                                                    os.path.join(ROOT, "tests", "complex_report.pdf")])
+    args = parser.parse_args(argv)
+
+    payloads = []
+    for path in args.pdfs:
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+
+    service = None
+    if args.start:
+        args.port = _free_port()
+        cache_dir = os.path.join(ROOT, "tests", ".bench_reports", "service_cache")
+        service = subprocess.Popen(
+            [sys.executable, "-m", "src.service", "--host", args.host, "--port", str(args.port),
+             "--workers", str(args.workers), "--queue-size", str(args.queue_size)],
+            cwd=ROOT, env={**os.environ, "INFRATRACK_CACHE_DIR": cache_dir}
+        )
+    try:
+        if service:
+            _wait_until_up(args.host, args.port)
+        result = asyncio.run(run_load(args.host, args.port, payloads, args.requests,
+                                      args.concurrency, unique=args.unique))
+    finally:
+        if service:
+            service.terminate()
+            service.wait()
+
+    print(json.dumps(result, indent=2))
+    return 0 if result["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+import pandas as pd
+from src.analytics import status_counts, cost_overrun_totals, progress_histogram, portfolio_totals
+
+def test_portfolio_aggregates():
+    df = pd.DataFrame({
+        "state": ["Karnataka", "Karnataka", "Bihar", None],
+        "sector": ["Roads", "Rail", "Roads", "Roads"],
+        "status_flag": ["ON_TRACK", "DELAYED", "DELAYED | COST_OVERRUN", "COST_OVERRUN"],
+        "physical_progress_percent": [80.0, 20.0, 10.0, None],
+        "financial_progress_percent": [70.0, 30.0, 95.0, 100.0],
+        "planned_cost_crore": [100.0, 200.0, 50.0, 10.0],
+        "expenditure_till_date_crore": [50.0, 100.0, 80.0, 15.0],
+    })
+
+    counts = status_counts(df, "state")
+    assert counts["projects"].sum() == 4
+    assert counts.set_index(["state", "status_flag"]).loc[("Unknown", "COST_OVERRUN"), "projects"] == 1
+
+    overrun = cost_overrun_totals(df, "state")
+    assert overrun.iloc[0].to_dict() == {"state": "Bihar", "overrun_crore": 30.0, "projects_over_budget": 1}
+
+    bins = progress_histogram(df, "physical_progress_percent", bins=10)
+    assert len(bins) == 10 and bins["projects"].sum() == 3
+
+    totals = portfolio_totals(df)
+    assert (totals["projects"], totals["delayed"], totals["over_budget"]) == (4, 2, 2)
@@ -0,0 +1,23 @@
+import os
+from streamlit.testing.v1 import AppTest
+from src.cache import CACHE_STATS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_reruns_reuse_memoized_report_stages(tmp_path, monkeypatch):
+    # A fresh extraction cache, so the first run really extracts
+    monkeypatch.setenv("INFRATRACK_CACHE_DIR", str(tmp_path / "cache"))
+    with open(os.path.join(ROOT, "tests", "sample_report.pdf"), "rb") as f:
+        content = f.read()
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+    at.sidebar.file_uploader[0].set_value(("sample_report.pdf", content, "application/pdf")).run()
+    assert not at.exception
+    assert len(at.get("plotly_chart")) == 2
+    assert (tmp_path / "cache").is_dir()
+
+    # Widget reruns are served from the memoized stages, not the extraction cache
+    lookups = CACHE_STATS["hits"] + CACHE_STATS["misses"]
+    at.run()
+    at.number_input(key="inspector_page").set_value(1).run()
+    assert not at.exception
+    assert CACHE_STATS["hits"] + CACHE_STATS["misses"] == lookups
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+from src.batch import run_batch, process_file
+from src.store import open_store, count_projects, load_fingerprints
+from tests.generate_multi_project_pdf import generate_multi_project_pdf
+
+def test_batch_resumes_from_checkpoint(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for name in ["sample_report.pdf", "complex_report.pdf"]:
+        shutil.copy(f"tests/{name}", reports / name)
+    output = str(tmp_path / "results.jsonl")
+
+    store = str(tmp_path / "projects.db")
+
+    summary = run_batch([str(reports)], output, workers=2, store=store)
+    assert summary == {"ok": 2, "error": 0, "timeout": 0, "skipped": 0}
+    assert count_projects(open_store(store)) == 2
+
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    names = sorted(record["project_name"] for record in records)
+    assert names == ["Metro Rail Corridor Phase-II (Green Line)", "National Highway Expansion Phase-IV"]
+
+    # A second run finds everything checkpointed and does no work
+    summary = run_batch([str(reports)], output, workers=2)
+    assert summary["skipped"] == 2 and summary["ok"] == 0
+
+def test_crash_before_store_flush_leaves_no_duplicate_output(tmp_path, monkeypatch):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for name in ["sample_report.pdf", "complex_report.pdf"]:
+        shutil.copy(f"tests/{name}", reports / name)
+    output = str(tmp_path / "results.jsonl")
+    store = str(tmp_path / "projects.db")
+
+    # Crash on the second store flush: the first file is stored, the second is not
+    import src.batch
+    upsert = src.batch.upsert_records
+    calls = []
+    def crashing_upsert(conn, records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        upsert(conn, records)
+    monkeypatch.setattr("src.batch.STORE_BATCH_SIZE", 1)
+    monkeypatch.setattr("src.batch.upsert_records", crashing_upsert)
+    try:
+        run_batch([str(reports)], output, workers=1, store=store)
+    except RuntimeError:
+        pass
+    with open(output) as f:
+        assert len(f.readlines()) == 1
+
+    # The resumed run only does the unstored file, and writes it once
+    monkeypatch.setattr("src.batch.upsert_records", upsert)
+    summary = run_batch([str(reports)], output, workers=1, store=store)
+    assert (summary["ok"], summary["skipped"]) == (1, 1)
+    with open(output) as f:
+        files = [json.loads(line)["source_file"] for line in f]
+    assert len(files) == len(set(files)) == 2
+
+def test_process_file_timeout():
+    path, status, records = process_file("tests/complex_report.pdf", timeout=0.001)
+    assert status == "timeout"
+    assert "timed out" in records[0]["error"]
+
+def test_incremental_run_carries_unchanged_records_forward(tmp_path, monkeypatch):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for name in ["sample_report.pdf", "complex_report.pdf"]:
+        shutil.copy(f"tests/{name}", reports / name)
+    store = str(tmp_path / "projects.db")
+
+    def run(output):
+        summary = run_batch([str(reports)], str(tmp_path / output), workers=1, store=store, incremental=True)
+        with open(tmp_path / output) as f:
+            return summary, sorted(json.loads(line)["project_name"] for line in f)
+
+    summary, names = run("january.jsonl")
+    assert (summary["new"], summary["ok"], summary["carried"]) == (2, 2, 0)
+
+    # Next month: nothing changed, so both records are carried forward unparsed
+    summary, carried_names = run("february.jsonl")
+    assert (summary["ok"], summary["carried"], summary["skipped"]) == (0, 2, 2)
+    assert carried_names == names
+
+    # A touched but identical file is still unchanged; replaced content is not
+    os.utime(reports / "sample_report.pdf", ns=(0, 10**18))
+    summary, _ = run("march.jsonl")
+    assert (summary["ok"], summary["carried"]) == (0, 2)
+    shutil.copy("tests/complex_report.pdf", reports / "sample_report.pdf")
+    summary, _ = run("march-rerun.jsonl")
+    assert (summary["changed"], summary["ok"], summary["carried"]) == (1, 1, 1)
+
+    # A parser version bump reprocesses everything
+    monkeypatch.setattr("src.batch.cache_version", lambda: "bumped")
+    summary, _ = run("april.jsonl")
+    assert (summary["outdated"], summary["ok"], summary["carried"]) == (2, 2, 0)
+
+def test_incremental_reruns_replace_the_same_output(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for name in ["sample_report.pdf", "complex_report.pdf"]:
+        shutil.copy(f"tests/{name}", reports / name)
+    store = str(tmp_path / "projects.db")
+    output = tmp_path / "results.jsonl"
+
+    for _ in range(3):
+        run_batch([str(reports)], str(output), workers=1, store=store, incremental=True)
+        with open(output) as f:
+            assert len(f.readlines()) == 2
+    assert not os.path.exists(str(output) + ".partial")
+
+def test_consolidated_reports_keep_every_project(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    generate_multi_project_pdf(str(reports / "state.pdf"), projects=3)
+    shutil.copy("tests/sample_report.pdf", reports / "sample_report.pdf")
+    store = str(tmp_path / "projects.db")
+    output = tmp_path / "results.jsonl"
+
+    def run():
+        summary = run_batch([str(reports)], str(output), workers=1, store=store, incremental=True)
+        with open(output) as f:
+            return summary, [json.loads(line)["project_name"] for line in f]
+
+    summary, names = run()
+    assert summary["ok"] == 2
+    assert sorted(names) == ["District Works Package 1", "District Works Package 2", "District Works Package 3",
+                             "National Highway Expansion Phase-IV"]
+    assert count_projects(open_store(store)) == 4
+    assert len(load_fingerprints(open_store(store))[str(reports / "state.pdf")]["record_keys"]) == 3
+
+    # Every project of an unchanged consolidated report is carried forward
+    summary, carried_names = run()
+    assert (summary["ok"], summary["carried"]) == (0, 2)
+    assert sorted(carried_names) == sorted(names)
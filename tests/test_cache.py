@@ -0,0 +1,40 @@
+import src.cache as cache
+from src.cache import extract_and_parse_cached, cache_stats, invalidate_cache, evict
+
+def test_cache_hit_skips_extraction(tmp_path, monkeypatch):
+    with open("tests/sample_report.pdf", "rb") as f:
+        pdf_bytes = f.read()
+
+    before = cache_stats(str(tmp_path))
+    extracted, parsed = extract_and_parse_cached(pdf_bytes, cache_dir=str(tmp_path))
+    assert parsed["project_name"] == "National Highway Expansion Phase-IV"
+
+    # A hit must not reach the extractor
+    def fail(*args, **kwargs):
+        raise AssertionError("extractor called on a cache hit")
+    monkeypatch.setattr(cache, "extract_text_and_tables", fail)
+
+    cached_extracted, cached_parsed = extract_and_parse_cached(pdf_bytes, cache_dir=str(tmp_path))
+    assert cached_extracted == extracted
+    assert cached_parsed == parsed
+
+    after = cache_stats(str(tmp_path))
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["entries"] == 1
+
+def test_cache_eviction_and_invalidation(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    for pdf_path in ["tests/sample_report.pdf", "tests/complex_report.pdf"]:
+        with open(pdf_path, "rb") as f:
+            extract_and_parse_cached(f.read(), cache_dir=cache_dir)
+    assert cache_stats(cache_dir)["entries"] == 2
+
+    # Bound smaller than two entries: the least recently used one goes
+    evict(cache_dir, max_bytes=cache_stats(cache_dir)["bytes"] - 1)
+    assert cache_stats(cache_dir)["entries"] == 1
+
+    # A parser version bump makes the old generation stale
+    monkeypatch.setattr(cache, "PARSER_VERSION", "test-bump")
+    assert invalidate_cache(cache_dir) == 1
+    assert cache_stats(cache_dir)["entries"] == 0
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+import pyarrow.parquet as pq
+from src.export import stream_export, export_to_file, iter_result_file
+from src.store import open_store, upsert_records, iter_records, STORE_COLUMNS
+
+def _records(count):
+    return [
+        {
+            "project_id": f"PROJ-{i:05d}",
+            "project_name": f"Project {i}",
+            "report_month": "January 2024",
+            "state": "Karnataka" if i % 2 else "Kerala",
+            "physical_progress_percent": float(i % 100) if i % 7 else None,
+            "planned_cost_crore": 100.0 + i,
+            "status_flag": "ON_TRACK",
+        }
+        for i in range(count)
+    ]
+
+def test_store_export_streams_every_format(tmp_path):
+    conn = open_store(":memory:")
+    upsert_records(conn, _records(2500))
+
+    # Chunks are encoded as the store is read, one per 1000 rows
+    chunks = list(stream_export(iter_records(conn, chunk_size=1000), "jsonl", chunk_size=1000))
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert len(rows) == 2500 and list(rows[0]) == list(STORE_COLUMNS)
+
+    csv_bytes = b"".join(stream_export(iter_records(conn, state="Kerala"), "csv", chunk_size=100))
+    kerala = list(csv.DictReader(io.StringIO(csv_bytes.decode())))
+    assert len(kerala) == 1250 and {row["state"] for row in kerala} == {"Kerala"}
+
+    path = str(tmp_path / "portfolio.parquet")
+    export_to_file(iter_records(conn), path, chunk_size=1000)
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_rows == 2500
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+    table = parquet.read()
+    assert table.column("physical_progress_percent").null_count == len([i for i in range(2500) if i % 7 == 0])
+
+def test_result_file_round_trip(tmp_path):
+    records = _records(10)
+    results = tmp_path / "results.jsonl"
+    results.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    converted = str(tmp_path / "results.csv")
+    export_to_file(iter_result_file(str(results)), converted)
+    assert [record["planned_cost_crore"] for record in iter_result_file(converted)] == \
+        [record["planned_cost_crore"] for record in records]
+    # Empty exports still get a header
+    assert b"".join(stream_export([], "csv")).decode().startswith("project_id,")
@@ -1,6 +1,9 @@
-from src.extractor import extract_text_and_tables
-from src.parser import parse_project_info
+from src.extractor import extract_text_and_tables, iter_pages, _open_source
+from src.parser import parse_project_info, parse_pages, KEYWORDS_MAP, TableIndex, parse_percentage
+import io
 import json
+import mmap
+import pdfplumber
 
 def test_extraction():
     # pdf_path = "tests/sample_report.pdf" # Simple
@@ -32,5 +35,115 @@ def test_extraction():
     
     print("\n✅ Verification Successful!")
 
+def test_parallel_extraction_matches_serial():
+    pdf_path = "tests/complex_report.pdf"
+
+    serial = extract_text_and_tables(pdf_path)
+    parallel = extract_text_and_tables(pdf_path, workers=2)
+
+    assert parallel == serial
+
+    # File-like inputs are spilled to one temp file that every worker maps
+    with open(pdf_path, "rb") as f:
+        assert extract_text_and_tables(f, workers=2) == serial
+
+def test_extraction_keeps_page_structure():
+    extracted = extract_text_and_tables("tests/complex_report.pdf")
+
+    # Flat text is the non-empty pages joined once, each at its recorded offset
+    assert extracted["text"] == "".join(page + "\n" for page in extracted["pages"] if page)
+    for page_number, (page, offset) in enumerate(zip(extracted["pages"], extracted["page_offsets"]), start=1):
+        if page:
+            assert extracted["text"][offset:offset + len(page)] == page
+            assert extracted.page_for_offset(offset) == page_number
+
+    assert len(extracted["table_pages"]) == len(extracted["tables"])
+    assert extracted["table_pages"] == sorted(extracted["table_pages"])
+    # The joined text is memoized outside the dict, so it is never serialized
+    assert "text" not in extracted
+
+def test_extraction_accepts_paths_buffers_and_uploads():
+    pdf_path = "tests/complex_report.pdf"
+    expected = extract_text_and_tables(pdf_path)
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+
+    for source in [data, bytearray(data), memoryview(data), io.BytesIO(data)]:
+        assert extract_text_and_tables(source) == expected
+
+    # Uploads above the threshold are spilled to a mmapped temp file, and
+    # the caller's cursor is left alone
+    upload = io.BytesIO(data)
+    upload.seek(7)
+    with _open_source(upload, spill_threshold=16) as stream:
+        assert isinstance(stream, mmap.mmap)
+        spilled = pdfplumber.open(stream)
+        assert len(spilled.pages) == 3
+        spilled.close()
+    assert upload.tell() == 7
+
+def test_table_gating_preserves_parsed_fields():
+    for pdf_path in ["tests/sample_report.pdf", "tests/complex_report.pdf"]:
+        full = extract_text_and_tables(pdf_path)
+        gated = extract_text_and_tables(pdf_path, table_keywords=KEYWORDS_MAP)
+
+        assert gated["text"] == full["text"]
+        assert parse_project_info(gated["text"], gated["tables"]) == parse_project_info(full["text"], full["tables"])
+
+    # The complex report's cover page has no KPI labels
+    assert gated["skipped_table_pages"] == [1]
+
+def test_streaming_parse_stops_once_resolved():
+    for pdf_path in ["tests/sample_report.pdf", "tests/complex_report.pdf"]:
+        extracted = extract_text_and_tables(pdf_path)
+        expected = parse_project_info(extracted["text"], extracted["tables"])
+
+        assert parse_pages(iter_pages(pdf_path)) == expected
+        assert parse_pages(iter_pages(pdf_path), full_scan=True) == expected
+
+    # Every field of the sample report is on page 1
+    seen = []
+    def counting_pages():
+        for page in iter_pages("tests/sample_report.pdf"):
+            seen.append(page["page_number"])
+            yield page
+    parse_pages(counting_pages())
+    assert seen == [1]
+
+def test_single_pass_matcher_bounds_lookahead():
+    text = "Project Name: Stress Corridor\nPlanned Cost is pending.\n" + "filler text\n" * 5000 + "Rs. 999 spent on Expenditure: Rs. 12"
+    data = parse_project_info(text, [])
+
+    assert data["project_name"] == "Stress Corridor"
+    # The only rupee amount after "Planned Cost" is far outside its window
+    assert data["planned_cost_crore"] is None
+    assert data["expenditure_till_date_crore"] == 12.0
+    assert data["physical_progress_percent"] is None
+
+def test_state_and_district_stop_at_end_of_line():
+    data = parse_project_info("State: Karnataka\nDistrict: Mysuru\nSection 1\nWorks continued", [])
+    assert (data["state"], data["district"]) == ("Karnataka", "Mysuru")
+
+    sample = extract_text_and_tables("tests/sample_report.pdf")
+    assert parse_project_info(sample["text"], sample["tables"])["district"] == "Pune"
+
+def test_table_index_normalizes_labels_and_skips_headers():
+    tables = [
+        [["Parameter", "Achieved", "Remarks"], ["Physical\nProgress  (%)", "-", "NA"], ["Budget", "Rs. 10"]],
+        [["PHYSICAL PROGRESS", "61.5%"], ["Financial Progress", "40%"]],
+    ]
+    index = TableIndex(tables)
+
+    assert index.headers == {0: ["Parameter", "Achieved", "Remarks"]}
+    assert "physical progress (%)" in index.labels
+    # Matching rows come back in document order; rows without a value are passed over
+    assert index.rows("Physical Progress") == [tables[0][1], tables[1][0]]
+    assert index.lookup("Physical Progress", parse_percentage) == 61.5
+    assert index.lookup("Expenditure", parse_percentage) is None
+
+    data = parse_project_info("", tables)
+    assert data["physical_progress_percent"] == 61.5
+    assert data["financial_progress_percent"] == 40.0
+
 if __name__ == "__main__":
     test_extraction()
@@ -0,0 +1,70 @@
+import pytest
+from reportlab.pdfgen import canvas
+import src.ocr as ocr
+from src.extractor import extract_text_and_tables
+from src.ocr import StubBackend, get_backend
+
+def _scanned_report(path):
+    """Page 1 has a text layer, page 2 is a drawing only (like a scan)."""
+    c = canvas.Canvas(str(path))
+    c.drawString(72, 750, "Project Name: Coastal Ring Road")
+    c.showPage()
+    c.rect(72, 500, 300, 200, fill=1)
+    c.showPage()
+    c.save()
+
+def test_ocr_runs_only_on_pages_without_text(tmp_path, monkeypatch):
+    monkeypatch.setenv("INFRATRACK_OCR_CACHE_DIR", str(tmp_path / "ocr_cache"))
+    pdf_path = tmp_path / "scanned.pdf"
+    _scanned_report(pdf_path)
+
+    plain = extract_text_and_tables(str(pdf_path))
+    assert plain["pages"][1] == ""
+
+    backend = StubBackend("Physical Progress: 42%")
+    extracted = extract_text_and_tables(str(pdf_path), ocr=backend)
+    assert backend.calls == 1
+    assert extracted["ocr_pages"] == [2]
+    assert extracted["pages"][0] == plain["pages"][0]
+    assert extracted["text"] == plain["pages"][0] + "\nPhysical Progress: 42%\n"
+    assert extracted.page_for_offset(extracted["text"].index("Physical")) == 2
+
+    # Same page image: served from the OCR cache, the engine isn't called again
+    again = extract_text_and_tables(str(pdf_path), ocr=backend)
+    assert backend.calls == 1
+    assert again == extracted
+
+def test_get_backend():
+    assert isinstance(get_backend("stub"), StubBackend)
+    with pytest.raises(ValueError):
+        get_backend("unknown")
+
+def test_ocr_workers_are_independent_of_extraction_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("INFRATRACK_OCR_CACHE_DIR", str(tmp_path / "ocr_cache"))
+    pdf_path = tmp_path / "scanned.pdf"
+    _scanned_report(pdf_path)
+
+    used = []
+    real_ocr_pages = ocr.ocr_pages
+    def recording_ocr_pages(pdf, page_numbers, backend, workers=1, **kwargs):
+        used.append(workers)
+        return real_ocr_pages(pdf, page_numbers, backend, workers, **kwargs)
+    monkeypatch.setattr(ocr, "ocr_pages", recording_ocr_pages)
+    monkeypatch.setattr(ocr.os, "cpu_count", lambda: 6)
+
+    extract_text_and_tables(str(pdf_path), ocr=StubBackend("text"))
+    extract_text_and_tables(str(pdf_path), ocr=StubBackend("text"), ocr_workers=3)
+    assert used == [6, 3]
+
+def test_ocr_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setenv("INFRATRACK_OCR_CACHE_DIR", str(tmp_path / "ocr_cache"))
+    pdf_path = tmp_path / "scanned.pdf"
+    _scanned_report(pdf_path)
+    backend = StubBackend("Physical Progress: 42%")
+
+    # Over the bound, the page is evicted and recognized again next time
+    monkeypatch.setattr(ocr, "MAX_OCR_CACHE_BYTES", 1)
+    first = extract_text_and_tables(str(pdf_path), ocr=backend)
+    assert not list((tmp_path / "ocr_cache" / "stub").glob("*.txt"))
+    assert extract_text_and_tables(str(pdf_path), ocr=backend) == first
+    assert backend.calls == 2
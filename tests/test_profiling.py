@@ -0,0 +1,56 @@
+from src import profiling
+import threading
+from src.profiling import span, recording, summarize, write_prometheus
+from src.extractor import extract_text_and_tables
+from src.parser import parse_project_info
+
+def test_spans_are_noops_when_disabled():
+    profiling.disable()
+    with recording() as events:
+        with span("extract.text", page=1):
+            pass
+    assert events == []
+
+def test_recording_can_enable_spans_for_its_own_thread():
+    profiling.disable()
+    other = []
+    def other_session():
+        with recording() as events:
+            with span("other"):
+                pass
+        other.extend(events)
+
+    with recording(enable=True) as events:
+        with span("mine"):
+            pass
+        thread = threading.Thread(target=other_session)
+        thread.start()
+        thread.join()
+    assert [e["name"] for e in events] == ["mine"]
+    # Other threads and later spans stay unprofiled
+    assert other == []
+    with recording() as after:
+        with span("after"):
+            pass
+    assert after == []
+
+def test_profiled_extraction_emits_stage_events(tmp_path):
+    profiling.enable()
+    try:
+        with recording() as events:
+            extracted = extract_text_and_tables("tests/sample_report.pdf")
+            parse_project_info(extracted["text"], extracted["tables"])
+    finally:
+        profiling.disable()
+
+    summary = summarize(events)
+    for stage in ["extract.open", "extract.text", "extract.tables", "parse.scan_fields", "parse.tables", "parse.finalize"]:
+        assert stage in summary
+    page_events = [e for e in events if e["name"] == "extract.text"]
+    assert [e["page"] for e in page_events] == list(range(1, len(page_events) + 1))
+
+    metrics_path = str(tmp_path / "infratrack.prom")
+    write_prometheus(events, metrics_path)
+    with open(metrics_path) as f:
+        metrics = f.read()
+    assert 'infratrack_stage_seconds_count{stage="extract.text"}' in metrics
@@ -0,0 +1,119 @@
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, PageBreak
+from src.cache import extract_and_parse_cached
+from src.extractor import extract_text_and_tables
+from src.parser import parse_projects, parse_project_info, is_consolidated
+from src.templates import parse_document_projects
+from tests.generate_multi_project_pdf import generate_multi_project_pdf, project_kpis, SECTORS
+
+def test_consolidated_report_splits_into_projects(tmp_path):
+    path = str(tmp_path / "consolidated.pdf")
+    generate_multi_project_pdf(path, projects=15)
+    document = extract_text_and_tables(path)
+
+    sources = []
+    records = parse_projects(document, sources=sources)
+    assert [record["project_name"] for record in records] == [f"District Works Package {i + 1}" for i in range(15)]
+    for i, record in enumerate(records):
+        assert {field: record[field] for field in project_kpis(i)} == project_kpis(i)
+        assert record["sector"] == SECTORS[i % len(SECTORS)]
+        # The cover page's month and state apply to every project
+        assert (record["report_month"], record["state"]) == ("March 2024", "Karnataka")
+    assert len(sources) == 15 and sources[3]["project_name"]["page"] >= 1
+
+    # Single-project reports come out as one record, the same as before
+    sample = extract_text_and_tables("tests/sample_report.pdf")
+    assert parse_projects(sample) == [parse_project_info(sample["text"], sample["tables"])]
+
+def test_unnamed_projects_split_on_kpi_tables(tmp_path):
+    path = str(tmp_path / "unnamed.pdf")
+    generate_multi_project_pdf(path, projects=6, named=False)
+    with open(path, "rb") as f:
+        content = f.read()
+
+    extracted, records = extract_and_parse_cached(content, cache_dir=str(tmp_path / "cache"), projects=True)
+    assert len(records) == 6 and len({record["project_id"] for record in records}) == 6
+    assert [record["planned_cost_crore"] for record in records] == [project_kpis(i)["planned_cost_crore"] for i in range(6)]
+    assert len(extracted["project_sources"]) == 6
+
+    # Cache hits return the same projects; without `projects`, the first one
+    _, cached = extract_and_parse_cached(content, cache_dir=str(tmp_path / "cache"), projects=True)
+    assert cached == records
+    assert extract_and_parse_cached(content, cache_dir=str(tmp_path / "cache"))[1] == records[0]
+
+def _kpi_table(progress, planned, spent):
+    return Table([["Parameter", "Value", "Unit"], ["Physical Progress", f"{progress:.1f}", "%"],
+                  ["Planned Cost", f"{planned:.2f}", "Rs. Crore"], ["Expenditure Till Date", f"{spent:.2f}", "Rs. Crore"]],
+                 style=TableStyle([("GRID", (0, 0), (-1, -1), 1, colors.black)]))
+
+def _build(path, blocks):
+    """Writes a PDF of `blocks`: paragraph text (lines joined with <br/>), tables and page breaks."""
+    styles = getSampleStyleSheet()
+    SimpleDocTemplate(str(path), pagesize=A4).build([
+        Paragraph("<br/>".join(block), styles["Normal"]) if isinstance(block, list) else block
+        for block in blocks
+    ])
+    return extract_text_and_tables(str(path))
+
+def test_cover_page_title_and_summary_do_not_split_a_single_project(tmp_path):
+    # Cover page: full title and a narrative figure; details and KPI table on page 2
+    document = _build(tmp_path / "ring_road.pdf", [
+        ["Project: Ring Road Phase-1 (Outer)", "As of this month, physical progress has reached 40%."],
+        PageBreak(),
+        ["Project Name: Ring Road Phase-1", "Sector: Roads", "State: Gujarat"],
+        _kpi_table(42.0, 640.0, 210.0),
+    ])
+
+    records = parse_document_projects(document)
+    assert len(records) == 1
+    record = records[0]
+    assert (record["sector"], record["state"]) == ("Roads", "Gujarat")
+    assert (record["planned_cost_crore"], record["expenditure_till_date_crore"]) == (640.0, 210.0)
+    assert record["physical_progress_percent"] == 42.0
+
+    # The same holds for the complex report's two spellings of its title
+    assert not is_consolidated(extract_text_and_tables("tests/complex_report.pdf"))
+
+def test_repeated_kpi_table_without_new_details_stays_one_project(tmp_path):
+    # A previous-month annexure restates the KPIs; the first table's values stand
+    document = _build(tmp_path / "annexure.pdf", [
+        ["Project Name: Harbour Link Road", "Sector: Roads"],
+        _kpi_table(61.5, 840.0, 300.0),
+        PageBreak(),
+        ["Annexure: figures as reported last month"],
+        _kpi_table(55.0, 840.0, 260.0),
+    ])
+
+    records = parse_document_projects(document)
+    assert len(records) == 1
+    assert (records[0]["project_name"], records[0]["physical_progress_percent"]) == ("Harbour Link Road", 61.5)
+    assert records[0]["expenditure_till_date_crore"] == 300.0
+
+def test_names_after_kpi_tables_start_projects_even_when_related(tmp_path):
+    document = _build(tmp_path / "corridors.pdf", [
+        ["Project Name: NH-48 Widening", "Sector: Roads"],
+        _kpi_table(40.0, 100.0, 30.0),
+        ["Project Name: NH-48 Widening Phase 2", "Sector: Roads"],
+        _kpi_table(20.0, 101.0, 10.0),
+        ["Project Name: Ring Road", "Sector: Urban Transport"],
+        _kpi_table(70.0, 102.0, 80.0),
+    ])
+
+    records = parse_projects(document)
+    assert [(record["project_name"], record["planned_cost_crore"]) for record in records] == [
+        ("NH-48 Widening", 100.0), ("NH-48 Widening Phase 2", 101.0), ("Ring Road", 102.0)]
+    assert [record["sector"] for record in records] == ["Roads", "Roads", "Urban Transport"]
+
+def test_named_projects_with_narrative_kpis_split(tmp_path):
+    names = ["Alpha Bridge", "Beta Tunnel", "Gamma Flyover"]
+    blocks = []
+    for i, name in enumerate(names):
+        blocks.append([f"Project Name: {name}", "Sector: Roads", f"Physical Progress: {40 + i}%",
+                       f"Planned Cost: Rs. {100 + i} Crore"])
+    records = parse_document_projects(_build(tmp_path / "narrative.pdf", blocks))
+
+    assert [record["project_name"] for record in records] == names
+    assert [record["physical_progress_percent"] for record in records] == [40.0, 41.0, 42.0]
+    assert [record["planned_cost_crore"] for record in records] == [100.0, 101.0, 102.0]
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from src.service import IngestService, process_upload
+from tests.generate_multi_project_pdf import generate_multi_project_pdf
+
+async def _request(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+def test_service_job_lifecycle(tmp_path):
+    with open("tests/sample_report.pdf", "rb") as f:
+        pdf_bytes = f.read()
+
+    async def scenario():
+        service = IngestService(workers=1, queue_size=4, cache_dir=str(tmp_path))
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            status, job = await _request(port, "POST", "/jobs", pdf_bytes)
+            assert status == 202
+
+            for _ in range(300):
+                status, result = await _request(port, "GET", f"/jobs/{job['job_id']}/result")
+                if status != 202:
+                    break
+                await asyncio.sleep(0.05)
+            assert status == 200
+            assert [record["project_name"] for record in result] == ["National Highway Expansion Phase-IV"]
+
+            status, info = await _request(port, "GET", f"/jobs/{job['job_id']}")
+            assert info["status"] == "done" and "result" not in info
+            assert (await _request(port, "GET", "/jobs/unknown"))[0] == 404
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /jobs HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+            await writer.drain()
+            assert (await reader.read()).startswith(b"HTTP/1.1 400")
+            writer.close()
+        finally:
+            server.close()
+            await service.stop()
+
+    asyncio.run(scenario())
+
+def test_service_rejects_when_queue_full(tmp_path):
+    async def scenario():
+        service = IngestService(workers=1, queue_size=1, cache_dir=str(tmp_path))
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        # Without dispatchers nothing drains the queue
+        for task in service._dispatchers:
+            task.cancel()
+        try:
+            assert (await _request(port, "POST", "/jobs", b"%PDF-1.4"))[0] == 202
+            status, payload = await _request(port, "POST", "/jobs", b"%PDF-1.4")
+            assert status == 503 and payload["error"] == "queue full"
+            assert service.health()["rejected"] == 1
+        finally:
+            server.close()
+            await service.stop()
+
+    asyncio.run(scenario())
+
+def test_idle_clients_time_out_instead_of_holding_connection_slots(tmp_path):
+    async def scenario():
+        service = IngestService(workers=1, max_connections=1, cache_dir=str(tmp_path), read_timeout=0.2)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            # Sends half a request line and stalls, holding the only slot
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /jo")
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            other_reader, other_writer = await asyncio.open_connection("127.0.0.1", port)
+            assert (await other_reader.read()).startswith(b"HTTP/1.1 503")
+            other_writer.close()
+
+            response = await asyncio.wait_for(reader.read(), 5)
+            assert response.startswith(b"HTTP/1.1 408")
+            writer.close()
+            assert (await _request(port, "GET", "/health"))[0] == 200
+        finally:
+            server.close()
+            await service.stop()
+
+    asyncio.run(scenario())
+
+def test_process_upload_timeout(tmp_path):
+    with open("tests/complex_report.pdf", "rb") as f:
+        status, record = process_upload(f.read(), timeout=0.001, cache_dir=str(tmp_path))
+    assert status == "timeout" and "timed out" in record["error"]
+
+def test_process_upload_returns_every_project(tmp_path):
+    path = str(tmp_path / "consolidated.pdf")
+    generate_multi_project_pdf(path, projects=3)
+    with open(path, "rb") as f:
+        status, records = process_upload(f.read(), cache_dir=str(tmp_path / "cache"))
+    assert status == "done"
+    assert [record["project_name"] for record in records] == [f"District Works Package {i}" for i in (1, 2, 3)]
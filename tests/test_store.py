@@ -0,0 +1,50 @@
+from src.store import open_store, upsert_records, query_projects, count_projects, store_version, find_id_collisions
+
+def _record(project_id, month, state, status, progress):
+    return {
+        "project_id": project_id,
+        "project_name": f"Project {project_id}",
+        "report_month": month,
+        "state": state,
+        "sector": "Roads",
+        "physical_progress_percent": progress,
+        "status_flag": status,
+    }
+
+def test_store_upsert_and_query():
+    conn = open_store(":memory:")
+    upsert_records(conn, [
+        _record("PROJ-A", "January 2024", "Karnataka", "ON_TRACK", 60.0),
+        _record("PROJ-A", "February 2024", "Karnataka", "ON_TRACK", 65.0),
+        _record("PROJ-B", "January 2024", "Maharashtra", "DELAYED", 30.0),
+        _record("PROJ-C", None, "Maharashtra", "DELAYED", 10.0),
+    ])
+    assert count_projects(conn) == 4
+
+    # Same (project_id, report_month) updates in place
+    version = store_version(conn)
+    upsert_records(conn, [_record("PROJ-A", "February 2024", "Karnataka", "DELAYED", 45.0)])
+    assert count_projects(conn) == 4
+    assert store_version(conn) == version + 1
+
+    delayed = query_projects(conn, status_flag="DELAYED", columns=["project_id", "physical_progress_percent"])
+    assert sorted(delayed["project_id"]) == ["PROJ-A", "PROJ-B", "PROJ-C"]
+    assert list(delayed.columns) == ["project_id", "physical_progress_percent"]
+
+    both = query_projects(conn, state=["Karnataka", "Maharashtra"], report_month="January 2024")
+    assert len(both) == 2
+    assert len(query_projects(conn, limit=1)) == 1
+
+def test_find_id_collisions():
+    conn = open_store(":memory:")
+    upsert_records(conn, [_record("PROJ-A", "January 2024", "Karnataka", "ON_TRACK", 60.0)])
+
+    batch = [
+        {"project_id": "PROJ-A", "project_name": "Project PROJ-A"},
+        {"project_id": "PROJ-A", "project_name": "Another Project"},
+        {"project_id": "PROJ-B", "project_name": "Project PROJ-B"},
+    ]
+    assert sorted(find_id_collisions(conn, batch)) == [
+        ("PROJ-A", "Project PROJ-A", "Another Project"),
+    ]
+    assert find_id_collisions(conn, batch[:1] + batch[2:]) == []
@@ -0,0 +1,49 @@
+import itertools
+import subprocess
+import sys
+import pandas as pd
+from src.utils import calculate_status, score_projects, score_frame, STATUS_LABELS, STATUS_DELAYED, MAX_OVERSPEND_RISK, generate_project_id, generate_project_ids
+
+def test_batch_scoring_matches_scalar():
+    progress = [None, 0.0, 49.9, 50.0, 75.0]
+    spent = [None, 0.0, 100.0, 100.01, 150.0]
+    planned = [None, 0.0, 100.0]
+    rows = list(itertools.product(progress, spent, planned))
+    df = pd.DataFrame(rows, columns=["physical_progress_percent", "expenditure_till_date_crore", "planned_cost_crore"])
+
+    for threshold, tolerance in [(50, 0.0), (60, 0.1)]:
+        scored = score_frame(df, delay_threshold=threshold, overrun_tolerance=tolerance)
+        expected = [calculate_status(p, e, c, threshold, tolerance) for p, e, c in rows]
+        assert list(scored["status_flag"].astype(str)) == expected
+        assert list(scored["status_flag"].cat.categories) == list(STATUS_LABELS)
+
+def test_risk_score():
+    codes, risk = score_projects([100.0, 25.0, None], [50.0, 150.0, 10.0], [100.0, 100.0, 0.0])
+    assert list(codes) == [0, 3, 2]
+    # Spending against a zero planned cost is an overrun, scored at the cap
+    assert list(risk) == [0.0, 1.0, MAX_OVERSPEND_RISK]
+
+    # Every flagged project has a positive risk, and on-track ones have none
+    codes, risk = score_projects([60.0, 60.0, 10.0], [500.0, 5.0, 0.0], [100.0, 0.0, 0.0])
+    assert list(codes) == [2, 2, 1]
+    assert list(risk) == [MAX_OVERSPEND_RISK, MAX_OVERSPEND_RISK, 0.8]
+
+def test_project_ids():
+    names = ["Metro Rail Corridor", None, "Ring Road", "Metro Rail Corridor", ""]
+    ids = generate_project_ids(names, width=10)
+    assert ids == [generate_project_id(name, width=10) for name in names]
+    assert ids[0] == ids[3] and ids[1] is None and len(ids[0]) == len("PROJ-") + 10
+
+    # Unnamed projects get an ID derived from the document, not the clock
+    assert generate_project_id(None, content_hash="ab12cd34ef56aa") == "UNK-AB12CD34EF56"
+
+def test_parser_and_utils_import_light():
+    # Heavy dependencies load lazily, on first use
+    code = ("import sys, src.parser, src.utils, src.cache; "
+            "print(sorted(m for m in ('numpy', 'pandas', 'pdfplumber', 'plotly') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+    # ...and still work once used
+    codes, _ = score_projects([10.0], [1.0], [2.0])
+    assert codes.tolist() == [STATUS_DELAYED]
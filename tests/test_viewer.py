@@ -0,0 +1,32 @@
+from src.cache import extract_and_parse_cached
+from src.viewer import page_tables, page_highlights, highlight_html
+
+def test_inspector_pages_highlight_field_sources(tmp_path):
+    with open("tests/complex_report.pdf", "rb") as f:
+        extracted, parsed = extract_and_parse_cached(f.read(), cache_dir=str(tmp_path))
+    sources = extracted["field_sources"]
+
+    # Text sources point at the label and value on their page
+    spans, rows = page_highlights(extracted, 2)
+    page_text = extracted["pages"][1]
+    fields = {field: page_text[start:end] for start, end, field in spans}
+    assert fields["district"] == "District : Bengaluru Urban"
+    assert "12,500" in fields["planned_cost_crore"]
+
+    # Table sources point at the row the value was read from
+    source = sources["physical_progress_percent"]
+    assert source["page"] == 3
+    _, rows = page_highlights(extracted, 3)
+    tables = dict(page_tables(extracted, 3))
+    assert rows == {source["table"]: {source["row"]: ["physical_progress_percent"]}}
+    assert tables[source["table"]][source["row"]][0] == "Overall Physical Progress"
+    assert [i for i, _ in page_tables(extracted, 2)] == [0, 1]
+
+    # Sources survive the cache round trip
+    with open("tests/complex_report.pdf", "rb") as f:
+        cached, _ = extract_and_parse_cached(f.read(), cache_dir=str(tmp_path))
+    assert cached["field_sources"] == sources
+
+def test_highlight_html_escapes_and_trims_overlaps():
+    html = highlight_html("State: <A> District: B", [(0, 10, "state"), (7, 22, "district")])
+    assert html == '<mark title="state">State: &lt;A&gt;</mark><mark title="district"> District: B</mark>'